@@ -9,6 +9,9 @@ from bag.layout.template import TemplateDB, TemplateBase
 from bag.layout.digital import StdCellTemplate, StdCellBase
 from bag.layout.routing import TrackID
 
+from ...routing.bus import BusPinIndex, WireCollector, WireAccumulator
+from ...routing.bus import reexport_array
+
 
 def add_tap(template, xo, blk_master, num_row, port_table):
     ny0 = (num_row + 1) // 2
@@ -135,11 +138,10 @@ class RetimeLatchRow(StdCellBase):
         for grp_idx in range(num_grp):
             lat_inst = self.add_std_instance(lat_master, 'XLAT%d' % grp_idx,
                                              loc=(xcur, 0), nx=cells_per_tap, spx=num_col)
-            for lat_idx in range(cells_per_tap):
-                self.reexport(lat_inst.get_port('I', col=lat_idx), net_name='in<%d>' % bit_idx, show=False)
-                self.reexport(lat_inst.get_port('O', col=lat_idx), net_name='out<%d>' % bit_idx, show=False)
-                clkb_list.extend(lat_inst.get_port('CLKB', col=lat_idx).get_pins())
-                bit_idx += 1
+            reexport_array(self, lat_inst, ['I'], 'in<%d>', col_stride=1, offset=bit_idx, show=False)
+            reexport_array(self, lat_inst, ['O'], 'out<%d>', col_stride=1, offset=bit_idx, show=False)
+            clkb_list.extend(lat_inst.get_all_port_pins('CLKB'))
+            bit_idx += cells_per_tap
             xcur += cells_per_tap * num_col
             xcur = add_tap(self, xcur, tap_master, num_row, port_table)
 
@@ -552,11 +554,9 @@ class RetimeColumn(StdCellBase):
         vss_list.extend(finst.get_all_port_pins('VSS'))
         self._collect_io_wires(inst, 'out', num_bits, io_wires)
         # export input
-        for bit_idx in range(num_bits):
-            in_pin = inst.get_port('in<%d>' % bit_idx).get_pins()[0]
-            in_pin = self.connect_wires(in_pin, upper=blk_h, unit_mode=True)
-            name = 'in_%d<%d>' % (adc_idx, bit_idx)
-            self.add_pin(name, in_pin, show=False)
+        in_names = BusPinIndex.get_index(lat_master0).get_names('in', num_bits)
+        reexport_array(self, inst, in_names, 'in_%d<%%d>' % adc_idx,
+                       connect_kwargs=dict(upper=blk_h, unit_mode=True), pin_idx=0, show=False)
         # clock buffers/fills
         if adc_idx in ck_phase_buf:
             if adc_idx == ck_phase_out:
@@ -587,17 +587,14 @@ class RetimeColumn(StdCellBase):
         self.add_pin('VSS', vss_list, show=False)
 
     def _export_output(self, inst, adc_idx, num_bits):
-        for bit_idx in range(num_bits):
-            out_pin = inst.get_port('out<%d>' % bit_idx, col=0).get_pins()[0]
-            out_pin = self.connect_wires(out_pin, lower=0, unit_mode=True)
-            name = 'out_%d<%d>' % (adc_idx, bit_idx)
-            self.add_pin(name, out_pin, show=True)
+        out_names = BusPinIndex.get_index(inst.master).get_names('out', num_bits)
+        reexport_array(self, inst, out_names, 'out_%d<%%d>' % adc_idx,
+                       connect_kwargs=dict(lower=0, unit_mode=True), pin_idx=0, show=True)
 
-    @staticmethod
-    def _collect_io_wires(inst, name, num_bits, wire_list):
-        for bit_idx in range(num_bits):
-            pname = '%s<%d>' % (name, bit_idx)
-            wire_list.extend(inst.get_all_port_pins(pname))
+    def _collect_io_wires(self, inst, name, num_bits, wire_list):
+        index = BusPinIndex.get_index(inst.master)
+        for warrs in index.get_pins(self.grid, inst, name, num_bits):
+            wire_list.extend(warrs)
 
 
 class Retimer(TemplateBase):
@@ -625,7 +622,7 @@ class Retimer(TemplateBase):
     @classmethod
     def get_default_param_values(cls):
         # type: () -> Dict[str, Any]
-        return dict(reserve_tracks=[])
+        return dict(reserve_tracks=[], stream=False)
 
     @classmethod
     def get_params_info(cls):
@@ -641,6 +638,7 @@ class Retimer(TemplateBase):
             clk_width='clock wire width.',
             adc_order='List of ADC index order.',
             reserve_tracks='tracks to reserve for ADC routing.',
+            stream='True to merge collinear column wires as each column is placed.',
         )
 
     def draw_layout(self):
@@ -656,6 +654,7 @@ class Retimer(TemplateBase):
         clk_width = self.params['clk_width']
         adc_order = self.params['adc_order']
         reserve_tracks = self.params['reserve_tracks']
+        stream = self.params['stream']
         buf_ck_width = 5
 
         col_params = dict(
@@ -686,49 +685,50 @@ class Retimer(TemplateBase):
         ck_phase_out = ck_phase_1
         ck_phase_buf = sorted(set([ck_phase_2, ck_phase_1, ck_phase_0_0, ck_phase_0_1]))
         print('clocking phases:', ck_phase_2, ck_phase_1, ck_phase_0_0, ck_phase_0_1, ck_phase_out, ck_phase_buf)
-        ck_dict[ck_phase_2] = []
-        ck_dict[ck_phase_1] = []
-        ck_dict[ck_phase_0_0] = []
-        ck_dict[ck_phase_0_1] = []
 
-        io21_list = []
-        io10_list = []
+        # in streaming mode, collinear column wires are merged into intervals as each column
+        # is placed, instead of keeping every column wire until the end.  Column instances and
+        # supply wires are still kept until the end.
+        collector_cls = WireAccumulator if stream else WireCollector
+        ck2_wires = collector_cls()
+        ck1_wires = collector_cls()
+        io21_wires = collector_cls()
+        io10_wires = collector_cls()
         vdd_list = []
         vss_list = []
-        ck1_list = []
-        ck5_list = []
+        ck01_wires = collector_cls()
+        ck00_wires = collector_cls()
         buf_dict = {}
         out_dig_warr = None
 
         for col_idx, adc_idx in enumerate(adc_order):
             col_params['adc_idx'] = adc_idx
             col_master = self.new_template(params=col_params, temp_cls=RetimeColumn)
+            col_index = BusPinIndex.get_index(col_master)
 
             spx = col_master.std_size[0] * col_master.std_col_width_unit
             spy = col_master.std_size[1] * col_master.std_row_height_unit
 
             col_inst = self.add_instance(col_master, 'C%d' %(adc_idx), loc=(spx * col_idx, 0), unit_mode=True)
-            ck_dict[ck_phase_2].extend(col_inst.get_all_port_pins('clkb2'))
+            ck2_wires.extend(col_inst.get_all_port_pins('clkb2'))
 
-            self._export_output(col_inst, adc_idx, num_bits)
+            self._export_output(col_inst, col_index, adc_idx, num_bits)
 
             vdd_list.extend(col_inst.get_all_port_pins('VDD'))
             vss_list.extend(col_inst.get_all_port_pins('VSS'))
 
-            ck_dict[ck_phase_1].extend(col_inst.get_all_port_pins('clkb1'))
+            ck1_wires.extend(col_inst.get_all_port_pins('clkb1'))
 
-            io21_list.extend(col_inst.get_all_port_pins('io21'))
+            io21_wires.extend(col_inst.get_all_port_pins('io21'))
 
             if adc_idx < num_adc // 2:
-                ck_list = ck5_list
+                ck_wires = ck00_wires
             else:
-                ck_list = ck1_list
-            ck_list.extend(col_inst.get_all_port_pins('clkb<%d>' % adc_idx))
+                ck_wires = ck01_wires
+            ck_wires.extend(col_inst.get_all_port_pins('clkb<%d>' % adc_idx))
 
-            for bit_idx in range(num_bits):
-                in_pin = col_inst.get_port('in_%d<%d>' % (adc_idx, bit_idx)).get_pins()[0]
-                name = 'in_%d<%d>' % (adc_idx, bit_idx)
-                self.add_pin(name, in_pin, show=True)
+            in_names = col_index.get_names('in_%d' % adc_idx, num_bits)
+            reexport_array(self, col_inst, in_names, 'in_%d<%%d>' % adc_idx, pin_idx=0, show=True)
 
             if adc_idx in ck_phase_buf:
                 clk_pin = col_inst.get_port('clk%d' % adc_idx).get_pins()[0]
@@ -737,7 +737,7 @@ class Retimer(TemplateBase):
                 if col_inst.has_port('out_dig'):
                     out_dig_warr = col_inst.get_port('out_dig').get_pins()[0]
 
-            io10_list.extend(col_inst.get_all_port_pins('io10'))
+            io10_wires.extend(col_inst.get_all_port_pins('io10'))
 
         # set template size
         col_top_layer = col_master.top_layer
@@ -748,12 +748,12 @@ class Retimer(TemplateBase):
 
         self.size = [col_top_layer, adc_width * num_adc, size_y]
 
-        ck_dict[ck_phase_2] = self.connect_wires(ck_dict[ck_phase_2], unit_mode=True)
-        ck_dict[ck_phase_1] = self.connect_wires(ck_dict[ck_phase_1], unit_mode=True)
-        self.connect_wires(io21_list, unit_mode=True)
-        self.connect_wires(io10_list, unit_mode=True)
-        ck_dict[ck_phase_0_1] = self.connect_wires(ck1_list)
-        ck_dict[ck_phase_0_0] = self.connect_wires(ck5_list)
+        ck_dict[ck_phase_2] = ck2_wires.connect(self, unit_mode=True)
+        ck_dict[ck_phase_1] = ck1_wires.connect(self, unit_mode=True)
+        io21_wires.connect(self, unit_mode=True)
+        io10_wires.connect(self, unit_mode=True)
+        ck_dict[ck_phase_0_1] = ck01_wires.connect(self)
+        ck_dict[ck_phase_0_0] = ck00_wires.connect(self)
 
         for ck_idx in ck_phase_buf:
             buf_out = buf_dict[ck_idx]
@@ -790,14 +790,6 @@ class Retimer(TemplateBase):
         self.add_pin('VDD', vdd_list, show=True)
         self.add_pin('VSS', vss_list, show=True)
 
-    def _export_output(self, inst, adc_idx, num_bits):
-        for bit_idx in range(num_bits):
-            out_pin = inst.get_port('out_%d<%d>' % (adc_idx, bit_idx), col=0).get_pins()[0]
-            name = 'out_%d<%d>' % (adc_idx, bit_idx)
-            self.add_pin(name, out_pin, show=True)
-
-    @staticmethod
-    def _collect_io_wires(inst, name, num_bits, wire_list):
-        for bit_idx in range(num_bits):
-            pname = '%s<%d>' % (name, bit_idx)
-            wire_list.extend(inst.get_all_port_pins(pname))
+    def _export_output(self, inst, col_index, adc_idx, num_bits):
+        out_names = col_index.get_names('out_%d' % adc_idx, num_bits)
+        reexport_array(self, inst, out_names, 'out_%d<%%d>' % adc_idx, pin_idx=0, show=True)
@@ -94,15 +94,12 @@ class NPassGateWClkCore(AnalogBase):
 
     def _draw_pass_gates(self, idx_list, fgn, inp_tr_idx, inn_tr_idx, out_tr_idx,
                          lower_track_width, io_width, clk_ports, show_pins=False):
-        # draw transistors
-        p_ports = self.draw_mos_conn('nch', 1, idx_list[0], fgn, 1, 1, gate_pref_loc='s')
-        n_ports = self.draw_mos_conn('nch', 1, idx_list[1], fgn, 1, 1, gate_pref_loc='s')
-
-        # draw gate connections to match parasitics better.
-        p_dum = self.draw_mos_conn('nch', 0, idx_list[0], fgn, 1, 1, gate_pref_loc='s',
-                                   is_ds_dummy=False)
-        n_dum = self.draw_mos_conn('nch', 0, idx_list[1], fgn, 1, 1, gate_pref_loc='s',
-                                   is_ds_dummy=False)
+        # draw transistors, and gate connections on row 0 to match parasitics better.
+        conn_list = [dict(mos_type='nch', row_idx=row_idx, col_idx=col_idx, fg=fgn, sdir=1, ddir=1,
+                          gate_pref_loc='s', **row_kwargs)
+                     for row_idx, row_kwargs in ((1, {}), (0, dict(is_ds_dummy=False)))
+                     for col_idx in idx_list[:2]]
+        p_ports, n_ports, p_dum, n_dum = self.draw_mos_conns(conn_list)
 
         # connect gates
         clk_ports.extend((p_ports['g'], n_ports['g']))
@@ -224,6 +221,7 @@ class NPassGateWClkCore(AnalogBase):
                        pgr_w=pgr_w, ngr_w=ngr_w,
                        top_layer=top_layer,
                        end_mode=end_mode,
+                       checkpoint=True,
                        )
         blk_right, blk_top = self.grid.get_size_dimension(self.size)
         io_layer = self.mos_conn_layer + 2
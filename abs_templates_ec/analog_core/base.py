@@ -4,13 +4,16 @@
 
 from typing import TYPE_CHECKING, List, Union, Optional, Dict, Any, Set, Tuple
 
+import os
 import abc
+import weakref
 import bisect
 import numbers
 from itertools import chain
 
+import numpy as np
+
 from bag.math import lcm
-from bag.util.cache import DesignMaster
 from bag.util.interval import IntervalSet
 from bag.util.search import BinaryIterator
 from bag.layout.template import TemplateBase
@@ -23,8 +26,10 @@ from ..analog_mos.mos import AnalogMOSBase, AnalogMOSExt
 from ..analog_mos.substrate import AnalogSubstrate
 from ..analog_mos.edge import AnalogEdge, AnalogEndRow
 from ..analog_mos.conn import AnalogMOSConn, AnalogMOSDecap, AnalogMOSDummy, AnalogSubstrateConn
+from ..layout_info import to_content_key
+from ..routing.grid_cache import RoutingGridCache
 
-from .placement import WireGroup, WireTree
+from .placement import WireGroup, WireTree, PlacementCache
 
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
@@ -32,14 +37,43 @@ if TYPE_CHECKING:
 
 
 class AnalogBaseEdgeInfo(object):
-    """The edge information object for AnalogBase."""
+    """The edge information object for AnalogBase.
+
+    This object is immutable.  The row and extension end information are stored as tuples,
+    and the immutable key is computed once and used for hashing and comparison.
+    """
+
+    __slots__ = ('_row_end_list', '_ext_end_list', '_key', '_hash')
 
     def __init__(self, row_end_list, ext_end_list):
-        self._row_end_list = row_end_list
-        self._ext_end_list = ext_end_list
+        self._row_end_list = tuple(row_end_list)
+        self._ext_end_list = tuple(ext_end_list)
+        self._key = None
+        self._hash = None
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, AnalogBaseEdgeInfo):
+            return self.get_immutable_key() == other.get_immutable_key()
+        return NotImplemented
+
+    def __ne__(self, other):
+        ans = self.__eq__(other)
+        return ans if ans is NotImplemented else not ans
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.get_immutable_key())
+        return self._hash
+
+    def __reduce__(self):
+        return AnalogBaseEdgeInfo, (self._row_end_list, self._ext_end_list)
 
     def get_immutable_key(self):
-        return DesignMaster.to_immutable_id((self._row_end_list, self._ext_end_list))
+        if self._key is None:
+            self._key = to_content_key((self._row_end_list, self._ext_end_list))
+        return self._key
 
     def master_infos_iter(self, row_edge_infos, y0=0, flip=False):
         for y, edge_params in self._ext_end_list:
@@ -126,6 +160,7 @@ class AnalogBaseInfo(object):
         self._fg_tot = None
         self._place_info = None
         self._sd_xc_unit = None
+        self._tr_info_cache = {}  # type: Dict[int, Tuple[int, int]]
         self.set_fg_tot(fg_tot)
 
     @property
@@ -195,6 +230,8 @@ class AnalogBaseInfo(object):
         return self._place_info.edge_margins
 
     def set_fg_tot(self, new_fg_tot):
+        # track offsets may change
+        self._tr_info_cache.clear()
         if new_fg_tot is not None:
             self._fg_tot = new_fg_tot
             self._place_info = self.get_placement_info(new_fg_tot)
@@ -323,6 +360,71 @@ class AnalogBaseInfo(object):
             return coord
         return coord * self.grid.resolution
 
+    def _get_track_info(self, layer_id):
+        # type: (int) -> Tuple[int, int]
+        """Returns the coordinate of track 0 and the track pitch of the given layer.
+
+        Both values are in resolution units, and are cached until the number of fingers changes.
+        """
+        ans = self._tr_info_cache.get(layer_id, None)
+        if ans is None:
+            ans = (self.grid.track_to_coord(layer_id, 0, unit_mode=True),
+                   self.grid.get_track_pitch(layer_id, unit_mode=True))
+            self._tr_info_cache[layer_id] = ans
+        return ans
+
+    def coord_to_col_array(self, coord, unit_mode=False, mode=0):
+        # type: (Any, bool, int) -> np.ndarray
+        """Vectorized version of coord_to_col()."""
+        if self.fg_tot is None:
+            raise ValueError('fg_tot is undefined')
+
+        coord = np.asarray(coord)
+        if not unit_mode:
+            coord = np.rint(coord / self.grid.resolution).astype(int)
+
+        diff = coord - self._sd_xc_unit
+        pitch = self._sd_pitch_unit
+        if mode == 0:
+            return (diff + pitch // 2) // pitch
+        elif mode < 0:
+            return diff // pitch
+        else:
+            return -(-diff // pitch)
+
+    def col_to_coord_array(self, col_idx, unit_mode=False):
+        # type: (Any, bool) -> np.ndarray
+        """Vectorized version of col_to_coord()."""
+        if self.fg_tot is None:
+            raise ValueError('fg_tot is undefined')
+
+        coord = self._sd_xc_unit + np.asarray(col_idx) * self._sd_pitch_unit
+        if unit_mode:
+            return coord
+        return coord * self.grid.resolution
+
+    def coord_to_track_array(self, layer_id, coord):
+        # type: (int, Any) -> np.ndarray
+        """Convert the given coordinates in resolution units to track indices.
+
+        Parameters
+        ----------
+        layer_id : int
+            the layer ID.
+        coord : Any
+            the coordinates, in resolution units.  Must be on the half-track grid.
+
+        Returns
+        -------
+        tr_idx : np.ndarray
+            the track indices.
+        """
+        tr0, pitch = self._get_track_info(layer_id)
+        dx2 = 2 * (np.asarray(coord) - tr0)
+        if np.any(dx2 % pitch != 0):
+            raise ValueError('Some coordinates are not on the half-track grid.')
+        return (dx2 // pitch) / 2
+
     def track_to_col_intv(self, layer_id, tr_idx, width=1):
         # type: (int, Union[float, int], int) -> Tuple[int, int]
         """Returns the smallest column interval that covers the given vertical track."""
@@ -335,6 +437,30 @@ class AnalogBaseInfo(object):
         upper_col_idx = -(-(upper - self._sd_xc_unit) // self._sd_pitch_unit)  # type: int
         return lower_col_idx, upper_col_idx
 
+    def track_to_col_intv_array(self, layer_id, tr_idx, width=1):
+        # type: (int, Any, int) -> Tuple[np.ndarray, np.ndarray]
+        """Vectorized version of track_to_col_intv().
+
+        Returns
+        -------
+        lower_col_idx : np.ndarray
+            the lower column indices.
+        upper_col_idx : np.ndarray
+            the upper column indices.
+        """
+        if self.fg_tot is None:
+            raise ValueError('fg_tot is undefined')
+
+        # wire bounds shift by one pitch per track
+        lower0, upper0 = self.grid.get_wire_bounds(layer_id, 0, width=width, unit_mode=True)
+        pitch = self._get_track_info(layer_id)[1]
+        delta = np.rint(np.asarray(tr_idx) * pitch).astype(int)
+
+        sd_pitch = self._sd_pitch_unit
+        lower_col_idx = (lower0 + delta - self._sd_xc_unit) // sd_pitch
+        upper_col_idx = -(-(upper0 + delta - self._sd_xc_unit) // sd_pitch)
+        return lower_col_idx, upper_col_idx
+
     def get_center_tracks(self, layer_id, num_tracks, col_intv, width=1, space=0):
         # type: (int, int, Tuple[int, int], int, Union[float, int]) -> float
         """Return tracks that center on the given column interval.
@@ -414,6 +540,96 @@ class AnalogBaseInfo(object):
             q += 1
         return q
 
+    def num_tracks_to_fingers_array(self, layer_id, num_tracks, col_idx, even=True, fg_margin=0):
+        # type: (int, Any, Any, bool, int) -> np.ndarray
+        """Vectorized version of num_tracks_to_fingers().
+
+        num_tracks and col_idx are broadcasted against each other.  The first track is searched
+        only once for each distinct starting coordinate.
+        """
+        num_tracks, col_idx = np.broadcast_arrays(np.asarray(num_tracks), np.asarray(col_idx))
+        x0 = self.col_to_coord_array(col_idx, unit_mode=True)
+        x1 = self.col_to_coord_array(col_idx + fg_margin, unit_mode=True)
+        # find track number with coordinate strictly larger than x0
+        x1_uniq, x1_inv = np.unique(x1, return_inverse=True)
+        t_uniq = np.array([self.grid.find_next_track(layer_id, int(xval), half_track=True,
+                                                     mode=1, unit_mode=True)
+                           for xval in x1_uniq])
+        t_start = t_uniq[x1_inv].reshape(x1.shape)
+        # find coordinate of last track
+        tr0, pitch = self._get_track_info(layer_id)
+        xlast = tr0 + np.rint((t_start + num_tracks - 1) * pitch).astype(int)
+        xlast += self.grid.get_track_width(layer_id, 1, unit_mode=True) // 2
+
+        # divide by source/drain pitch
+        q = -(-(xlast - x0) // self._sd_pitch_unit) + fg_margin
+        if even:
+            q += q % 2
+        return q
+
+
+class DryRunVia(object):
+    """A placeholder returned by AnalogBase.add_via() in dry run mode.
+
+    Records the via arguments without computing the via geometry, so callers that keep the
+    return value still get an object describing the via.
+
+    Parameters
+    ----------
+    bbox : BBox
+        the via bounding box.
+    bot_layer : Union[str, Tuple[str, str]]
+        the bottom layer name.
+    top_layer : Union[str, Tuple[str, str]]
+        the top layer name.
+    bot_dir : str
+        the bottom layer extension direction.
+    nx : int
+        number of columns.
+    ny : int
+        number of rows.
+    spx : Union[float, int]
+        column pitch.
+    spy : Union[float, int]
+        row pitch.
+    extend : bool
+        True if via extension can be drawn outside of the box.
+    top_dir : Optional[str]
+        top layer extension direction.
+    unit_mode : bool
+        True if spx/spy are given in resolution units.
+    """
+
+    __slots__ = ('bbox', 'bot_layer', 'top_layer', 'bot_dir', 'nx', 'ny', 'spx', 'spy',
+                 'extend', 'top_dir', 'unit_mode')
+
+    def __init__(self, bbox, bot_layer, top_layer, bot_dir, nx=1, ny=1, spx=0.0, spy=0.0,
+                 extend=True, top_dir=None, unit_mode=False):
+        # type: (BBox, Any, Any, str, int, int, Any, Any, bool, Optional[str], bool) -> None
+        self.bbox = bbox
+        self.bot_layer = bot_layer
+        self.top_layer = top_layer
+        self.bot_dir = bot_dir
+        self.nx = nx
+        self.ny = ny
+        self.spx = spx
+        self.spy = spy
+        self.extend = extend
+        self.top_dir = top_dir
+        self.unit_mode = unit_mode
+
+    @property
+    def bottom_box(self):
+        # type: () -> BBox
+        """The via bounding box; enclosures are not computed in dry run mode."""
+        return self.bbox
+
+    @property
+    def top_box(self):
+        # type: () -> BBox
+        """The via bounding box; enclosures are not computed in dry run mode."""
+        return self.bbox
+
 
 class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
     """The amplifier abstract template class
@@ -440,11 +656,27 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         a set of already used cell names.
     **kwargs
         dictionary of optional parameters.  See documentation of
-        :class:`bag.layout.template.TemplateBase` for details.
+        :class:`bag.layout.template.TemplateBase` for details.  In addition, AnalogBase
+        supports:
+
+        dry_run : bool
+            True to only compute placement, size, track locations and ports of this template.
+            Vias, extension rows, device blockages, transistor connections and dummy
+            connections are not drawn, so the resulting master is only suitable for
+            floorplanning and must not be instantiated in the final layout.  Defaults to False.
     """
 
+    # draw_base() checkpoints of each template database.
+    _checkpoint_table = weakref.WeakKeyDictionary()  # type: Dict[TemplateDB, Dict[Any, Any]]
+    # on-disk placement cache.  Read from the BAG_PLACEMENT_CACHE_DIR environment variable on
+    # first use, unless set_placement_cache_dir() is called.
+    _place_cache = None  # type: Optional[PlacementCache]
+    _place_cache_init = False
+
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
+        # set before calling TemplateBase constructor, as it is used to compute the unique key.
+        self._dry_run = kwargs.pop('dry_run', False)
         TemplateBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
 
         tech_params = self.grid.tech_info.tech_params
@@ -474,6 +706,10 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         self._capn_wires = {-1: [], 1: []}
         self._n_netmap = None
         self._p_netmap = None
+        # per-row finger occupancy arrays and cached schematic dummy information
+        self._n_used = None  # type: List[np.ndarray]
+        self._p_used = None  # type: List[np.ndarray]
+        self._dum_info_cache = None  # type: Dict[Tuple[str, int], Tuple[Any, Dict[Any, int]]]
         self._row_layout_info = None
 
         # track calculation parameters
@@ -481,6 +717,9 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         self._tr_intvs = None
         self._wire_info = None
         self._tr_manager = None
+        self._tr_table = None  # type: Dict[Tuple[str, int, str], Tuple[Any, int, int]]
+        self._tr_arrays = None  # type: Dict[Tuple[str, str], Tuple[np.ndarray, ...]]
+        self._wire_table = None  # type: Dict[Tuple[str, int, str], Dict[str, List[Any]]]
 
         # substrate parameters
         self._ntap_list = None
@@ -490,6 +729,12 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         self._gr_vdd_warrs = None
         self._gr_vss_warrs = None
 
+        # routing grid query cache
+        self._grid_cache = None  # type: Optional[RoutingGridCache]
+
+        # draw_base() checkpoint log
+        self._draw_log = None  # type: Optional[List[Tuple[str, Tuple, Dict[str, Any], Any]]]
+
     @classmethod
     def get_mos_conn_layer(cls, tech_info):
         tech_cls = tech_info.tech_params['layout']['mos_tech_class']
@@ -520,6 +765,173 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         # type: () -> AnalogBaseInfo
         return self._layout_info
 
+    @property
+    def grid_cache(self):
+        # type: () -> RoutingGridCache
+        """A memoizing view of the routing grid.  Rebuilt whenever the grid is replaced."""
+        if self._grid_cache is None or self._grid_cache.grid is not self.grid:
+            self._grid_cache = RoutingGridCache(self.grid)
+        return self._grid_cache
+
+    @property
+    def dry_run(self):
+        # type: () -> bool
+        """Returns True if this template only computes placement information."""
+        return self._dry_run
+
+    def compute_unique_key(self):
+        key = TemplateBase.compute_unique_key(self)
+        if self._dry_run:
+            # dry run masters must never be shared with fully drawn masters.
+            return 'dry_run', key
+        return key
+
+    def add_via(self, *args, **kwargs):
+        """Adds a via.  In dry run mode, the via is not drawn and a DryRunVia is returned."""
+        if self._dry_run:
+            return DryRunVia(*args, **kwargs)
+        return TemplateBase.add_via(self, *args, **kwargs)
+
+    def _log_draw_call(self, name, args, kwargs):
+        # type: (str, Tuple[Any, ...], Dict[str, Any]) -> Any
+        """Calls the given TemplateBase method, and records it if a checkpoint is being saved."""
+        ans = getattr(TemplateBase, name)(self, *args, **kwargs)
+        if self._draw_log is not None:
+            self._draw_log.append((name, args, kwargs, ans))
+        return ans
+
+    def _add_base_instance(self, *args, **kwargs):
+        """add_instance() used by draw_base()."""
+        return self._log_draw_call('add_instance', args, kwargs)
+
+    def _connect_base_wires(self, *args, **kwargs):
+        """connect_wires() used by draw_base()."""
+        return self._log_draw_call('connect_wires', args, kwargs)
+
+    def _set_base_size(self, *args, **kwargs):
+        """set_size_from_bound_box() used by draw_base()."""
+        return self._log_draw_call('set_size_from_bound_box', args, kwargs)
+
+    def _get_checkpoint_table(self):
+        # type: () -> Dict[Any, Dict[str, Any]]
+        """Returns the draw_base() checkpoint table of the current template database."""
+        temp_db = self.template_db
+        table = self._checkpoint_table.get(temp_db, None)
+        if table is None:
+            AnalogBase._checkpoint_table[temp_db] = table = {}
+        return table
+
+    @classmethod
+    def clear_checkpoints(cls):
+        # type: () -> None
+        """Removes all draw_base() checkpoints."""
+        AnalogBase._checkpoint_table.clear()
+
+    @classmethod
+    def set_placement_cache_dir(cls, root_dir):
+        # type: (Optional[str]) -> None
+        """Sets the on-disk placement cache directory.
+
+        Placement results are saved in this directory, keyed by a hash of all placement inputs,
+        and re-used in later runs.  Defaults to the BAG_PLACEMENT_CACHE_DIR environment variable.
+
+        Parameters
+        ----------
+        root_dir : Optional[str]
+            the cache directory.  None to disable the placement cache.
+        """
+        AnalogBase._place_cache = None if root_dir is None else PlacementCache(root_dir)
+        AnalogBase._place_cache_init = True
+
+    @classmethod
+    def get_placement_cache(cls):
+        # type: () -> Optional[PlacementCache]
+        """Returns the on-disk placement cache, or None if it is disabled."""
+        if not AnalogBase._place_cache_init:
+            root_dir = os.environ.get('BAG_PLACEMENT_CACHE_DIR', '')
+            AnalogBase._place_cache = PlacementCache(root_dir) if root_dir else None
+            AnalogBase._place_cache_init = True
+        return AnalogBase._place_cache
+
+    def _get_checkpoint_key(self, draw_args, draw_kwargs, top_layer):
+        # type: (Tuple[Any, ...], Dict[str, Any], Optional[int]) -> Any
+        """Returns the draw_base() checkpoint key.
+
+        The key includes the template class, as subclasses may override methods used by
+        draw_base(), so checkpoints are only shared between templates of the same class that
+        call draw_base() with the same arguments on the same routing grid.
+        """
+        draw_kwargs = {key: val for key, val in draw_kwargs.items() if key != 'checkpoint'}
+        hm_layer = self.mos_conn_layer + 1
+        top_layer = hm_layer if top_layer is None else max(hm_layer, top_layer)
+        layers = list(range(self.dum_conn_layer, top_layer + 1))
+        temp_cls = self.__class__
+        try:
+            return to_content_key(('%s.%s' % (temp_cls.__module__, temp_cls.__name__),
+                                   self._tech_cls_name, self._dry_run,
+                                   PlacementCache.get_grid_key(self.grid, layers),
+                                   draw_args, draw_kwargs))
+        except Exception as ex:
+            raise ValueError('draw_base() arguments cannot be used as a checkpoint key; '
+                             'call draw_base() with checkpoint=False.  Error: %s' % ex)
+
+    def _save_checkpoint(self):
+        # type: () -> Dict[str, Any]
+        """Returns the state of this AnalogBase after placement."""
+        log_idx = {id(result): idx for idx, (_, _, _, result) in enumerate(self._draw_log)}
+        if self.size is None:
+            bound_box = self.prim_bound_box
+        else:
+            bound_box = None
+        return dict(
+            draw_log=[(name, args, kwargs) for name, args, kwargs, _ in self._draw_log],
+            ptap_idx=[log_idx[id(inst)] for inst in self._ptap_list],
+            ntap_idx=[log_idx[id(inst)] for inst in self._ntap_list],
+            gr_vdd_idx=log_idx[id(self._gr_vdd_warrs)],
+            gr_vss_idx=log_idx[id(self._gr_vss_warrs)],
+            array_box=self.array_box,
+            prim_bound_box=bound_box,
+            sd_yc_list=self._sd_yc_list,
+            row_prop_list=self._row_prop_list,
+            ridx_lookup=self._ridx_lookup,
+            tr_intvs=self._tr_intvs,
+            wire_info=self._wire_info,
+            tr_manager=self._tr_manager,
+            top_sub_bndy=self._top_sub_bndy,
+            bot_sub_bndy=self._bot_sub_bndy,
+            sub_bndx=self._sub_bndx,
+            lr_edge_info=self._lr_edge_info,
+        )
+
+    def _restore_checkpoint(self, state):
+        # type: (Dict[str, Any]) -> None
+        """Restores the state of this AnalogBase after placement from the given checkpoint."""
+        self.array_box = state['array_box']
+        results = [getattr(TemplateBase, name)(self, *args, **kwargs)
+                   for name, args, kwargs in state['draw_log']]
+
+        self._ptap_list = [results[idx] for idx in state['ptap_idx']]
+        self._ntap_list = [results[idx] for idx in state['ntap_idx']]
+        self._ptap_exports = [set() for _ in self._ptap_list]
+        self._ntap_exports = [set() for _ in self._ntap_list]
+        self._gr_vdd_warrs = results[state['gr_vdd_idx']]
+        self._gr_vss_warrs = results[state['gr_vss_idx']]
+        if state['prim_bound_box'] is not None:
+            self.prim_bound_box = state['prim_bound_box']
+            self.prim_top_layer = self._layout_info.top_layer
+
+        # copy mutable containers, so the checkpoint is not modified by this template.
+        self._sd_yc_list = list(state['sd_yc_list'])
+        self._row_prop_list = [row_info.copy() for row_info in state['row_prop_list']]
+        self._ridx_lookup = {key: list(val) for key, val in state['ridx_lookup'].items()}
+        self._tr_intvs = [tr_intvs.copy() for tr_intvs in state['tr_intvs']]
+        self._wire_info = [wire_info.copy() for wire_info in state['wire_info']]
+        self._tr_manager = state['tr_manager']
+        self._top_sub_bndy = state['top_sub_bndy']
+        self._bot_sub_bndy = state['bot_sub_bndy']
+        self._sub_bndx = state['sub_bndx']
+        self._lr_edge_info = state['lr_edge_info']
+
     @property
     def num_fg_per_sd(self):
         return self._layout_info.num_fg_per_sd
@@ -578,6 +990,59 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         tech_params = self.grid.tech_info.tech_params
         self._tech_cls = tech_params['layout'][class_name]  # type: MOSTech
 
+    def _build_track_tables(self):
+        # type: () -> None
+        """Build track index lookup tables.  Must be called after placement is final.
+
+        For each row and track type, the absolute track index is base + sign * tr_idx, where
+        sign is -1 for flipped rows.  The same information is also stored in NumPy arrays
+        indexed by row, for vectorized lookups.
+        """
+        tr_table = {}
+        tr_arrays = {}
+        wire_table = {}
+        for mos_type, ridx_list in self._ridx_lookup.items():
+            num_rows = len(ridx_list)
+            for tr_type in ('g', 'ds', 'g2', 'ds2'):
+                base_arr = np.zeros(num_rows)
+                sign_arr = np.zeros(num_rows, dtype=int)
+                ntr_arr = np.zeros(num_rows, dtype=int)
+                for row_idx, ridx in enumerate(ridx_list):
+                    key = (mos_type, row_idx, tr_type)
+                    names, locs = self._wire_info[ridx][tr_type]
+                    if names is not None:
+                        name_table = {}
+                        for name, loc in zip(names, locs):
+                            name_table.setdefault(name, []).append(loc)
+                        wire_table[key] = name_table
+
+                    tr_intv = self._tr_intvs[ridx][tr_type]
+                    if tr_intv is not None:
+                        ntr = int(tr_intv[1] - tr_intv[0])
+                        if self._row_prop_list[ridx]['orient'] == 'R0':
+                            base, sign = tr_intv[0], 1
+                        else:
+                            base, sign = tr_intv[1] - 1, -1
+                        tr_table[key] = (base, sign, ntr)
+                        base_arr[row_idx] = base
+                        sign_arr[row_idx] = sign
+                        ntr_arr[row_idx] = ntr
+                tr_arrays[(mos_type, tr_type)] = (base_arr, sign_arr, ntr_arr)
+
+        self._tr_table = tr_table
+        self._tr_arrays = tr_arrays
+        self._wire_table = wire_table
+
+    def _get_track_info(self, mos_type, row_idx, tr_type):
+        # type: (str, int, str) -> Tuple[Any, int, int]
+        """Returns the (base, sign, num_tracks) tuple of the given row and track type."""
+        try:
+            return self._tr_table[(mos_type, row_idx, tr_type)]
+        except KeyError:
+            # use _find_row_index() for error checking
+            self._find_row_index(mos_type, row_idx)
+            raise ValueError('%s row %d has no %s tracks.' % (mos_type, row_idx, tr_type))
+
     def get_num_tracks(self, mos_type, row_idx, tr_type):
         """Get number of tracks of the given type on the given row.
 
@@ -595,9 +1060,7 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         num_tracks : int
             number of tracks.
         """
-        row_idx = self._find_row_index(mos_type, row_idx)
-        tr_intv = self._tr_intvs[row_idx][tr_type]
-        return int(tr_intv[1] - tr_intv[0])
+        return self._get_track_info(mos_type, row_idx, tr_type)[2]
 
     def get_track_index(self, mos_type, row_idx, tr_type, tr_idx):
         """Convert relative track index to absolute track index.
@@ -618,18 +1081,52 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         abs_tr_idx : float
             the absolute track index.
         """
-        row_idx = self._find_row_index(mos_type, row_idx)
-        tr_intv = self._tr_intvs[row_idx][tr_type]
+        base, sign, ntr = self._get_track_info(mos_type, row_idx, tr_type)
 
         # error checking
-        ntr = int(tr_intv[1] - tr_intv[0])
         if tr_idx >= ntr:
             raise ValueError('track_index %d out of bounds: [0, %d)' % (tr_idx, ntr))
 
-        if self._row_prop_list[row_idx]['orient'] == 'R0':
-            return tr_intv[0] + tr_idx
-        else:
-            return tr_intv[1] - 1 - tr_idx
+        return base + sign * tr_idx
+
+    def get_track_indices(self, mos_type, row_idx, tr_type, tr_idx):
+        # type: (str, Any, str, Any) -> np.ndarray
+        """Vectorized version of get_track_index().
+
+        Parameters
+        ----------
+        mos_type : str
+            the row type, one of 'nch', 'pch', 'ntap', or 'ptap'.
+        row_idx : Any
+            the row indices, as an integer or an integer array.
+        tr_type : str
+            the type of the track.
+        tr_idx : Any
+            the relative track indices, as a number or an array.  Broadcasted against row_idx.
+
+        Returns
+        -------
+        abs_tr_idx : np.ndarray
+            the absolute track indices.
+        """
+        try:
+            base_arr, sign_arr, ntr_arr = self._tr_arrays[(mos_type, tr_type)]
+        except KeyError:
+            raise ValueError('Unknown row type %s or track type %s' % (mos_type, tr_type))
+
+        row_idx = np.asarray(row_idx)
+        tr_idx = np.asarray(tr_idx)
+        num_rows = base_arr.shape[0]
+        if np.any((row_idx < 0) | (row_idx >= num_rows)):
+            raise ValueError('%s row index out of bounds: [0, %d)' % (mos_type, num_rows))
+
+        ntr = ntr_arr[row_idx]
+        if np.any(sign_arr[row_idx] == 0):
+            raise ValueError('some %s rows have no %s tracks.' % (mos_type, tr_type))
+        if np.any(tr_idx >= ntr):
+            raise ValueError('some track indices out of bounds.')
+
+        return base_arr[row_idx] + sign_arr[row_idx] * tr_idx
 
     def make_track_id(self, mos_type, row_idx, tr_type, tr_idx, width=1,
                       num=1, pitch=0.0):
@@ -660,6 +1157,32 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         tid = self.get_track_index(mos_type, row_idx, tr_type, tr_idx)
         return TrackID(self.mos_conn_layer + 1, tid, width=width, num=num, pitch=pitch)
 
+    def make_track_ids(self, mos_type, row_idx, tr_type, tr_idx, width=1):
+        # type: (str, Any, str, Any, int) -> List[TrackID]
+        """Vectorized version of make_track_id().
+
+        Parameters
+        ----------
+        mos_type : str
+            the row type, one of 'nch', 'pch', 'ntap', or 'ptap'.
+        row_idx : Any
+            the row indices, as an integer or an integer array.
+        tr_type : str
+            the type of the track.
+        tr_idx : Any
+            the relative track indices, as a number or an array.  Broadcasted against row_idx.
+        width : int
+            track width in number of tracks.
+
+        Returns
+        -------
+        tr_id_list : List[TrackID]
+            TrackIDs of the specified tracks, in flattened broadcast order.
+        """
+        hm_layer = self.mos_conn_layer + 1
+        tid_arr = self.get_track_indices(mos_type, row_idx, tr_type, tr_idx)
+        return [TrackID(hm_layer, tid.item(), width=width) for tid in tid_arr.flat]
+
     def get_wire_id(self, mos_type, row_idx, tr_type, wire_idx=0, wire_name=''):
         # type: (str, int, str, int, str) -> TrackID
         """Returns the TrackID representing the given wire.
@@ -686,16 +1209,17 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         if self._tr_manager is None:
             raise ValueError('draw_base() is not called with wire information.')
 
-        row_idx = self._find_row_index(mos_type, row_idx)
-        name_list, loc_list = self._wire_info[row_idx][tr_type]
         hm_layer = self.mos_conn_layer + 1
         if wire_name:
-            idx = -1
-            for j in range(wire_idx + 1):
-                idx = name_list.index(wire_name, idx + 1)
+            self._find_row_index(mos_type, row_idx)
+            name_table = self._wire_table.get((mos_type, row_idx, tr_type), None)
+            if name_table is None or wire_name not in name_table:
+                raise ValueError('wire %s not found.' % wire_name)
             cur_name = wire_name
-            cur_loc = loc_list[idx]
+            cur_loc = name_table[wire_name][wire_idx]
         else:
+            row_idx = self._find_row_index(mos_type, row_idx)
+            name_list, loc_list = self._wire_info[row_idx][tr_type]
             cur_name = name_list[wire_idx]
             cur_loc = loc_list[wire_idx]
 
@@ -761,6 +1285,76 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         cur_fg = dum_tran_info.get(dum_key, 0)
         dum_tran_info[dum_key] = cur_fg + dum_fg
 
+    def _mark_used(self, mos_type, row_idx, start, stop):
+        # type: (str, int, int, int) -> None
+        """Mark the given transistor fingers as used, and invalidate cached dummy information."""
+        if mos_type == 'pch':
+            self._p_used[row_idx][start:stop] = True
+        else:
+            self._n_used[row_idx][start:stop] = True
+        self._dum_info_cache.pop((mos_type, row_idx), None)
+
+    def _get_row_dummy_info(self, mos_type, row_idx, col_start, col_stop):
+        # type: (str, int, int, int) -> Dict[Tuple[Any, ...], int]
+        """Returns the number of dummy fingers of each dummy type in the given row and range.
+
+        Dummies are found by run-length encoding the finger occupancy array.  The result is
+        cached until the row is modified.
+        """
+        cache_key = (mos_type, row_idx)
+        cache_val = self._dum_info_cache.get(cache_key, None)
+        if cache_val is not None and cache_val[0] == (col_start, col_stop):
+            return cache_val[1]
+
+        if mos_type == 'pch':
+            net_map = self._p_netmap[row_idx]
+            used = self._p_used[row_idx]
+        else:
+            net_map = self._n_netmap[row_idx]
+            used = self._n_used[row_idx]
+
+        ridx = self._ridx_lookup[mos_type][row_idx]
+        w = self._row_prop_list[ridx]['w']
+        th = self._row_prop_list[ridx]['threshold']
+
+        # find dummy runs in range
+        row_info = {}
+        start = max(col_start, 0)
+        free = np.zeros(max(min(col_stop, self._fg_tot) - start, 0) + 2, dtype=np.int8)
+        free[1:-1] = ~used[start:start + free.size - 2]
+        delta = np.diff(free)
+        starts = np.flatnonzero(delta == 1) + start
+        stops = np.flatnonzero(delta == -1) + start
+        num_fg = stops - starts
+
+        # single-finger dummies
+        for idx in np.flatnonzero(num_fg == 1):
+            net_left = net_map[starts[idx]]
+            net_right = net_map[stops[idx]]
+            if not net_right:
+                # makes sure source net is supply if possible
+                net_left, net_right = net_right, net_left
+            dum_key = (mos_type, w, self._lch, th, net_left, net_right)
+            self._register_dummy_info(row_info, dum_key, 1)
+
+        # multi-finger dummies; edge fingers connect to transistor nets
+        multi_idx = np.flatnonzero(num_fg > 1)
+        if multi_idx.size > 0:
+            num_edge = 0
+            for net in chain((net_map[idx] for idx in starts[multi_idx]),
+                             (net_map[idx] for idx in stops[multi_idx])):
+                if net:
+                    dum_key = (mos_type, w, self._lch, th, '', net)
+                    self._register_dummy_info(row_info, dum_key, 1)
+                    num_edge += 1
+            num_inner = int(num_fg[multi_idx].sum()) - num_edge
+            if num_inner > 0:
+                dum_key = (mos_type, w, self._lch, th, '', '')
+                self._register_dummy_info(row_info, dum_key, num_inner)
+
+        self._dum_info_cache[cache_key] = ((col_start, col_stop), row_info)
+        return row_info
+
     def get_sch_dummy_info(self, col_start=0, col_stop=None):
         # type: (int, Optional[int]) -> List[Tuple[Tuple[Any], int]]
         """Returns a list of all dummies in the given range.
@@ -779,58 +1373,13 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         if col_stop is None:
             col_stop = self._fg_tot
 
-        # get dummy transistor intervals
-        total_intv = (0, self._fg_tot)
-        p_intvs = [intv_set.get_complement(total_intv) for intv_set in self._p_intvs]
-        n_intvs = [intv_set.get_complement(total_intv) for intv_set in self._n_intvs]
-
         # record dummies
         dum_info = {}
-        for mos_type, intvs, cap_intvs in (('pch', p_intvs, self._capp_intvs),
-                                           ('nch', n_intvs, self._capn_intvs)):
-            for row_idx, (intv_set, cap_intv_set) in enumerate(zip(intvs, cap_intvs)):
-                if mos_type == 'pch':
-                    net_map = self._p_netmap[row_idx]
-                else:
-                    net_map = self._n_netmap[row_idx]
-
-                ridx = self._ridx_lookup[mos_type][row_idx]
-                w = self._row_prop_list[ridx]['w']
-                th = self._row_prop_list[ridx]['threshold']
-
-                # substrate decap transistors from dummies
-                temp_intv = intv_set.copy()
-                for intv in cap_intv_set:
-                    temp_intv.subtract(intv)
-
-                for start, stop in temp_intv:
-                    # limit dummies to those in range
-                    start = max(start, col_start)
-                    stop = min(stop, col_stop)
-                    tot_dum_fg = stop - start
-                    if tot_dum_fg > 0:
-                        # get left/right net names
-                        net_left = net_map[start]
-                        net_right = net_map[stop]
-
-                        if tot_dum_fg == 1:
-                            if not net_right:
-                                # makes sure source net is supply if possible
-                                net_left, net_right = net_right, net_left
-                            dum_key = (mos_type, w, self._lch, th, net_left, net_right)
-                            self._register_dummy_info(dum_info, dum_key, 1)
-                        else:
-                            if net_left:
-                                dum_key = (mos_type, w, self._lch, th, '', net_left)
-                                self._register_dummy_info(dum_info, dum_key, 1)
-                                tot_dum_fg -= 1
-                            if net_right:
-                                dum_key = (mos_type, w, self._lch, th, '', net_right)
-                                self._register_dummy_info(dum_info, dum_key, 1)
-                                tot_dum_fg -= 1
-                            if tot_dum_fg > 0:
-                                dum_key = (mos_type, w, self._lch, th, '', '')
-                                self._register_dummy_info(dum_info, dum_key, tot_dum_fg)
+        for mos_type, num_rows in (('pch', len(self._p_used)), ('nch', len(self._n_used))):
+            for row_idx in range(num_rows):
+                row_info = self._get_row_dummy_info(mos_type, row_idx, col_start, col_stop)
+                for dum_key, dum_fg in row_info.items():
+                    self._register_dummy_info(dum_info, dum_key, dum_fg)
 
         # return final result, sort by keys so that we get a consistent output.
         # Good for using as identifier.
@@ -964,6 +1513,7 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                 msg = 'Cannot connect %s row %d [%d, %d); some are already connected.'
                 raise ValueError(msg % (mos_type, row_idx, intv[0], intv[1]))
             net_map[intv[0]] = net_map[intv[1]] = ''
+        self._mark_used(mos_type, row_idx, intv[0], intv[1])
 
         ridx = self._ridx_lookup[mos_type][row_idx]
         row_info = self._row_prop_list[ridx]
@@ -1025,9 +1575,162 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
             optional arguments for AnalogMosConn.
         Returns
         -------
+        ports : Dict[str, WireArray]
+            a dictionary of ports as WireArrays.  The keys are 'g', 'd', and 's'.  In dry run
+            mode, the connection is not drawn, and approximate ports suitable for floorplanning
+            are returned.
+        """
+        conn_params, loc, orient = self._get_mos_conn_info(mos_type, row_idx, col_idx, fg,
+                                                           sdir, ddir, s_net, d_net, kwargs)
+        if self._dry_run:
+            return self._get_dry_run_conn_ports(mos_type, row_idx, conn_params, loc, orient)
+
+        conn_master = self.new_template(params=conn_params, temp_cls=AnalogMOSConn)
+        conn_inst = self.add_instance(conn_master, loc=loc, orient=orient, unit_mode=True)
+
+        return {key: conn_inst.get_pin(name=key, layer=self.mos_conn_layer)
+                for key in conn_inst.port_names_iter()}
+
+    def draw_mos_conns(self, conn_list):
+        # type: (List[Dict[str, Any]]) -> List[Dict[str, WireArray]]
+        """Draw many transistor connections.
+
+        Identical connections on the same row placed at a constant column pitch are drawn
+        with a single arrayed instance.
+
+        Parameters
+        ----------
+        conn_list : List[Dict[str, Any]]
+            list of transistor connections.  Each entry is a dictionary of draw_mos_conn()
+            arguments; mos_type, row_idx, col_idx, fg, sdir, and ddir must be specified.
+
+        Returns
+        -------
+        ports_list : List[Dict[str, WireArray]]
+            the ports of each transistor connection, as returned by draw_mos_conn().
+        """
+        # compute connection parameters and group identical connections
+        ports_list = [None] * len(conn_list)  # type: List[Optional[Dict[str, WireArray]]]
+        groups = {}
+        for idx, conn_info in enumerate(conn_list):
+            kwargs = conn_info.copy()
+            args = [kwargs.pop(name) for name in ('mos_type', 'row_idx', 'col_idx', 'fg',
+                                                  'sdir', 'ddir')]
+            s_net = kwargs.pop('s_net', '')
+            d_net = kwargs.pop('d_net', '')
+            conn_params, (xc, yc), orient = self._get_mos_conn_info(*args, s_net=s_net,
+                                                                    d_net=d_net, kwargs=kwargs)
+            if self._dry_run:
+                ports_list[idx] = self._get_dry_run_conn_ports(args[0], args[1], conn_params,
+                                                               (xc, yc), orient)
+                continue
+            key = (self.to_immutable_id(conn_params), orient, yc)
+            if key in groups:
+                groups[key][1].append((xc, idx))
+            else:
+                groups[key] = (conn_params, [(xc, idx)])
+
+        # draw connections, arraying runs with constant pitch
+        layer = self.mos_conn_layer
+        for (_, orient, yc), (conn_params, x_list) in groups.items():
+            conn_master = self.new_template(params=conn_params, temp_cls=AnalogMOSConn)
+            x_list.sort()
+            num_tot = len(x_list)
+            start = 0
+            while start < num_tot:
+                stop = start + 1
+                if stop < num_tot:
+                    spx = x_list[stop][0] - x_list[start][0]
+                    while stop < num_tot and x_list[stop][0] - x_list[stop - 1][0] == spx:
+                        stop += 1
+                else:
+                    spx = 0
+                nx = stop - start
+                conn_inst = self.add_instance(conn_master, loc=(x_list[start][0], yc),
+                                              orient=orient, nx=nx, spx=spx, unit_mode=True)
+                for col in range(nx):
+                    ports_list[x_list[start + col][1]] = {
+                        key: conn_inst.get_pin(name=key, col=col, layer=layer)
+                        for key in conn_inst.port_names_iter()}
+                start = stop
+
+        return ports_list
+
+    def _get_dry_run_conn_ports(self, mos_type, row_idx, conn_params, loc, orient):
+        # type: (str, int, Dict[str, Any], Tuple[int, int], str) -> Dict[str, WireArray]
+        """Returns transistor connection ports without drawing the connection.
+
+        Source and drain ports are placed on alternating source/drain columns and span the drain
+        connection region of the row.  Gate ports are placed on the drain columns, or on the
+        inner source columns if gate_pref_loc is 's', and span the gate connection region of the
+        row.  Exact gate columns and wire extensions depend on the technology, so these ports
+        are only suitable for floorplanning.
+
+        Parameters
+        ----------
+        mos_type : str
+            the row type, one of 'nch' or 'pch'.
+        row_idx : int
+            the center row index.  0 is the bottom-most row.
+        conn_params : Dict[str, Any]
+            the AnalogMOSConn parameters.
+        loc : Tuple[int, int]
+            the connection instance location, in resolution units.
+        orient : str
+            the connection instance orientation.
+
+        Returns
+        -------
         ports : Dict[str, WireArray]
             a dictionary of ports as WireArrays.  The keys are 'g', 'd', and 's'.
         """
+        grid = self.grid
+        layer = self.mos_conn_layer
+        ridx = self._ridx_lookup[mos_type][row_idx]
+        conn_y = self._row_prop_list[ridx]['conn_y']
+
+        stack = conn_params.get('stack', 1)
+        num_seg = conn_params['fg'] // stack
+        wire_pitch = stack * self.sd_pitch_unit
+        s_cols = list(range(0, num_seg + 1, 2))
+        d_cols = list(range(1, num_seg + 1, 2))
+        if conn_params.get('gate_pref_loc', '') == 's' and len(s_cols) > 2:
+            g_cols = s_cols[1:-1]
+        else:
+            g_cols = d_cols
+
+        x0, yc = loc
+        xdir = -1 if orient == 'MY' or orient == 'R180' else 1
+        flip_y = orient == 'MX' or orient == 'R180'
+        ports = {}
+        for name, cols, (yb, yt) in (('s', s_cols, conn_y['ds']), ('d', d_cols, conn_y['ds']),
+                                     ('g', g_cols, conn_y['g'])):
+            tr_list = sorted(grid.coord_to_track(layer, x0 + xdir * col * wire_pitch,
+                                                 unit_mode=True) for col in cols)
+            num = len(tr_list)
+            pitch = tr_list[1] - tr_list[0] if num > 1 else 0
+            if flip_y:
+                yb, yt = yc - yt, yc - yb
+            else:
+                yb, yt = yc + yb, yc + yt
+            ports[name] = WireArray(TrackID(layer, tr_list[0], num=num, pitch=pitch), yb, yt,
+                                    res=grid.resolution, unit_mode=True)
+        return ports
+
+    def _get_mos_conn_info(self, mos_type, row_idx, col_idx, fg, sdir, ddir, s_net, d_net,
+                           kwargs):
+        # type: (...) -> Tuple[Dict[str, Any], Tuple[int, int], str]
+        """Mark the given transistors as connected, and returns the connection parameters.
+
+        Returns
+        -------
+        conn_params : Dict[str, Any]
+            the AnalogMOSConn parameters.
+        loc : Tuple[int, int]
+            the connection instance location, in resolution units.
+        orient : str
+            the connection instance orientation.
+        """
         stack = kwargs.get('stack', 1)
         flip_lr = kwargs.pop('flip_lr', False)
         flip_gate = kwargs.get('flip_gate', False)
@@ -1075,6 +1778,7 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
 
         net_map[intv[0]] = s_net
         net_map[intv[1]] = s_net if seg % 2 == 0 else d_net
+        self._mark_used(mos_type, row_idx, intv[0], intv[1])
 
         sd_pitch = self.sd_pitch_unit
         ridx = self._ridx_lookup[mos_type][row_idx]
@@ -1113,15 +1817,10 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         )
         conn_params.update(kwargs)
 
-        conn_master = self.new_template(params=conn_params, temp_cls=AnalogMOSConn)
         if flip_lr:
             orient = 'MY' if orient == 'R0' else 'R180'
             xc += fg * sd_pitch
-        loc = xc, yc
-        conn_inst = self.add_instance(conn_master, loc=loc, orient=orient, unit_mode=True)
-
-        return {key: conn_inst.get_pin(name=key, layer=self.mos_conn_layer)
-                for key in conn_inst.port_names_iter()}
+        return conn_params, (xc, yc), orient
 
     def get_substrate_box(self, bottom=True):
         # type: (bool) -> Tuple[Optional[BBox], Optional[BBox]]
@@ -1353,10 +2052,95 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                                master.get_ext_top_info(), master.get_ext_bot_info()))
             self._ridx_lookup[sub_type].append(row_offset)
 
+    def _get_ext_params(self, ext_h, fg_tot, top_ext_info, bot_ext_info, ext_options):
+        # type: (int, int, Any, Any, Dict[str, Any]) -> Dict[str, Any]
+        return dict(
+            lch=self._lch,
+            w=ext_h,
+            fg=fg_tot,
+            top_ext_info=top_ext_info,
+            bot_ext_info=bot_ext_info,
+            options=ext_options,
+            tech_cls_name=self._tech_cls_name,
+        )
+
+    def _get_placement_key(self, rprop_list, pinfo_list, fg_tot, guard_ring_nf, top_layer,
+                           dy, min_height, wire_tree):
+        # type: (...) -> Optional[str]
+        """Returns the on-disk placement cache key, or None if the placement cache is disabled.
+
+        None is also returned if some placement input cannot be hashed, so placement is
+        always searched in that case.
+        """
+        if self.get_placement_cache() is None:
+            return None
+        tech_key = PlacementCache.get_tech_key(self._tech_cls)
+        if tech_key is None:
+            return None
+        grid = self.grid
+        hm_layer = self.mos_conn_layer + 1
+        layers = list(range(self.dum_conn_layer, max(hm_layer, top_layer) + 1))
+        try:
+            return PlacementCache.compute_key((
+                self._tech_cls_name,
+                tech_key,
+                PlacementCache.get_grid_key(grid, layers),
+                self._lch, fg_tot, guard_ring_nf, dy, min_height,
+                self._tech_cls.get_mos_pitch(unit_mode=True),
+                self._layout_info.vertical_pitch_unit,
+                [rprop['mos_type'] for rprop in rprop_list],
+                pinfo_list,
+                wire_tree.get_content_key(),
+            ))
+        except Exception:
+            return None
+
+    def _search_placement(self, rprop_list, pinfo_list, lch_unit, fg_tot, hm_layer, mos_pitch,
+                          tot_pitch, dy, guard_ring_nf, min_height, wire_tree):
+        """Find bot_ext_w such that we place blocks as close to center as possible.
+
+        Use binary search to shorten search.
+        """
+        # run first iteration out of the while loop to get minimum bottom extension.
+        tmp_result = self._place_helper(0, rprop_list, pinfo_list, lch_unit, fg_tot, hm_layer,
+                                        mos_pitch, tot_pitch, dy, guard_ring_nf, min_height,
+                                        wire_tree)
+        _, ext_list, ytop, _ = tmp_result
+        ext_first, ext_last = ext_list[0][0], ext_list[-1][0]
+        print('ext_w0 = %d, ext_wend=%d, ytop=%d' % (ext_first, ext_last, ytop))
+        ytop_best = ytop
+        bot_ext_w_iter = BinaryIterator(ext_first, None)
+        bot_ext_w_iter.save_info(tmp_result)
+        bot_ext_w_iter.up()
+        if ext_first < ext_last:
+            while bot_ext_w_iter.has_next():
+                bot_ext_w = bot_ext_w_iter.get_next()
+                tmp_result = self._place_helper(bot_ext_w, rprop_list, pinfo_list, lch_unit, fg_tot,
+                                                hm_layer, mos_pitch, tot_pitch, dy, guard_ring_nf,
+                                                min_height, wire_tree)
+                _, ext_list, ytop, _ = tmp_result
+                ext_first, ext_last = ext_list[0][0], ext_list[-1][0]
+                print('ext_w0 = %d, ext_wend=%d, ytop=%d' % (ext_first, ext_last, ytop))
+
+                if ytop > ytop_best:
+                    bot_ext_w_iter.down()
+                else:
+                    ytop_best = ytop
+                    if ext_first == ext_last:
+                        bot_ext_w_iter.save_info(tmp_result)
+                        break
+                    elif ext_first < ext_last:
+                        bot_ext_w_iter.save_info(tmp_result)
+                        bot_ext_w_iter.up()
+                    else:
+                        bot_ext_w_iter.down()
+
+        return bot_ext_w_iter.get_last_save_info()
+
     def _place_helper(self, bot_ext_w, rinfo_list, pinfo_list, lch_unit, fg_tot, hm_layer,
                       mos_pitch, tot_height_pitch, ybot, guard_ring_nf, min_htot, wire_tree):
         tcls = self._tech_cls
-        grid = self.grid
+        grid = self.grid_cache
         wire_tree = wire_tree.copy()
 
         vm_layer = hm_layer - 1
@@ -1455,10 +2239,10 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                 if wire_groups is not None:
                     for wg in wire_groups:
                         _, tr_idx, tr_w = wg.first_track
-                        idx_targ = self.grid.find_next_track(hm_layer, ytop,
-                                                             tr_width=tr_w,
-                                                             half_track=True,
-                                                             mode=1, unit_mode=True)
+                        idx_targ = grid.find_next_track(hm_layer, ytop,
+                                                        tr_width=tr_w,
+                                                        half_track=True,
+                                                        mode=1, unit_mode=True)
                         if tr_idx < idx_targ:
                             wg.move_by(idx_targ - tr_idx, propagate=True)
 
@@ -1466,15 +2250,8 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
             row_y.append(ycur)
             if idx > 0:
                 ext_h = (ycur - ytop_prev) // mos_pitch
-                ext_params = dict(
-                    lch=self._lch,
-                    w=ext_h,
-                    fg=fg_tot,
-                    top_ext_info=ext_bot_info,
-                    bot_ext_info=prev_ext_info,
-                    options=ext_options,
-                    tech_cls_name=self._tech_cls_name,
-                )
+                ext_params = self._get_ext_params(ext_h, fg_tot, ext_bot_info, prev_ext_info,
+                                                  ext_options)
                 ext_info_list.append((ext_h, ext_params))
 
             ytop_prev = ycur + blk_height
@@ -1492,10 +2269,10 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                     yt = bcy[1]
                     for wg in bwg:
                         _, tr_idx, tr_w = wg.last_track
-                        via_ext = self.grid.get_via_extensions(vm_layer, 1, tr_w, unit_mode=True)[0]
-                        idx_max = self.grid.find_next_track(hm_layer, ycur + yt - via_ext,
-                                                            tr_width=tr_w, half_track=True,
-                                                            mode=-1, unit_mode=True)
+                        via_ext = grid.get_via_extensions(vm_layer, 1, tr_w, unit_mode=True)[0]
+                        idx_max = grid.find_next_track(hm_layer, ycur + yt - via_ext,
+                                                       tr_width=tr_w, half_track=True,
+                                                       mode=-1, unit_mode=True)
                         if idx_max > tr_idx:
                             wg.move_up(idx_max - tr_idx)
 
@@ -1515,6 +2292,7 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         mos_pitch = self._tech_cls.get_mos_pitch(unit_mode=True)
         tot_pitch = self._layout_info.vertical_pitch_unit
         lch_unit = int(round(self._lch / self.grid.layout_unit / self.grid.resolution))
+        grid = self.grid_cache
 
         # make end rows
         bot_end_params = dict(
@@ -1544,43 +2322,32 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         h_top = top_end_master.array_box.height_unit
         min_height -= h_top
 
-        # find bot_ext_w such that we place blocks as close to center as possible,
-        # use binary search to shorten search.
-        # run first iteration out of the while loop to get minimum bottom extension.
-        tmp_result = self._place_helper(0, rprop_list, pinfo_list, lch_unit, fg_tot, hm_layer,
-                                        mos_pitch, tot_pitch, dy, guard_ring_nf, min_height,
-                                        wire_tree)
-        _, ext_list, ytop, _ = tmp_result
-        ext_first, ext_last = ext_list[0][0], ext_list[-1][0]
-        print('ext_w0 = %d, ext_wend=%d, ytop=%d' % (ext_first, ext_last, ytop))
-        ytop_best = ytop
-        bot_ext_w_iter = BinaryIterator(ext_first, None)
-        bot_ext_w_iter.save_info(tmp_result)
-        bot_ext_w_iter.up()
-        if ext_first < ext_last:
-            while bot_ext_w_iter.has_next():
-                bot_ext_w = bot_ext_w_iter.get_next()
-                tmp_result = self._place_helper(bot_ext_w, rprop_list, pinfo_list, lch_unit, fg_tot,
-                                                hm_layer, mos_pitch, tot_pitch, dy, guard_ring_nf,
-                                                min_height, wire_tree)
-                _, ext_list, ytop, _ = tmp_result
-                ext_first, ext_last = ext_list[0][0], ext_list[-1][0]
-                print('ext_w0 = %d, ext_wend=%d, ytop=%d' % (ext_first, ext_last, ytop))
-
-                if ytop > ytop_best:
-                    bot_ext_w_iter.down()
-                else:
-                    ytop_best = ytop
-                    if ext_first == ext_last:
-                        bot_ext_w_iter.save_info(tmp_result)
-                        break
-                    elif ext_first < ext_last:
-                        bot_ext_w_iter.save_info(tmp_result)
-                        bot_ext_w_iter.up()
-                    else:
-                        bot_ext_w_iter.down()
+        # search for placement, or load placement from the on-disk cache.
+        place_key = self._get_placement_key(rprop_list, pinfo_list, fg_tot, guard_ring_nf,
+                                            top_layer, dy, min_height, wire_tree)
+        place_cache = self.get_placement_cache()
+        cached = None if place_key is None else place_cache.load(place_key)
+        if cached is None:
+            y_list, ext_list, ytop, wire_tree = self._search_placement(
+                rprop_list, pinfo_list, lch_unit, fg_tot, hm_layer, mos_pitch, tot_pitch, dy,
+                guard_ring_nf, min_height, wire_tree)
+            if place_key is not None:
+                place_cache.save(place_key, dict(
+                    y_list=y_list,
+                    ext_w_list=[ext_h for ext_h, _ in ext_list],
+                    ytop=ytop,
+                    tr_offsets=wire_tree.get_track_offsets(),
+                ))
+        else:
+            ext_options = dict(guard_ring_nf=guard_ring_nf)
+            y_list = cached['y_list']
+            ytop = cached['ytop']
+            ext_list = [(ext_h, self._get_ext_params(ext_h, fg_tot, pinfo_list[idx + 1][5],
+                                                     pinfo_list[idx][6], ext_options))
+                        for idx, ext_h in enumerate(cached['ext_w_list'])]
+            wire_tree = wire_tree.copy()
+            wire_tree.set_track_offsets(cached['tr_offsets'])
 
-        y_list, ext_list, ytop, wire_tree = bot_ext_w_iter.get_last_save_info()
         ext_first, ext_last = ext_list[0][0], ext_list[-1][0]
         print('final: ext_w0 = %d, ext_wend=%d, ytop=%d' % (ext_first, ext_last, ytop))
 
@@ -1643,15 +2410,24 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                 self._row_prop_list[pridx]['row_y'] = (yb_row, ybot, ybot + height, yt_row)
                 # get gate/drain/source interval
                 if is_sub:
-                    bot_tr = self.grid.find_next_track(hm_layer, ybot, half_track=True, mode=1,
-                                                       unit_mode=True)
-                    top_tr = self.grid.find_next_track(hm_layer, ybot + height, half_track=True,
-                                                       mode=-1, unit_mode=True)
+                    bot_tr = grid.find_next_track(hm_layer, ybot, half_track=True, mode=1,
+                                                  unit_mode=True)
+                    top_tr = grid.find_next_track(hm_layer, ybot + height, half_track=True,
+                                                  mode=-1, unit_mode=True)
                     cur_tr_intvs['g'] = cur_tr_intvs['g2'] = cur_tr_intvs['ds2'] = None
                     cur_tr_intvs['ds'] = (bot_tr, top_tr + 1)
                     cur_wire_info['g'] = cur_wire_info['g2'] = \
                         cur_wire_info['ds'] = cur_wire_info['ds2'] = (None, None)
                 else:
+                    # record gate/drain connection Y intervals relative to the source/drain
+                    # center, used to compute transistor connection ports in dry run mode.
+                    sd_yc_master = master.get_sd_yc()
+                    g_conn_y = master.get_g_conn_y()
+                    d_conn_y = master.get_d_conn_y()
+                    self._row_prop_list[pridx]['conn_y'] = dict(
+                        g=(g_conn_y[0] - sd_yc_master, g_conn_y[1] - sd_yc_master),
+                        ds=(d_conn_y[0] - sd_yc_master, d_conn_y[1] - sd_yc_master),
+                    )
                     cur_pinfo = pinfo_list[pridx]
                     wintv_list, winfo_list = [], []
                     for widx in range(4):
@@ -1659,8 +2435,8 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                         conn_y = cur_pinfo[widx]
                         if wire_groups is None:
                             wyb = yo + conn_y[0] if no_flip else yo - conn_y[1]
-                            wtr = self.grid.find_next_track(hm_layer, wyb, half_track=True, mode=1,
-                                                            unit_mode=True)
+                            wtr = grid.find_next_track(hm_layer, wyb, half_track=True, mode=1,
+                                                       unit_mode=True)
                             wintv_list.append((wtr, wtr))
                             winfo_list.append((None, None))
                         else:
@@ -1691,8 +2467,8 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                 edge_master = self.new_template(params=edge_params, temp_cls=AnalogEdge)
                 edge_width = edge_master.bound_box.width_unit
                 if not edge_master.is_empty:
-                    edge_inst = self.add_instance(edge_master, loc=(edgel_x0, yo),
-                                                  orient=orient, unit_mode=True)
+                    edge_inst = self._add_base_instance(edge_master, loc=(edgel_x0, yo),
+                                                        orient=orient, unit_mode=True)
                     array_box = array_box.merge(edge_inst.array_box)
                     top_bound_box = top_bound_box.merge(edge_inst.bound_box)
                     edge_inst_list.append(edge_inst)
@@ -1700,7 +2476,7 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                 edge_width = 0
 
             inst_loc = (edgel_x0 + edge_width, yo)
-            inst = self.add_instance(master, loc=inst_loc, orient=orient, unit_mode=True)
+            inst = self._add_base_instance(master, loc=inst_loc, orient=orient, unit_mode=True)
             array_box = array_box.merge(inst.array_box)
             top_bound_box = top_bound_box.merge(inst.bound_box)
             # record substrate Y coordinates
@@ -1730,8 +2506,8 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                     tech_cls_name=self._tech_cls_name,
                 )
                 conn_master = self.new_template(params=conn_params, temp_cls=AnalogSubstrateConn)
-                conn_inst = self.add_instance(conn_master, loc=inst_loc,
-                                              orient=orient, unit_mode=True)
+                conn_inst = self._add_base_instance(conn_master, loc=inst_loc,
+                                                    orient=orient, unit_mode=True)
                 sub_type = master.params['sub_type']
                 # save substrate instance
                 if sub_type == 'ptap':
@@ -1763,8 +2539,8 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                 edge_width = edge_master.bound_box.width_unit
                 edger_xo = inst.array_box.right_unit + edge_width
                 if not edge_master.is_empty:
-                    edge_inst = self.add_instance(edge_master, loc=(edger_xo, yo),
-                                                  orient=orient_r, unit_mode=True)
+                    edge_inst = self._add_base_instance(edge_master, loc=(edger_xo, yo),
+                                                        orient=orient_r, unit_mode=True)
                     array_box = array_box.merge(edge_inst.array_box)
                     top_bound_box = top_bound_box.merge(edge_inst.bound_box)
                     edge_inst_list.append(edge_inst)
@@ -1781,11 +2557,13 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                 if y_thres is not None:
                     y_thres += yo
                 sub_y_list.append((y_imp, y_thres))
-                if not ext_master.is_empty:
-                    self.add_instance(ext_master, loc=(inst_loc[0], yo), unit_mode=True)
+                if not ext_master.is_empty and not self._dry_run:
+                    self._add_base_instance(ext_master, loc=(inst_loc[0], yo), unit_mode=True)
 
+                # extension edges only contribute guard ring ports
+                draw_ext_edge = not self._dry_run or guard_ring_nf > 0
                 ext_edge_layout_info = ext_master.get_edge_layout_info()
-                if left_end:
+                if left_end and draw_ext_edge:
                     edge_params = dict(
                         is_end=True,
                         guard_ring_nf=guard_ring_nf,
@@ -1796,10 +2574,10 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                     )
                     edge_master = self.new_template(params=edge_params, temp_cls=AnalogEdge)
                     if not edge_master.is_empty:
-                        edge_inst = self.add_instance(edge_master, loc=(edgel_x0, yo),
-                                                      unit_mode=True)
+                        edge_inst = self._add_base_instance(edge_master, loc=(edgel_x0, yo),
+                                                            unit_mode=True)
                         edge_inst_list.append(edge_inst)
-                if right_end:
+                if right_end and draw_ext_edge:
                     edge_params = dict(
                         is_end=True,
                         guard_ring_nf=guard_ring_nf,
@@ -1810,8 +2588,8 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                     )
                     edge_master = self.new_template(params=edge_params, temp_cls=AnalogEdge)
                     if not edge_master.is_empty:
-                        edge_inst = self.add_instance(edge_master, loc=(edger_xo, yo),
-                                                      orient='MY', unit_mode=True)
+                        edge_inst = self._add_base_instance(edge_master, loc=(edger_xo, yo),
+                                                            orient='MY', unit_mode=True)
                         edge_inst_list.append(edge_inst)
 
         # gather guard ring ports
@@ -1842,10 +2620,10 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
             self._sub_bndx = tot_imp_box.left_unit, tot_imp_box.right_unit
 
         # connect body guard rings together
-        self._gr_vdd_warrs = self.connect_wires(gr_vdd_warrs)
-        self._gr_vss_warrs = self.connect_wires(gr_vss_warrs)
-        self.connect_wires(gr_vdd_dum_warrs)
-        self.connect_wires(gr_vss_dum_warrs)
+        self._gr_vdd_warrs = self._connect_base_wires(gr_vdd_warrs)
+        self._gr_vss_warrs = self._connect_base_wires(gr_vss_warrs)
+        self._connect_base_wires(gr_vdd_dum_warrs)
+        self._connect_base_wires(gr_vss_dum_warrs)
 
         # set array box/size/draw PR boundary
         self.array_box = BBox(arr_box_x[0], array_box.bottom_unit, arr_box_x[1], array_box.top_unit,
@@ -1856,7 +2634,7 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
             self.prim_bound_box = bound_box
             self.prim_top_layer = top_layer
         else:
-            self.set_size_from_bound_box(top_layer, bound_box)
+            self._set_base_size(top_layer, bound_box)
 
         # set left/right edge info
         self._lr_edge_info = (AnalogBaseEdgeInfo(le_info_list, []),
@@ -1970,7 +2748,22 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                 the minimum height, in resolution units.
             ds2_no_po : bool
                 True to avoid PO for ds2 routing tracks.  Defaults to False.
+            checkpoint : bool
+                True to save the state of this AnalogBase after placement, keyed by the
+                template class and the arguments of this method.  Later calls from templates of
+                the same class with the same arguments restore the saved state instead of
+                creating masters and searching for placement again.  All arguments must be
+                convertible to a content key.  Defaults to False.
         """
+        if kwargs.get('checkpoint', False) and self._layout_info is None:
+            draw_args = (lch, fg_tot, ptap_w, ntap_w, nw_list, nth_list, pw_list, pth_list,
+                         ng_tracks, nds_tracks, pg_tracks, pds_tracks, n_orientations,
+                         p_orientations, guard_ring_nf, n_kwargs, p_kwargs, pgr_w, ngr_w,
+                         min_fg_sep, end_mode, top_layer, sub_parity)
+            ckpt_key = self._get_checkpoint_key(draw_args, kwargs, top_layer)
+        else:
+            ckpt_key = None
+
         if 'gds_space' in kwargs:
             print('WARNING: gds_space parameter is no longer supported '
                   'by draw_base() of AnalogBase.')
@@ -2014,6 +2807,9 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         self._capp_intvs = [IntervalSet() for _ in range(nump)]
         self._n_netmap = [[''] * (fg_tot + 1) for _ in range(numn)]
         self._p_netmap = [[''] * (fg_tot + 1) for _ in range(nump)]
+        self._n_used = [np.zeros(fg_tot, dtype=bool) for _ in range(numn)]
+        self._p_used = [np.zeros(fg_tot, dtype=bool) for _ in range(nump)]
+        self._dum_info_cache = {}
 
         self._ridx_lookup = dict(nch=[], pch=[], ntap=[], ptap=[])
 
@@ -2031,6 +2827,27 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
             ngr_w = 0 if pw_list else ptap_w
             pgr_w = 0 if nw_list else ntap_w
 
+        if ckpt_key is not None:
+            ckpt_table = self._get_checkpoint_table()
+            state = ckpt_table.get(ckpt_key, None)
+            if state is not None:
+                self._restore_checkpoint(state)
+                self._row_layout_info = dict(
+                    top_layer=self._layout_info.top_layer,
+                    guard_ring_nf=guard_ring_nf,
+                    draw_boundaries=True,
+                    end_mode=end_mode,
+                    row_prop_list=self._row_prop_list,
+                )
+                self._build_track_tables()
+                if not self._dry_run:
+                    self.grid.tech_info.draw_device_blockage(self)
+                return
+            # record layout changes made by placement
+            self._draw_log = []
+        else:
+            ckpt_table = None
+
         # place transistor blocks
         wire_tree = WireTree()
         master_list = []
@@ -2069,8 +2886,15 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                     left_end != 0, right_end != 0, bot_sub_end != 0, top_sub_end != 0,
                     tr_manager, min_height, wire_tree)
 
+        if ckpt_table is not None:
+            ckpt_table[ckpt_key] = self._save_checkpoint()
+            self._draw_log = None
+
+        self._build_track_tables()
+
         # draw device blockages
-        self.grid.tech_info.draw_device_blockage(self)
+        if not self._dry_run:
+            self.grid.tech_info.draw_device_blockage(self)
 
     def _connect_substrate(self,  # type: AnalogBase
                            sub_type,  # type: str
@@ -2215,7 +3039,9 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         # type: (...) -> Tuple[List[WireArray], List[WireArray]]
         """Draw dummy/separator on all unused transistors.
 
-        This method should be called last.
+        This method should be called last.  In dry run mode, dummy/separator connections are
+        not drawn, but dummy tracks are still selected, decaps are still connected to the
+        substrates, and the substrates still export and connect supply wires.
 
         Parameters
         ----------
@@ -2449,7 +3275,10 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
                     if tid not in top_dum_tracks:
                         top_dum_tracks.append(tid)
 
-        # step 6: draw dummy connections
+        # step 6: draw dummy connections.  Skipped in dry run mode, so dummy tracks only
+        # extend to the decaps.
+        if self._dry_run:
+            dum_tran_intv_list = []
         for ridx, dum_tran_intv in enumerate(dum_tran_intv_list):
             bot_dist = ridx
             top_dist = num_rows - 1 - ridx
@@ -2575,10 +3404,9 @@ class AnalogBase(TemplateBase, metaclass=abc.ABCMeta):
         dum_layer = self.dum_conn_layer
 
         col0, col1 = intv
-        xl = layout_info.col_to_coord(col0, unit_mode=True)
-        xr = layout_info.col_to_coord(col1, unit_mode=True)
-        htr0 = int(1 + 2 * self.grid.coord_to_track(dum_layer, xl, unit_mode=True))
-        htr1 = int(1 + 2 * self.grid.coord_to_track(dum_layer, xr, unit_mode=True))
+        x_arr = layout_info.col_to_coord_array(intv, unit_mode=True)
+        htr_arr = 1 + 2 * layout_info.coord_to_track_array(dum_layer, x_arr)
+        htr0, htr1 = htr_arr.astype(int).tolist()
 
         htr_pitch = self._tech_cls.get_dum_conn_pitch() * 2
         start, stop = htr0 + 2, htr1
@@ -2,12 +2,20 @@
 
 """This module contains transistor row placement methods and data structures."""
 
-from typing import TYPE_CHECKING, Optional, List, Union, Tuple
+from typing import TYPE_CHECKING, Optional, List, Union, Tuple, Dict, Any, Sequence
 
+import os
+import json
+import weakref
 import bisect
+import hashlib
+import tempfile
+
+from ..layout_info import to_content_key
 
 if TYPE_CHECKING:
-    from bag.layout.routing import TrackManager
+    from ..analog_mos.core import MOSTech
+    from bag.layout.routing import TrackManager, RoutingGrid
 
 
 class WireGroup(object):
@@ -110,6 +118,16 @@ class WireGroup(object):
         # type: (WireGroup) -> None
         self._children.append(wire_grp)
 
+    def get_content_key(self):
+        # type: () -> Tuple[Any, ...]
+        """Returns a hashable key of all parameters that affect the placement of this group."""
+        if self._names is None:
+            return self._layer, self._wire_type, self._num_tr, self.space, self._tr_off
+        widths = tuple((self._tr_manager.get_width(self._layer, name) for name in self._names))
+        spaces = tuple((self._tr_manager.get_space(self._layer, name) for name in self._names))
+        return (self._layer, self._wire_type, self._num_tr, self.space, self._tr_off,
+                tuple(self._names), tuple(self._locs), widths, spaces)
+
     def _get_space(self, wire_grp, name1, name2):
         # type: (WireGroup, str, str) -> Union[int, float]
         if name1 is None:
@@ -211,6 +229,45 @@ class WireTree(object):
 
                     w1.move_by(self._get_half_space(sp))
 
+    def get_content_key(self):
+        # type: () -> Tuple[Any, ...]
+        """Returns a hashable key of all parameters that affect the placement of this tree."""
+        level_keys = []
+        prev_groups = None
+        for wire_id, wire_groups in zip(self._wire_ids, self._wire_list):
+            # spacing between parent and child groups
+            if prev_groups is None:
+                sp_list = ()
+            else:
+                sp_list = tuple((wg._get_space(child, wg.last_track[0], child.first_track[0])
+                                 for wg in prev_groups for child in wire_groups))
+            level_keys.append((wire_id, tuple((wg.get_content_key() for wg in wire_groups)),
+                               sp_list))
+            prev_groups = wire_groups
+        return self._mirror, tuple(level_keys)
+
+    def get_track_offsets(self):
+        # type: () -> List[List[Union[float, int]]]
+        """Returns the track offsets of all wire groups in this tree."""
+        return [[wg.track_offset for wg in wire_groups] for wire_groups in self._wire_list]
+
+    def set_track_offsets(self, offsets):
+        # type: (Sequence[Sequence[Union[float, int]]]) -> None
+        """Sets the track offsets of all wire groups in this tree.
+
+        Parameters
+        ----------
+        offsets : Sequence[Sequence[Union[float, int]]]
+            the track offsets, as returned by get_track_offsets().
+        """
+        if len(offsets) != len(self._wire_list):
+            raise ValueError('Track offsets do not match wire tree.')
+        for wire_groups, off_list in zip(self._wire_list, offsets):
+            if len(off_list) != len(wire_groups):
+                raise ValueError('Track offsets do not match wire tree.')
+            for wg, tr_off in zip(wire_groups, off_list):
+                wg._tr_off = tr_off
+
     def get_wire_groups(self, wire_id, get_next=False):
         # type: (Tuple[int, int]) -> Optional[List[WireGroup]]
         idx = bisect.bisect_left(self._wire_ids, wire_id)
@@ -243,3 +300,114 @@ class WireTree(object):
                     top_tr = last_tr
 
         return top_tr
+
+
+class PlacementCache(object):
+    """A content-addressed on-disk cache of transistor row placement results.
+
+    Each placement result is saved as a JSON file whose name is the hash of all placement
+    inputs, so results can be shared between runs and between different designs.  Entries are
+    never invalidated; any change to the inputs results in a different key.
+
+    Parameters
+    ----------
+    root_dir : str
+        the cache directory.
+    """
+
+    # technology keys of each technology class.
+    _tech_keys = weakref.WeakKeyDictionary()  # type: Dict[MOSTech, Optional[str]]
+
+    def __init__(self, root_dir):
+        # type: (str) -> None
+        self._root_dir = os.path.abspath(root_dir)
+
+    @property
+    def root_dir(self):
+        # type: () -> str
+        return self._root_dir
+
+    @classmethod
+    def get_tech_key(cls, tech_cls):
+        # type: (MOSTech) -> Optional[str]
+        """Returns a hash of the technology configuration.  Computed once per technology class.
+
+        Only the configuration dictionary of the technology class is hashed, as the other
+        technology parameters contain class instances with no stable content.
+
+        Parameters
+        ----------
+        tech_cls : MOSTech
+            the technology class.
+
+        Returns
+        -------
+        tech_key : Optional[str]
+            the technology key, or None if the configuration cannot be hashed.
+        """
+        try:
+            return cls._tech_keys[tech_cls]
+        except KeyError:
+            pass
+        try:
+            tech_key = cls.compute_key(tech_cls.config)
+        except Exception:
+            tech_key = None
+        cls._tech_keys[tech_cls] = tech_key
+        return tech_key
+
+    @classmethod
+    def get_grid_key(cls, grid, layers):
+        # type: (RoutingGrid, Sequence[int]) -> Tuple[Any, ...]
+        """Returns a hashable key of the routing grid specification on the given layers."""
+        layer_keys = tuple(((lay, grid.get_direction(lay),
+                             grid.track_to_coord(lay, 0, unit_mode=True),
+                             grid.get_track_pitch(lay, unit_mode=True),
+                             grid.get_track_width(lay, 1, unit_mode=True),
+                             grid.get_line_end_space(lay, 1, unit_mode=True))
+                            for lay in layers))
+        return grid.resolution, grid.layout_unit, grid.get_flip_parity(), layer_keys
+
+    @classmethod
+    def compute_key(cls, content):
+        # type: (Any) -> str
+        """Returns the cache key of the given placement inputs."""
+        return hashlib.sha1(repr(to_content_key(content)).encode('utf-8')).hexdigest()
+
+    def _get_path(self, key):
+        # type: (str) -> str
+        return os.path.join(self._root_dir, key[:2], key + '.json')
+
+    def load(self, key):
+        # type: (str) -> Optional[Dict[str, Any]]
+        """Returns the placement result with the given key, or None if not found."""
+        try:
+            with open(self._get_path(key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key, result):
+        # type: (str, Dict[str, Any]) -> None
+        """Saves the given placement result.
+
+        Parameters
+        ----------
+        key : str
+            the cache key.
+        result : Dict[str, Any]
+            the placement result.  Must be JSON serializable.
+        """
+        fname = self._get_path(key)
+        dir_name = os.path.dirname(fname)
+        os.makedirs(dir_name, exist_ok=True)
+        # write to a temporary file first, so concurrent runs never see partial results.
+        fd, tmp_name = tempfile.mkstemp(suffix='.tmp', dir=dir_name)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp_name, fname)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
@@ -3,7 +3,9 @@
 """This module defines various substrate related classes."""
 # TODO: Add tech_cls switch support?
 
-from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, Optional, Union
+from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, Optional, Union, List
+
+import weakref
 
 from bag.util.search import BinaryIterator
 from bag.layout.template import TemplateBase
@@ -13,6 +15,7 @@ from bag.layout.util import BBox
 from ..analog_mos.substrate import AnalogSubstrate
 from ..analog_mos.edge import AnalogEdge, AnalogEndRow, SubRingEndRow
 from ..analog_mos.mos import SubRingExt
+from ..routing.grid_cache import get_grid_table
 from ..analog_mos.conn import AnalogSubstrateConn
 
 from .base import AnalogBaseInfo
@@ -42,6 +45,9 @@ class SubstrateContact(TemplateBase):
         :class:`bag.layout.template.TemplateBase` for details.
     """
 
+    # substrate heights of each routing grid.
+    _height_table = weakref.WeakKeyDictionary()  # type: Dict[RoutingGrid, Dict[Any, int]]
+
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
         TemplateBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
@@ -62,7 +68,20 @@ class SubstrateContact(TemplateBase):
     def get_substrate_height(cls, grid, top_layer, lch, w, sub_type, threshold,
                              end_mode=15, **kwargs):
         # type: (RoutingGrid, int, float, Union[int, float], str, str, int, **kwargs) -> int
-        """Compute height of the substrate contact block, given parameters."""
+        """Compute height of the substrate contact block, given parameters.
+
+        The result is cached for each routing grid.
+        """
+        height_table = get_grid_table(cls._height_table, grid)
+        try:
+            key = (top_layer, lch, w, sub_type, threshold, end_mode, tuple(sorted(kwargs.items())))
+            blk_h = height_table.get(key, None)
+        except TypeError:
+            # unhashable keyword arguments; do not cache.
+            key = blk_h = None
+        if blk_h is not None:
+            return blk_h
+
         fg = 2
 
         tech_params = grid.tech_info.tech_params
@@ -92,6 +111,8 @@ class SubstrateContact(TemplateBase):
         if end_mode & 2 != 0:
             blk_h += end_h
 
+        if key is not None:
+            height_table[key] = blk_h
         return blk_h
 
     @classmethod
@@ -341,9 +362,156 @@ class SubstrateContact(TemplateBase):
         self._fg_tot = sub_fg_tot
 
 
+def _make_sub_row_masters(template, lch, fg, w, sub_type, threshold, mtop_lay, dnw_mode):
+    # type: (TemplateBase, float, int, Union[float, int], str, str, int, str) -> List[TemplateBase]
+    """Returns the bottom end, substrate and top end row masters of a substrate ring row."""
+    options1 = dict(is_sub_ring=True, dnw_mode=dnw_mode)
+    options2 = dict(dnw_mode=dnw_mode)
+    options3 = options1.copy()
+    options3['integ_htr'] = True
+
+    sub_params = dict(
+        lch=lch,
+        fg=fg,
+        w=w,
+        sub_type=sub_type,
+        threshold=threshold,
+        top_layer=mtop_lay,
+        options=options3,
+    )
+    sub_master = template.new_template(params=sub_params, temp_cls=AnalogSubstrate)
+
+    end1_params = dict(
+        lch=lch,
+        fg=fg,
+        sub_type=sub_type,
+        threshold=threshold,
+        is_end=True,
+        top_layer=mtop_lay,
+        options=options1,
+    )
+    end1_master = template.new_template(params=end1_params, temp_cls=AnalogEndRow)
+
+    end2_params = dict(
+        fg=fg,
+        sub_type=sub_type,
+        threshold=threshold,
+        end_ext_info=sub_master.get_ext_top_info(),
+        options=options2,
+    )
+    end2_master = template.new_template(params=end2_params, temp_cls=SubRingEndRow)
+
+    return [end1_master, sub_master, end2_master]
+
+
+def _make_sub_ring_edge(template, master, fg_side):
+    # type: (TemplateBase, TemplateBase, int) -> AnalogEdge
+    """Returns the substrate ring edge master of the given row master."""
+    edge_params = dict(
+        is_end=True,
+        is_sub_ring=True,
+        guard_ring_nf=fg_side,
+        name_id=master.get_layout_basename(),
+        layout_info=master.get_edge_layout_info(),
+        adj_blk_info=master.get_left_edge_info(),
+    )
+    return template.new_template(params=edge_params, temp_cls=AnalogEdge)
+
+
+class SubRingCorner(TemplateBase):
+    """The bottom left corner of a substrate ring.
+
+    This template stacks the edge blocks of the bottom end, substrate and top end rows of a
+    substrate ring.  SubstrateRing places it at all four corners with mirrored orientations.
+    The edge blocks only depend on the row layout information, which is the same for any
+    number of fingers, so one corner is shared by rings of all sizes.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+        the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
+
+    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
+        # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
+        TemplateBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
+
+    @classmethod
+    def get_params_info(cls):
+        # type: () -> Dict[str, str]
+        """Returns a dictionary containing parameter descriptions.
+
+        Override this method to return a dictionary from parameter names to descriptions.
+
+        Returns
+        -------
+        param_info : Dict[str, str]
+            dictionary from parameter name to description.
+        """
+        return dict(
+            lch='channel length, in meters.',
+            fg='number of fingers of the adjacent substrate unit.',
+            w='substrate tap width, in meters/number of fins.',
+            sub_type='the substrate type.',
+            threshold='substrate threshold flavor.',
+            fg_side='number of fingers in vertical substrate ring.',
+            top_layer='the top layer of the substrate rows.',
+            dnw_mode='deep N-well mode string.  Empty string to disable.',
+        )
+
+    def draw_layout(self):
+        # type: () -> None
+        lch = self.params['lch']
+        fg = self.params['fg']
+        w = self.params['w']
+        sub_type = self.params['sub_type']
+        threshold = self.params['threshold']
+        fg_side = self.params['fg_side']
+        top_layer = self.params['top_layer']
+        dnw_mode = self.params['dnw_mode']
+
+        master_list = _make_sub_row_masters(self, lch, fg, w, sub_type, threshold, top_layer,
+                                            dnw_mode)
+        edge_list = [_make_sub_ring_edge(self, master, fg_side) for master in master_list]
+
+        # stack edges in the same order and orientation as the rows in SubstrateRing.
+        ycur = 0
+        edge_w = edge_list[1].bound_box.width_unit
+        for idx, (master, edge_master) in enumerate(zip(master_list, edge_list)):
+            if not edge_master.is_empty:
+                if idx == 2:
+                    loc, orient = (0, ycur + edge_master.bound_box.height_unit), 'MX'
+                else:
+                    loc, orient = (0, ycur), 'R0'
+                inst = self.add_instance(edge_master, inst_name='XE%d' % idx, loc=loc,
+                                         orient=orient, unit_mode=True)
+                for port_name in inst.port_names_iter():
+                    self.reexport(inst.get_port(port_name), show=False)
+            ycur += master.bound_box.height_unit
+
+        res = self.grid.resolution
+        self.prim_bound_box = BBox(0, 0, edge_w, ycur, res, unit_mode=True)
+        self.prim_top_layer = edge_list[1].prim_top_layer
+
+
 class SubstrateRing(TemplateBase):
     """A template that draws a ring of substrate taps around a given bounding box.
 
+    If sub_unit_fg is given, the top and bottom substrate rows are arrays of fixed-size
+    substrate units followed by one remainder block, and the four corners are
+    :class:`SubRingCorner` instances built from the unit.  Rings of different widths then
+    only differ in the number of units and the remainder block, whose width is always less
+    than a unit.
+
     Parameters
     ----------
     temp_db : TemplateDB
@@ -376,6 +544,7 @@ class SubstrateRing(TemplateBase):
             show_pins=False,
             dnw_mode='',
             half_blk_x=True,
+            sub_unit_fg=None,
         )
 
     @classmethod
@@ -400,6 +569,8 @@ class SubstrateRing(TemplateBase):
             show_pins='True to show pin labels.',
             dnw_mode='deep N-well mode string.  Empty string to disable.',
             half_blk_x='True to allow half block width',
+            sub_unit_fg='number of fingers of the arrayed substrate units.  Must be even.  '
+                        'None to draw top and bottom substrates as single blocks.',
         )
 
     def draw_layout(self):
@@ -414,6 +585,7 @@ class SubstrateRing(TemplateBase):
         show_pins = self.params['show_pins']
         dnw_mode = self.params['dnw_mode']
         half_blk_x = self.params.get('half_blk_x', True)
+        sub_unit_fg = self.params.get('sub_unit_fg', None)
 
         sub_end_mode = 15
         lch = self._tech_cls.get_substrate_ring_lch()
@@ -437,92 +609,92 @@ class SubstrateRing(TemplateBase):
         if top_layer < mtop_lay:
             raise ValueError('top_layer = %d must be at least %d' % (top_layer, mtop_lay))
 
-        htot, master_list, edge_list = self._make_masters(top_layer, mtop_lay, lch, fg_tot, w,
-                                                          fg_side, sub_type, threshold, dnw_mode,
-                                                          box_h)
+        # if sub_unit_fg is given, top and bottom substrates are arrays of fixed-size units
+        # followed by a remainder block, so rings of different sizes share the same masters.
+        fg_list, num_list = self._get_unit_fg_list(fg_tot, sub_unit_fg)
+        htot, row_list, e_ext = self._make_masters(top_layer, mtop_lay, lch, fg_list, w,
+                                                   fg_side, sub_type, threshold, dnw_mode, box_h)
+        # the corners are built from the first block, which is always a full unit.
+        corner_params = dict(
+            lch=lch,
+            fg=fg_list[0],
+            w=w,
+            sub_type=sub_type,
+            threshold=threshold,
+            fg_side=fg_side,
+            top_layer=mtop_lay,
+            dnw_mode=dnw_mode,
+        )
+        corner_master = self.new_template(params=corner_params, temp_cls=SubRingCorner)
 
         # arrange layout masters
-        # first, compute edge margins so everything is quantized properly.
-        m_sub, m_end1, m_end2, m_ext = master_list
-        e_sub, e_end1, e_end2, e_ext = edge_list
-        e1_h = m_end1.bound_box.height_unit
-        e2_h = m_end2.bound_box.height_unit
-        sub_h = m_sub.bound_box.height_unit
-        sub_w = m_sub.bound_box.width_unit
-        e_sub_w = e_sub.bound_box.width_unit
-
-        # add masters at correct locations
-        m_list = [e_end1, m_end1, e_end1, e_sub, m_sub, e_sub, e_end2, m_end2, e_end2]
-        xl_list = [dx, dx + e_sub_w, dx + e_sub_w + sub_w]
-        yl_list = [0, e1_h, e1_h + sub_h]
-        o_list = ['R0', 'R0', 'MY']
+        h_list = [master.bound_box.height_unit for master in row_list[0]]
+        e_sub_w = corner_master.bound_box.width_unit
+        yl_list = [0, h_list[0], h_list[0] + h_list[1]]
         flip_ud_y = [False, False, True]
         self._blk_loc = ((wtot - box_w) // 2, (htot - box_h) // 2)
 
-        # substrate connection master
-        conn_params = dict(
-            layout_info=m_sub.get_edge_layout_info(),
-            layout_name=m_sub.get_layout_basename() + '_subconn',
-            is_laygo=False,
-        )
-        m_conn = self.new_template(params=conn_params, temp_cls=AnalogSubstrateConn)
+        # substrate connection masters
+        conn_masters = []
+        for master_list in row_list:
+            m_sub = master_list[1]
+            conn_params = dict(
+                layout_info=m_sub.get_edge_layout_info(),
+                layout_name=m_sub.get_layout_basename() + '_subconn',
+                is_laygo=False,
+            )
+            conn_masters.append(self.new_template(params=conn_params,
+                                                  temp_cls=AnalogSubstrateConn))
 
         # add substrate row masters
-        edge_inst_list = []
         conn_list = []
         tid_list = []
         hm_pitch = self.grid.get_track_pitch(mtop_lay, unit_mode=True)
+        xr = dx + e_sub_w
         for name_fmt, flip_ud1, yoff in (('XB%d', False, 0), ('XT%d', True, htot)):
-            m_idx = 0
+            cur_conn_list = []
             for yidx, (yl, flip_ud2) in enumerate(zip(yl_list, flip_ud_y)):
                 flip_ud = (flip_ud1 != flip_ud2)
-                for xidx, (xl, orient) in enumerate(zip(xl_list, o_list)):
-                    master = m_list[m_idx]
-                    cur_name = name_fmt % m_idx  # type: str
+                # substrate units and remainder block
+                xcur = dx + e_sub_w
+                for tidx, (master_list, num) in enumerate(zip(row_list, num_list)):
+                    master = master_list[yidx]
+                    blk_w = master.bound_box.width_unit
                     if not master.is_empty:
-                        if flip_ud:
-                            orient = 'MX' if orient == 'R0' else 'R180'
-                        if orient == 'R0':
-                            if flip_ud1:
-                                loc = (xl, yoff - yl - master.bound_box.height_unit)
-                            else:
-                                loc = (xl, yl)
-                        elif orient == 'MY':
-                            if flip_ud1:
-                                loc = (xl + master.bound_box.width_unit, yoff - yl - master.bound_box.height_unit)
-                            else:
-                                loc = (xl + master.bound_box.width_unit, yl)
-                        elif orient == 'MX':
-                            if flip_ud1:
-                                loc = (xl, yoff - yl)
-                            else:
-                                loc = (xl, yl + master.bound_box.height_unit)
-                        elif orient == 'R180':
-                            if flip_ud1:
-                                loc = (xl + master.bound_box.width_unit, yoff - yl)
-                            else:
-                                loc = (xl + master.bound_box.width_unit, yl + master.bound_box.height_unit)
-                        else:
-                            raise ValueError('Unsupported orientation: %s' % orient)
+                        cur_name = name_fmt % yidx  # type: str
+                        if tidx > 0:
+                            cur_name = '%s_%d' % (cur_name, tidx)
+                        loc, orient = self._get_inst_loc(master, xcur, yl, 'R0', flip_ud,
+                                                         flip_ud1, yoff)
                         inst = self.add_instance(master, inst_name=cur_name, loc=loc,
-                                                 orient=orient, unit_mode=True)
-                        if xidx == 0 or xidx == 2:
-                            edge_inst_list.append(inst)
-                        elif xidx == 1 and yidx == 1:
-                            # get supply TrackID
-                            hm_tidx = self.grid.coord_to_nearest_track(mtop_lay, inst.bound_box.yc_unit,
-                                                               unit_mode=True)
-                            ntr = inst.bound_box.height_unit // hm_pitch  # type: int
-                            tr_width = self.grid.get_max_track_width(mtop_lay, 1, ntr,
-                                                                     half_end_space=False)
-                            tid_list.append(TrackID(mtop_lay, hm_tidx, width=tr_width))
-                            inst = self.add_instance(m_conn, inst_name=cur_name + '_CONN', loc=loc,
-                                                     orient=orient, unit_mode=True)
-                            conn_list.append(inst)
-                    m_idx += 1
-
-        # add left and right edge
-        hsub = e1_h + e2_h + sub_h
+                                                 orient=orient, nx=num, spx=blk_w,
+                                                 unit_mode=True)
+                        if yidx == 1:
+                            if tidx == 0:
+                                # get supply TrackID
+                                hm_tidx = self.grid.coord_to_nearest_track(
+                                    mtop_lay, inst.bound_box.yc_unit, unit_mode=True)
+                                ntr = inst.bound_box.height_unit // hm_pitch  # type: int
+                                tr_width = self.grid.get_max_track_width(mtop_lay, 1, ntr,
+                                                                         half_end_space=False)
+                                tid_list.append(TrackID(mtop_lay, hm_tidx, width=tr_width))
+                            inst = self.add_instance(conn_masters[tidx],
+                                                     inst_name=cur_name + '_CONN', loc=loc,
+                                                     orient=orient, nx=num, spx=blk_w,
+                                                     unit_mode=True)
+                            cur_conn_list.append(inst)
+                    xcur += num * blk_w
+                xr = xcur + e_sub_w
+            conn_list.append(cur_conn_list)
+
+        # add corners and left and right edges
+        edge_inst_list = []
+        if not corner_master.is_empty:
+            for name, loc, orient in (('XCBL', (dx, 0), 'R0'), ('XCBR', (xr, 0), 'MY'),
+                                      ('XCTL', (dx, htot), 'MX'), ('XCTR', (xr, htot), 'R180')):
+                edge_inst_list.append(self.add_instance(corner_master, inst_name=name, loc=loc,
+                                                        orient=orient, unit_mode=True))
+        hsub = sum(h_list)
         edge_inst_list.append(self.add_instance(e_ext, inst_name='XEL', loc=(dx, hsub),
                                                 unit_mode=True))
         edge_inst_list.append(self.add_instance(e_ext, inst_name='XER', loc=(wtot - dx, hsub),
@@ -556,50 +728,60 @@ class SubstrateRing(TemplateBase):
         self.connect_wires(dum_warr_list)
         edge_warrs = self.connect_wires(conn_warr_list)
 
-        for conn_inst, tid in zip(conn_list, tid_list):
-            cur_warrs = edge_warrs + conn_inst.get_port(port_name).get_pins(mtop_lay - 1)
+        for cur_conn_list, tid in zip(conn_list, tid_list):
+            cur_warrs = list(edge_warrs)
+            for conn_inst in cur_conn_list:
+                cur_warrs.extend(conn_inst.get_all_port_pins(port_name, layer=mtop_lay - 1))
             sub_wires = self.connect_to_tracks(cur_warrs, tid)
             self.add_pin(port_name, sub_wires, show=show_pins)
 
-    def _make_masters(self, top_layer, mtop_lay, lch, fg_tot, w, fg_side, sub_type, threshold,
-                      dnw_mode, box_h):
-        options1 = dict(is_sub_ring=True, dnw_mode=dnw_mode)
-        options2 = dict(dnw_mode=dnw_mode)
-        options3 = options1.copy()
-        options3['integ_htr'] = True
+    @classmethod
+    def _get_unit_fg_list(cls, fg_tot, sub_unit_fg):
+        # type: (int, Optional[int]) -> Tuple[List[int], List[int]]
+        """Returns the number of fingers and number of copies of each substrate row block.
+
+        The first block is the substrate unit.  If the row is not a multiple of the unit, it
+        is followed by one remainder block with less than sub_unit_fg fingers.  The unit must
+        have an even number of fingers, so every unit and the remainder block start on the same
+        substrate port track pattern as a single block would.
+        """
+        if sub_unit_fg is None:
+            return [fg_tot], [1]
+        if sub_unit_fg <= 0 or sub_unit_fg % 2 != 0:
+            raise ValueError('sub_unit_fg = %d must be a positive even number.' % sub_unit_fg)
+        num_unit, fg_rem = divmod(fg_tot, sub_unit_fg)
+        if num_unit == 0:
+            return [fg_tot], [1]
+        if fg_rem == 0:
+            return [sub_unit_fg], [num_unit]
+        return [sub_unit_fg, fg_rem], [num_unit, 1]
 
-        sub_params = dict(
-            lch=lch,
-            fg=fg_tot,
-            w=w,
-            sub_type=sub_type,
-            threshold=threshold,
-            top_layer=mtop_lay,
-            options=options3,
-        )
-        sub_master = self.new_template(params=sub_params, temp_cls=AnalogSubstrate)
+    @classmethod
+    def _get_inst_loc(cls, master, xl, yl, orient, flip_ud, flip_ud1, yoff):
+        # type: (TemplateBase, int, int, str, bool, bool, int) -> Tuple[Tuple[int, int], str]
+        """Returns the location and orientation of a substrate ring block.
 
-        end1_params = dict(
-            lch=lch,
-            fg=fg_tot,
-            sub_type=sub_type,
-            threshold=threshold,
-            is_end=True,
-            top_layer=mtop_lay,
-            options=options1,
-        )
-        end1_master = self.new_template(params=end1_params, temp_cls=AnalogEndRow)
+        xl and yl are the lower-left corner of the block in the bottom half of the ring.  If
+        flip_ud1 is True, the block is mirrored to the top half of the ring.
+        """
+        if flip_ud:
+            orient = 'MX' if orient == 'R0' else 'R180'
+        blk_w = master.bound_box.width_unit
+        blk_h = master.bound_box.height_unit
+        x0 = xl if orient == 'R0' or orient == 'MX' else xl + blk_w
+        if orient == 'R0' or orient == 'MY':
+            y0 = yoff - yl - blk_h if flip_ud1 else yl
+        else:
+            y0 = yoff - yl if flip_ud1 else yl + blk_h
+        return (x0, y0), orient
 
-        end2_params = dict(
-            fg=fg_tot,
-            sub_type=sub_type,
-            threshold=threshold,
-            end_ext_info=sub_master.get_ext_top_info(),
-            options=options2,
-        )
-        end2_master = self.new_template(params=end2_params, temp_cls=SubRingEndRow)
+    def _make_masters(self, top_layer, mtop_lay, lch, fg_list, w, fg_side, sub_type, threshold,
+                      dnw_mode, box_h):
+        row_list = [_make_sub_row_masters(self, lch, fg, w, sub_type, threshold, mtop_lay,
+                                          dnw_mode) for fg in fg_list]
 
         # compute extension height
+        end1_master, sub_master, end2_master = row_list[0]
         hsub = (sub_master.bound_box.height_unit + end1_master.bound_box.height_unit +
                 end2_master.bound_box.height_unit)
         hmin = 2 * hsub + box_h
@@ -612,30 +794,18 @@ class SubstrateRing(TemplateBase):
             # make sure template has integer number of blocks from top and bottom.
             htot += blk_h
 
+        # the extension master is not instantiated; it only provides layout information
+        # for the left/right edges, so draw it with the unit width.
         ext_params = dict(
             sub_type=sub_type,
             height=htot - 2 * hsub,
-            fg=fg_tot,
+            fg=fg_list[0],
             end_ext_info=end2_master.get_ext_info(),
-            options=options2,
+            options=dict(dnw_mode=dnw_mode),
         )
         ext_master = self.new_template(params=ext_params, temp_cls=SubRingExt)
 
-        master_list = [sub_master, end1_master, end2_master, ext_master]
-
-        edge_list = []
-        for master in master_list:
-            edge_params = dict(
-                is_end=True,
-                is_sub_ring=True,
-                guard_ring_nf=fg_side,
-                name_id=master.get_layout_basename(),
-                layout_info=master.get_edge_layout_info(),
-                adj_blk_info=master.get_left_edge_info(),
-            )
-            edge_list.append(self.new_template(params=edge_params, temp_cls=AnalogEdge))
-
-        return htot, master_list, edge_list
+        return htot, row_list, _make_sub_ring_edge(self, ext_master, fg_side)
 
 
 class DeepNWellRing(TemplateBase):
@@ -671,6 +841,7 @@ class DeepNWellRing(TemplateBase):
         # type: () -> Dict[str, Any]
         return dict(
             show_pins=False,
+            sub_unit_fg=None,
         )
 
     @classmethod
@@ -693,6 +864,8 @@ class DeepNWellRing(TemplateBase):
             threshold='substrate threshold flavor.',
             show_pins='True to show pin labels.',
             dnw_mode='deep N-well mode string.  This determines the DNW space to adjacent blocks.',
+            sub_unit_fg='number of fingers of the arrayed substrate units.  None to draw '
+                        'top and bottom substrates as single blocks.',
         )
 
     def draw_layout(self):
@@ -705,6 +878,7 @@ class DeepNWellRing(TemplateBase):
         threshold = self.params['threshold']
         show_pins = self.params['show_pins']
         dnw_mode = self.params['dnw_mode']
+        sub_unit_fg = self.params['sub_unit_fg']
 
         # test top_layer
         hm_layer = self._tech_cls.get_mos_conn_layer() + 1
@@ -721,6 +895,7 @@ class DeepNWellRing(TemplateBase):
             threshold=threshold,
             show_pins=False,
             dnw_mode='compact',
+            sub_unit_fg=sub_unit_fg,
         )
         dnw_master = self.new_template(params=dnw_params, temp_cls=SubstrateRing)
         dnw_blk_loc = dnw_master.blk_loc_unit
@@ -733,6 +908,7 @@ class DeepNWellRing(TemplateBase):
             fg_side=fg_side,
             threshold=threshold,
             show_pins=False,
+            sub_unit_fg=sub_unit_fg,
         )
         sub_master = self.new_template(params=sub_params, temp_cls=SubstrateRing)
         sub_blk_loc = sub_master.blk_loc_unit
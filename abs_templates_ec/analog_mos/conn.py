@@ -8,6 +8,8 @@ from typing import Dict, Any, Set
 from bag import float_to_si_string
 from bag.layout.template import TemplateBase, TemplateDB
 
+from ..layout_info import compute_layout_info_key
+
 
 class AnalogMOSConn(TemplateBase):
     """A template containing transistor connections.
@@ -281,6 +283,11 @@ class AnalogSubstrateConn(TemplateBase):
     def get_layout_basename(self):
         return self.params['layout_name']
 
+    def compute_unique_key(self):
+        # the layout only depends on whether the cell name contains 'ext'.
+        key = compute_layout_info_key(self, name_params=('layout_name',))
+        return key, 'ext' in self.params['layout_name']
+
     def draw_layout(self):
         layout_name = self.params['layout_name']
         layout_info = self.params['layout_info']
@@ -3,15 +3,19 @@
 """This module defines abstract analog mosfet template classes.
 """
 
-from typing import TYPE_CHECKING, Dict, Any, Union, Tuple, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, Union, Tuple, List, Optional, Callable
 
 import abc
+import functools
 from itertools import chain
 from collections import namedtuple
 
 from bag.layout.routing import RoutingGrid
 from bag.layout.template import TemplateBase
 
+from ..layout_info import to_content_key, freeze_layout_infos
+from ..tech_bundle import LchParamTable
+
 if TYPE_CHECKING:
     from bag.layout.tech import TechInfoConfig
 
@@ -19,6 +23,24 @@ PlaceInfo = namedtuple('PlaceInfo', ['tot_width', 'core_fg', 'core_width', 'edge
                                      'edge_widths', 'arr_box_x', ])
 
 
+def mos_info_cache(fun):
+    # type: (Callable[..., Any]) -> Callable[..., Any]
+    """Decorator that memoizes a MOSTech layout information method.
+
+    The cache key is computed from the method arguments with :func:`to_content_key`, so
+    dictionary arguments such as layout information dictionaries are supported.  The cache
+    is stored on the MOSTech instance, so it is shared by all templates that use the same
+    technology object.
+    """
+    name = fun.__name__
+
+    @functools.wraps(fun)
+    def wrapper(self, *args, **kwargs):
+        return self.get_cached_info(name, fun, *args, **kwargs)
+
+    return wrapper
+
+
 class MOSTech(object, metaclass=abc.ABCMeta):
     """An abstract class for drawing transistor related layout.
     
@@ -43,6 +65,85 @@ class MOSTech(object, metaclass=abc.ABCMeta):
         self.tech_info = tech_info
         self._lch_unit = None
         self._mos_constants = None
+        self._mos_constants_table = {}  # type: Dict[int, Dict[str, Any]]
+
+    def _get_info_cache(self):
+        # type: () -> Tuple[Dict[Any, Any], Dict[str, List[int]]]
+        # create cache lazily, as some subclasses do not call MOSTech.__init__()
+        try:
+            return self._info_cache, self._info_cache_stats
+        except AttributeError:
+            self._info_cache = {}
+            self._info_cache_stats = {}
+            return self._info_cache, self._info_cache_stats
+
+    def get_cached_info(self, name, fun, *args, **kwargs):
+        # type: (str, Callable[..., Any], *Any, **Any) -> Any
+        """Returns the result of the given layout information method, memoized.
+
+        Parameters
+        ----------
+        name : str
+            the method name.
+        fun : Callable[..., Any]
+            the undecorated method.
+        *args :
+            method positional arguments.
+        **kwargs :
+            method keyword arguments.
+
+        Returns
+        -------
+        info : Any
+            the method return value.  Dictionaries and lists are shallow copied, so callers
+            can add entries without corrupting the cache.  LayoutInfo objects in the return
+            value are frozen.
+        """
+        cache, stats = self._get_info_cache()
+        cur_stats = stats.get(name, None)
+        if cur_stats is None:
+            stats[name] = cur_stats = [0, 0]
+
+        try:
+            key = (name, to_content_key(args), to_content_key(kwargs))
+        except Exception:
+            # argument cannot be converted to an immutable key; do not cache.
+            cur_stats[1] += 1
+            return fun(self, *args, **kwargs)
+
+        ans = cache.get(key, None)
+        if ans is None:
+            cur_stats[1] += 1
+            # freeze cached layout information, so their content keys are computed once and
+            # callers cannot modify the cached objects.
+            ans = cache[key] = freeze_layout_infos(fun(self, *args, **kwargs))
+        else:
+            cur_stats[0] += 1
+
+        if isinstance(ans, dict):
+            return ans.copy()
+        if isinstance(ans, list):
+            return list(ans)
+        return ans
+
+    def get_info_cache_stats(self):
+        # type: () -> Dict[str, Tuple[int, int]]
+        """Returns the layout information cache statistics.
+
+        Returns
+        -------
+        stats : Dict[str, Tuple[int, int]]
+            a dictionary from method name to (num_hits, num_misses) tuple.
+        """
+        stats = self._get_info_cache()[1]
+        return {key: (val[0], val[1]) for key, val in stats.items()}
+
+    def clear_info_cache(self):
+        # type: () -> None
+        """Clears the layout information cache and its statistics."""
+        cache, stats = self._get_info_cache()
+        cache.clear()
+        stats.clear()
 
     @abc.abstractmethod
     def get_edge_info(self, lch_unit, guard_ring_nf, is_end, **kwargs):
@@ -350,6 +451,28 @@ class MOSTech(object, metaclass=abc.ABCMeta):
         """
         return {}
 
+    # noinspection PyMethodMayBeStatic
+    def canonicalize_edge_layout_info(self, layout_info):
+        # type: (Dict[str, Any]) -> Dict[str, Any]
+        """Returns the layout information of a center block as seen by its edge blocks.
+
+        Edge templates are keyed on the returned dictionary, so center blocks with different
+        number of fingers can share the same edge masters.  The returned dictionary must
+        contain all information used by get_outer_edge_info(), get_gr_sub_info() and
+        get_gr_sep_info().  The default implementation returns layout_info unchanged.
+
+        Parameters
+        ----------
+        layout_info : Dict[str, Any]
+            layout information dictionary of the center block.
+
+        Returns
+        -------
+        edge_layout_info : Dict[str, Any]
+            the canonical layout information dictionary.
+        """
+        return layout_info
+
     @abc.abstractmethod
     def draw_mos(self, template, layout_info):
         # type: (TemplateBase, Dict[str, Any]) -> None
@@ -654,45 +777,49 @@ class MOSTech(object, metaclass=abc.ABCMeta):
             a technology constants dictionary.
         """
         if lch_unit != self._lch_unit:
-            # handle general channel-length dependent constants
-            ans = self.mos_config.copy()
-            for key, data in ans.items():
-                if isinstance(data, dict) and 'lch' in data and 'val' in data:
-                    for lch, val in zip(data['lch'], data['val']):
-                        if lch_unit <= lch:
-                            ans[key] = val
-                            break
-
-            # handle mos/dum_conn_w
-            mos_layer = self.get_mos_conn_layer()
-            d_conn_w = ans['d_conn_w']
-            d_bot_layer = ans['d_bot_layer']
-            ans['mos_conn_w'] = d_conn_w[mos_layer - d_bot_layer]
-            ans['dum_conn_w'] = self.get_dum_conn_w(ans)
-            # handle laygo_conn_w
-            if 'laygo_d_conn_w' in ans:
-                d_conn_w = ans['laygo_d_conn_w']
-                d_bot_layer = ans['laygo_d_bot_layer']
-                laygo_layer = self.get_dig_conn_layer()
-                ans['laygo_conn_w'] = d_conn_w[laygo_layer - d_bot_layer]
-
-            # handle sd_pitch
-            offset, scale = ans['sd_pitch_constants']
-            sd_pitch = offset + int(round(scale * lch_unit))
-            ans['sd_pitch'] = sd_pitch
-
-            # handle default parameters
-            if 'po_od_extx' not in ans:
-                offset, lch_scale, sd_pitch_scale = ans.get('po_od_extx_constants', (0, 0, 1))
-                ans['po_od_extx'] = (offset + int(round(lch_scale * lch_unit)) +
-                                     int(round(sd_pitch_scale * sd_pitch)))
-
-            self.postprocess_mos_tech_constants(lch_unit, ans)
+            ans = self._mos_constants_table.get(lch_unit, None)
+            if ans is None:
+                ans = self._compute_mos_tech_constants(lch_unit)
+                self._mos_constants_table[lch_unit] = ans
             self._mos_constants = ans
             self._lch_unit = lch_unit
 
         return self._mos_constants
 
+    def _compute_mos_tech_constants(self, lch_unit):
+        # type: (int) -> Dict[str, Any]
+        # handle general channel-length dependent constants.  The resolved tables are
+        # precomputed if the configuration was loaded from a technology bundle.
+        ans = LchParamTable.resolve(self.mos_config, lch_unit).copy()
+
+        # handle mos/dum_conn_w
+        mos_layer = self.get_mos_conn_layer()
+        d_conn_w = ans['d_conn_w']
+        d_bot_layer = ans['d_bot_layer']
+        ans['mos_conn_w'] = d_conn_w[mos_layer - d_bot_layer]
+        ans['dum_conn_w'] = self.get_dum_conn_w(ans)
+        # handle laygo_conn_w
+        if 'laygo_d_conn_w' in ans:
+            d_conn_w = ans['laygo_d_conn_w']
+            d_bot_layer = ans['laygo_d_bot_layer']
+            laygo_layer = self.get_dig_conn_layer()
+            ans['laygo_conn_w'] = d_conn_w[laygo_layer - d_bot_layer]
+
+        # handle sd_pitch
+        offset, scale = ans['sd_pitch_constants']
+        sd_pitch = offset + int(round(scale * lch_unit))
+        ans['sd_pitch'] = sd_pitch
+
+        # handle default parameters
+        if 'po_od_extx' not in ans:
+            offset, lch_scale, sd_pitch_scale = ans.get('po_od_extx_constants', (0, 0, 1))
+            ans['po_od_extx'] = (offset + int(round(lch_scale * lch_unit)) +
+                                 int(round(sd_pitch_scale * sd_pitch)))
+
+        self.postprocess_mos_tech_constants(lch_unit, ans)
+
+        return ans
+
     def get_analog_unit_fg(self):
         # type: () -> int
         """Returns the number of fingers in an AnalogBase row unit.
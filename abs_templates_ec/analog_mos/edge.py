@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, Optional
 from bag import float_to_si_string
 from bag.layout.template import TemplateBase
 
+from ..layout_info import compute_layout_info_key, get_layout_info_key
 from .substrate import AnalogSubstrateCore
 from .conn import AnalogSubstrateConn
 
@@ -226,6 +227,9 @@ class AnalogOuterEdge(TemplateBase):
     def get_layout_basename(self):
         return self.params['layout_name']
 
+    def compute_unique_key(self):
+        return compute_layout_info_key(self, name_params=('layout_name',))
+
     def draw_layout(self):
         tech_cls_name = self.params['tech_cls_name']
 
@@ -265,6 +269,9 @@ class AnalogGuardRingSep(TemplateBase):
     def get_layout_basename(self):
         return self.params['layout_name']
 
+    def compute_unique_key(self):
+        return compute_layout_info_key(self, name_params=('layout_name',))
+
     def draw_layout(self):
         tech_cls_name = self.params['tech_cls_name']
 
@@ -281,10 +288,15 @@ class AnalogEdge(TemplateBase):
     """A primitive template of the left/right analog mosfet edge block.
 
     This block will include guard ring if that option is enabled.
+
+    The adjacent row layout information is canonicalized with the technology class, so edges
+    of rows that only differ in number of fingers share the same master.
     """
 
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
+        # set before calling TemplateBase constructor, as it is used to compute the unique key.
+        self._edge_layout_info = None
         TemplateBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
 
     @classmethod
@@ -319,10 +331,32 @@ class AnalogEdge(TemplateBase):
             base = 'laygo_' + base
         return base
 
+    def _get_edge_layout_info(self):
+        # type: () -> Dict[str, Any]
+        """Returns the canonical layout information dictionary of the adjacent row."""
+        if self._edge_layout_info is None:
+            tech_cls_name = self.params['tech_cls_name']
+            if tech_cls_name is None:
+                tech_cls = self.grid.tech_info.tech_params['layout']['mos_tech_class']
+            else:
+                tech_cls = self.grid.tech_info.tech_params['layout'][tech_cls_name]
+            layout_info = self.params['layout_info']
+            self._edge_layout_info = tech_cls.canonicalize_edge_layout_info(layout_info)
+        return self._edge_layout_info
+
+    def compute_unique_key(self):
+        params = self.params.copy()
+        # name_id only determines the cell name, except that guard ring substrate connections
+        # check for extension rows by name.
+        is_ext = 'ext' in params.pop('name_id')
+        params['layout_info'] = get_layout_info_key(self._get_edge_layout_info())
+        return self.to_immutable_id(('AnalogEdge', is_ext, params,
+                                     self.grid.get_flip_parity()))
+
     def draw_layout(self):
         guard_ring_nf = self.params['guard_ring_nf']
         adj_blk_info = self.params['adj_blk_info']
-        layout_info = self.params['layout_info']
+        layout_info = self._get_edge_layout_info()
         is_end = self.params['is_end']
         is_sub_ring = self.params['is_sub_ring']
         is_laygo = self.params['is_laygo']
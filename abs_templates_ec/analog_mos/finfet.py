@@ -7,35 +7,55 @@ import math
 from collections import namedtuple
 
 from bag.math import lcm
-from bag.util.search import BinaryIterator
 from bag.layout.util import BBox
-from bag.layout.routing import WireArray
-from bag.layout.routing.fill import fill_symmetric_min_density_info
-from bag.layout.routing.fill import fill_symmetric_interval
+from bag.layout.routing import WireArray, TrackID
 from bag.layout.routing.fill import fill_symmetric_max_density
 from bag.layout.template import TemplateBase
 from enum import IntFlag
 
-from .core import MOSTech
+from ..layout_info import LayoutInfo, BoundedCache, record_type, typed_key
+from ..routing.bus import group_warrs
+from .core import MOSTech, mos_info_cache
+from .od_fill import solve_od_fill
 
 if TYPE_CHECKING:
     from bag.layout.tech import TechInfoConfig
 
 RowInfo = namedtuple('RowInfo', ['od_x_list', 'od_type', 'row_y', 'od_y', 'po_y', 'md_y'])
 AdjRowInfo = namedtuple('AdjRowInfo', ['row_y', 'po_y', 'po_types'])
-EdgeInfo = namedtuple('EdgeInfo', ['od_type', 'draw_layers', 'y_intv'])
+EdgeInfo = record_type('EdgeInfo', ['od_type', 'draw_layers', 'y_intv'],
+                       dict_fields=('draw_layers', 'y_intv'))
 FillInfo = namedtuple('FillInfo', ['layer', 'exc_layer', 'x_intv_list', 'y_intv_list'])
 
+# layout information entries used by edge blocks.
+_edge_info_keys = frozenset(['blk_type', 'lch_unit', 'arr_y', 'row_info_list', 'lay_info_list',
+                             'fill_info_list', 'adj_row_list', 'imp_params', 'dnw_mode',
+                             'sub_type', 'between_gr', 'is_planar_sub', 'is_sub_ring'])
 
-class ExtInfo(namedtuple('ExtInfoBase', ['margins', 'od_h', 'imp_min_h', 'mtype', 'thres',
-                                         'po_types', 'edgel_info', 'edger_info',
-                                         'is_sub_ring'])):
+
+class ExtInfo(record_type('ExtInfoBase', ['margins', 'od_h', 'imp_min_h', 'mtype', 'thres',
+                                          'po_types', 'edgel_info', 'edger_info',
+                                          'is_sub_ring'],
+                          dict_fields=('margins',), tuple_fields=('po_types',))):
     __slots__ = ()
 
+    # reversed records of recently reversed records.
+    _reverse_cache = BoundedCache()
+
     def reverse(self):
-        return self._replace(po_types=tuple(reversed(self.po_types)),
-                             edgel_info=self.edger_info,
-                             edger_info=self.edgel_info)
+        try:
+            key = typed_key(self)
+        except TypeError:
+            # not hashable; do not cache.
+            key = None
+        ans = None if key is None else self._reverse_cache.get(key)
+        if ans is None:
+            ans = self._replace(po_types=tuple(reversed(self.po_types)),
+                                edgel_info=self.edger_info,
+                                edger_info=self.edgel_info)
+            if key is not None:
+                self._reverse_cache.put(key, ans)
+        return ans
 
 
 class GrContinuous(IntFlag):
@@ -66,6 +86,10 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         # type: (Dict[str, Any], TechInfoConfig, str) -> None
         MOSTech.__init__(self, config, tech_info, mos_entry_name=mos_entry_name)
         self.ignore_vm_layers = set()
+        # dummy OD fill solutions of each channel length
+        self._od_fill_table = {}  # type: Dict[int, Dict[Tuple[Any, ...], Tuple[Any, ...]]]
+        # extension block vertical profiles
+        self._ext_profile_table = {}  # type: Dict[Tuple[Any, ...], Dict[str, Any]]
 
     @abc.abstractmethod
     def get_mos_yloc_info(self, lch_unit, w, **kwargs):
@@ -651,7 +675,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         fill_info_list = [FillInfo(layer=layer, exc_layer=info[0], x_intv_list=[],
                                    y_intv_list=info[1]) for layer, info in fill_info.items()]
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type=blk_type,
             lch_unit=lch_unit,
             fg=fg,
@@ -703,6 +727,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         od_yc = (od_yloc[0] + od_yloc[1]) // 2
         return od_yc
 
+    @mos_info_cache
     def get_mos_info(self, lch_unit, w, mos_type, threshold, fg, **kwargs):
         # type: (int, int, str, str, int, **kwargs) -> Dict[str, Any]
         sub_type = 'ptap' if mos_type == 'nch' else 'ntap'
@@ -874,7 +899,6 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
             od_area_adj = (bot_od_h + top_od_h) // 2
             od_area_tot = top_od_yb - bot_od_yt + od_area_adj
             od_area_targ = int(math.ceil(od_area_tot * od_min_density)) - od_area_adj
-            od_fin_area_min = self.get_od_h_inverse(lch_unit, od_area_targ, round_up=True)
             od_fin_area_tot = top_od_fidx - bot_od_fidx - 1
 
             offset = bot_od_fidx + 1
@@ -907,44 +931,51 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
 
             od_area_tot = yblk
             od_area_targ = int(math.ceil(od_area_tot * od_min_density))
-            od_fin_area_min = self.get_od_h_inverse(lch_unit, od_area_targ, round_up=True)
             od_fin_area_tot = top_od_fidx - bot_od_fidx + 1
 
             offset = bot_od_fidx
             foe = True
 
-        od_fin_area_iter = BinaryIterator(od_fin_area_min, od_fin_area_tot + 1)
-        # binary search on OD fill area
-        while od_fin_area_iter.has_next():
-            # compute fill with fin-area target
-            od_fin_area_targ_cur = od_fin_area_iter.get_next()
-            fill_info = fill_symmetric_min_density_info(od_fin_area_tot, od_fin_area_targ_cur,
-                                                        od_nfin_min, od_nfin_max, od_spy_nfin_min,
-                                                        sp_max=od_spy_nfin_max, fill_on_edge=foe,
-                                                        cyclic=False)
-            od_nfin_tot_cur = fill_info[0][0]
-
-            # compute actual OD area
-            od_intv_list = fill_symmetric_interval(*fill_info[0][2], offset=offset,
-                                                   invert=fill_info[1])[0]
-            od_area_cur = sum((self.get_od_h(lch_unit, stop - start)
-                               for start, stop in od_intv_list))
-            if od_area_cur >= od_area_targ:
-                od_fin_area_iter.save_info(od_intv_list)
-                od_fin_area_iter.down()
-            else:
-                if (od_nfin_tot_cur < od_fin_area_targ_cur or
-                        od_fin_area_targ_cur == od_fin_area_tot):
-                    # we cannot do any better by increasing od_fin_area_targ
-                    od_fin_area_iter.save_info(od_intv_list)
-                    break
-                else:
-                    od_fin_area_iter.up()
+        od_fin_list = self._get_dummy_od_fill(lch_unit, od_fin_area_tot, od_area_targ, foe,
+                                              od_spy_nfin_min, od_spy_nfin_max)
 
         # convert fin interval to Y coordinates
-        od_intv_list = od_fin_area_iter.get_last_save_info()
-        return [(self.get_od_edge(lch_unit, start, False),
-                 self.get_od_edge(lch_unit, stop - 1, True)) for start, stop in od_intv_list]
+        return [(self.get_od_edge(lch_unit, start + offset, False),
+                 self.get_od_edge(lch_unit, stop + offset - 1, True))
+                for start, stop in od_fin_list]
+
+    def _get_dummy_od_fill(self,  # type: MOSTechFinfetBase
+                           lch_unit,  # type: int
+                           od_fin_area_tot,  # type: int
+                           od_area_targ,  # type: int
+                           fill_on_edge,  # type: bool
+                           od_spy_nfin_min,  # type: int
+                           od_spy_nfin_max,  # type: int
+                           ):
+        # type: (...) -> Tuple[Tuple[int, int], ...]
+        """Compute dummy OD fin intervals, relative to the first available fin.
+
+        The solution only depends on the fill area in number of fins and the density target,
+        so it is computed once by solve_od_fill() and stored in a per channel length table.
+        """
+        fill_table = self._od_fill_table.get(lch_unit, None)
+        if fill_table is None:
+            self._od_fill_table[lch_unit] = fill_table = {}
+        key = (od_fin_area_tot, od_area_targ, fill_on_edge, od_spy_nfin_min, od_spy_nfin_max)
+        ans = fill_table.get(key, None)
+        if ans is not None:
+            return ans
+
+        mos_constants = self.get_mos_tech_constants(lch_unit)
+        od_nfin_min, od_nfin_max = mos_constants['od_fill_h']
+        fin_p = mos_constants['mos_pitch']
+        # OD area is a linear function of number of fins and number of ODs
+        od_h_delta = self.get_od_h(lch_unit, 1) - fin_p
+
+        ans = solve_od_fill(od_fin_area_tot, od_area_targ, fin_p, od_h_delta, od_nfin_min,
+                            od_nfin_max, od_spy_nfin_min, od_spy_nfin_max, fill_on_edge)
+        fill_table[key] = ans
+        return ans
 
     def _get_dummy_yloc(self, lch_unit, bot_ext_info, top_ext_info, yblk, **kwargs):
         """Compute dummy OD/MD/PO/CPO Y intervals in extension block.
@@ -1137,6 +1168,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
 
         return adj_row_list, adj_edgel_infos, adj_edger_infos, thres_split_y, imp_split_y
 
+    @mos_info_cache
     def get_ext_info(self, lch_unit, w, fg, top_ext_info, bot_ext_info, **kwargs):
         # type: (int, int, int, ExtInfo, ExtInfo, **kwargs) -> Dict[str, Any]
         """Draw extension block.
@@ -1171,6 +1203,99 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         6. top and bottom are different transistor.
            split, force to use transistor implant to avoid constraint 1.
         """
+        # the vertical profile does not depend on number of fingers, so compute it once
+        # for all extension blocks with the same adjacent rows.
+        top_key = top_ext_info._replace(po_types=None)
+        bot_key = bot_ext_info._replace(po_types=None)
+        try:
+            key = (lch_unit, w, top_key, bot_key, tuple(sorted(kwargs.items())))
+            profile = self._ext_profile_table.get(key, None)
+        except TypeError:
+            # some parameter is not hashable; do not cache.
+            key = None
+            profile = None
+        if profile is None:
+            profile = self._get_ext_yprofile(lch_unit, w, top_key, bot_key, **kwargs)
+            if key is not None:
+                self._ext_profile_table[key] = profile
+
+        # replicate the vertical profile horizontally
+        if profile['has_od']:
+            od_x_list = self._get_ext_od_x_list(lch_unit, fg)
+        else:
+            od_x_list = []
+        row_info_list = [RowInfo(od_x_list=od_x_list, od_type=od_type, row_y=row_y, od_y=od_y,
+                                 po_y=po_y, md_y=md_y)
+                         for od_type, row_y, od_y, po_y, md_y in profile['row_list']]
+        adj_row_list = []
+        for adj_row in profile['adj_row_list']:
+            po_mode, po_val = adj_row.po_types
+            if po_mode == 'fill':
+                po_types = (po_val,) * fg
+            elif po_val == 'bot':
+                po_types = bot_ext_info.po_types
+            else:
+                po_types = top_ext_info.po_types
+            adj_row_list.append(adj_row._replace(po_types=po_types))
+
+        # create layout information dictionary
+        layout_info = LayoutInfo(
+            blk_type='ext',
+            lch_unit=lch_unit,
+            fg=fg,
+            arr_y=(0, profile['yt']),
+            draw_od=True,
+            row_info_list=row_info_list,
+            lay_info_list=list(profile['lay_info_list']),
+            # TODO: figure out how to do fill in extension block.
+            fill_info_list=[],
+            # edge parameters
+            sub_type=profile['sub_type'],
+            imp_params=list(profile['imp_params']),
+            is_sub_ring=profile['is_sub_ring'],
+            is_planar_sub=profile['is_planar_sub'],
+            between_gr=profile['between_gr'],
+            dnw_mode='',
+            # adjacent block information list
+            adj_row_list=adj_row_list,
+            left_blk_info=None,
+            right_blk_info=None,
+        )
+
+        lr_edge_info = profile['lr_edge_info']
+        return dict(
+            layout_info=layout_info,
+            sub_ysep=profile['sub_ysep'],
+            left_edge_info=(lr_edge_info, list(profile['adj_edgel_infos'])),
+            right_edge_info=(lr_edge_info, list(profile['adj_edger_infos'])),
+        )
+
+    def _get_ext_od_x_list(self, lch_unit, fg):
+        # type: (int, int) -> List[Tuple[int, int]]
+        """Compute dummy OD horizontal partitioning in extension block."""
+        mos_constants = self.get_mos_tech_constants(lch_unit)
+        sd_pitch = mos_constants['sd_pitch']
+        od_spx = mos_constants['od_spx']
+        od_fill_w_max = mos_constants['od_fill_w_max']
+
+        if od_fill_w_max is None or fg == 1:
+            # force dummy OD if 1 finger, so that Laygo extensions will have dummy OD.
+            return [(0, fg)]
+
+        od_fg_min = self.get_analog_unit_fg()
+        od_fg_max = (od_fill_w_max - lch_unit) // sd_pitch - 1
+        od_spx_fg = self.get_od_spx_fg(lch_unit, od_spx) + 2
+        return fill_symmetric_max_density(fg, fg, od_fg_min, od_fg_max, od_spx_fg,
+                                          fill_on_edge=True, cyclic=False)[0]
+
+    def _get_ext_yprofile(self, lch_unit, w, top_ext_info, bot_ext_info, **kwargs):
+        # type: (int, int, ExtInfo, ExtInfo, **kwargs) -> Dict[str, Any]
+        """Compute the vertical profile of extension block.
+
+        This method computes everything in get_ext_info() that does not depend on number of
+        fingers.  PO types of adjacent rows are returned as ('ext', 'bot'/'top') to use the PO
+        types of the bottom/top row, or ('fill', po_type) to repeat po_type on every finger.
+        """
         mos_layer_table = self.config['mos_layer_table']
 
         mos_constants = self.get_mos_tech_constants(lch_unit)
@@ -1182,9 +1307,6 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         cpo_spy = mos_constants['cpo_spy']
         cpo_h = mos_constants['cpo_h']
         cpo_h_end = mos_constants['cpo_h_end']
-        sd_pitch = mos_constants['sd_pitch']
-        od_spx = mos_constants['od_spx']
-        od_fill_w_max = mos_constants['od_fill_w_max']
         cpo_po_ency = mos_constants['cpo_po_ency']
         is_sub_ring = bot_ext_info.is_sub_ring and top_ext_info.is_sub_ring
         is_planar_sub = self.is_planar_substrate(lch_unit, is_sub_ring=is_sub_ring, **kwargs)
@@ -1208,6 +1330,9 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         tmp = self._get_ext_adj_split_info(lch_unit, w, bot_ext_info, top_ext_info,
                                            od_y_list, cpo_yc_list)
         adj_row_list, adj_edgel_infos, adj_edger_infos, thres_split_y, imp_split_y = tmp
+        # PO types of adjacent rows are filled in by get_ext_info()
+        adj_row_list = [adj_row._replace(po_types=('ext', src))
+                        for adj_row, src in zip(adj_row_list, ('bot', 'top'))]
 
         # check if we draw one or two CPO
         if has_cpo:
@@ -1222,7 +1347,6 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         if not od_y_list:
             # no dummy OD
             lr_edge_info = EdgeInfo(od_type=None, draw_layers={}, y_intv={})
-            od_x_list = []
             od_y_list = md_y_list = [(0, 0)]
             if one_cpo:
                 cpo_yc_list = [yc]
@@ -1233,16 +1357,6 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         else:
             # has dummy OD
             lr_edge_info = EdgeInfo(od_type='dum', draw_layers={}, y_intv={})
-            # get OD horizontal partitioning
-            if od_fill_w_max is None or fg == 1:
-                # force dummy OD if 1 finger, so that Laygo extensions will have dummy OD.
-                od_x_list = [(0, fg)]
-            else:
-                od_fg_min = self.get_analog_unit_fg()
-                od_fg_max = (od_fill_w_max - lch_unit) // sd_pitch - 1
-                od_spx_fg = self.get_od_spx_fg(lch_unit, od_spx) + 2
-                od_x_list = fill_symmetric_max_density(fg, fg, od_fg_min, od_fg_max, od_spx_fg,
-                                                       fill_on_edge=True, cyclic=False)[0]
 
         # compute implant and threshold layer information
         # figure out where to separate top/bottom implant/threshold.
@@ -1408,52 +1522,37 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
                 po_type = 'PO' if one_cpo else 'PO_dummy'
                 adj_row_list = [AdjRowInfo(row_y=(add_row_yb, add_row_yt),
                                            po_y=(add_po_yb, add_po_yt),
-                                           po_types=(po_type,) * fg)]
+                                           po_types=('fill', po_type))]
             else:
                 adj_row_list = adj_edgel_infos = adj_edger_infos = []
 
-        # construct row_info_list, now we know where the implant splits
-        row_info_list = []
+        # compute dummy row vertical information, now we know where the implant splits
+        row_list = []
         for od_y, row_y, po_y, md_y in zip(od_y_list, row_y_list, po_y_list, md_y_list):
             cur_mtype = bot_mtype if max(od_y[0], od_y[1]) < imp_ysep else top_mtype
             cur_sub_type = 'ptap' if cur_mtype == 'nch' or cur_mtype == 'ptap' else 'ntap'
-            row_info_list.append(RowInfo(od_x_list=od_x_list, od_y=od_y,
-                                         od_type=('dum', cur_sub_type),
-                                         row_y=row_y, po_y=po_y, md_y=md_y))
+            row_list.append((('dum', cur_sub_type), row_y, od_y, po_y, md_y))
 
-        # create layout information dictionary
         between_gr = (top_row_type == 'ntap' and bot_row_type == 'ptap') or \
                      (top_row_type == 'ptap' and bot_row_type == 'ntap')
-        layout_info = dict(
-            blk_type='ext',
-            lch_unit=lch_unit,
-            fg=fg,
-            arr_y=(0, yt),
-            draw_od=True,
-            row_info_list=row_info_list,
+        return dict(
+            yt=yt,
+            has_od=num_dod > 0,
+            row_list=row_list,
             lay_info_list=lay_info_list,
-            # TODO: figure out how to do fill in extension block.
-            fill_info_list=[],
-            # edge parameters
             sub_type=sub_type,
             imp_params=imp_params,
             is_sub_ring=is_sub_ring,
             is_planar_sub=is_planar_sub,
             between_gr=between_gr,
-            dnw_mode='',
-            # adjacent block information list
             adj_row_list=adj_row_list,
-            left_blk_info=None,
-            right_blk_info=None,
-        )
-
-        return dict(
-            layout_info=layout_info,
             sub_ysep=(imp_ysep, thres_ysep),
-            left_edge_info=(lr_edge_info, adj_edgel_infos),
-            right_edge_info=(lr_edge_info, adj_edger_infos),
+            lr_edge_info=lr_edge_info,
+            adj_edgel_infos=adj_edgel_infos,
+            adj_edger_infos=adj_edger_infos,
         )
 
+    @mos_info_cache
     def get_sub_ring_ext_info(self, sub_type, height, fg, end_ext_info, **kwargs):
         # type: (str, int, int, ExtInfo, **kwargs) -> Dict[str, Any]
         dnw_mode = kwargs.get('dnw_mode', '')
@@ -1476,7 +1575,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
 
         lr_edge_info = EdgeInfo(od_type='dum', draw_layers={}, y_intv={})
         finbound_lay = mos_layer_table['FB']
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type='ext_subring',
             lch_unit=lch_unit,
             fg=fg,
@@ -1503,6 +1602,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
             right_edge_info=(lr_edge_info, adj_edger_infos),
         )
 
+    @mos_info_cache
     def get_substrate_info(self, lch_unit, w, sub_type, threshold, fg, blk_pitch=1, **kwargs):
         # type: (int, int, str, str, int, int, **kwargs) -> Dict[str, Any]
         return self._get_mos_blk_info(lch_unit, fg, w, sub_type, sub_type, threshold,
@@ -1607,7 +1707,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
             adj_edge_infos = []
 
         blk_type = 'end_subring' if is_sub_ring_end else 'end'
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type=blk_type,
             lch_unit=lch_unit,
             fg=fg,
@@ -1650,6 +1750,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
 
         return ans
 
+    @mos_info_cache
     def get_analog_end_info(self, lch_unit, sub_type, threshold, fg, is_end, blk_pitch, **kwargs):
         # type: (int, str, str, int, bool, int, **kwargs) -> Dict[str, Any]
         """Get substrate end layout information
@@ -1666,6 +1767,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         return self._get_end_blk_info(lch_unit, sub_type, threshold, fg, is_end,
                                       blk_pitch, **kwargs)
 
+    @mos_info_cache
     def get_sub_ring_end_info(self, sub_type, threshold, fg, end_ext_info, **kwargs):
         # type: (str, str, int, ExtInfo, **kwargs) -> Dict[str, Any]
         """Empty block, just reserve space for margin."""
@@ -1675,6 +1777,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         kwargs['end_ext_info'] = end_ext_info
         return self._get_end_blk_info(lch_unit, sub_type, threshold, fg, True, 1, **kwargs)
 
+    @mos_info_cache
     def get_outer_edge_info(self, guard_ring_nf, layout_info, is_end, adj_blk_info, **kwargs):
         # type: (int, Dict[str, Any], bool, Optional[Any], Any) -> Dict[str, Any]
         mos_layer_table = self.config['mos_layer_table']
@@ -1777,7 +1880,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
                 # noinspection PyProtectedMember
                 new_adj_row_list.append(adj_info._replace(po_types=po_types))
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type='edge_'+blk_type if guard_ring_nf == 0 else 'gr_edge_'+blk_type,
             lch_unit=lch_unit,
             fg=fg_outer,
@@ -1801,6 +1904,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
 
         return layout_info
 
+    @mos_info_cache
     def get_gr_sub_info(self, guard_ring_nf, layout_info, **kwargs):
         # type: (int, Dict[str, Any], Any) -> Dict[str, Any]
         is_sub_ring = kwargs.get('is_sub_ring', False)
@@ -1914,7 +2018,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         # noinspection PyProtectedMember
         fill_info_list = [f._replace(x_intv_list=[]) for f in fill_info_list]
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type=edge_blk_type,
             lch_unit=lch_unit,
             fg=fg_gr_sub,
@@ -1939,6 +2043,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
                                                    idx > fg_od_margin + guard_ring_nf)))
         return layout_info
 
+    @mos_info_cache
     def get_gr_sep_info(self, layout_info, adj_blk_info, **kwargs):
         # type: (Dict[str, Any], Any, Any) -> Dict[str, Any]
 
@@ -2005,7 +2110,7 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
             # noinspection PyProtectedMember
             new_adj_list.append(adj_info._replace(po_types=po_types))
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type='gr_sep_end' if 'end' in blk_type else 'gr_sep',
             lch_unit=lch_unit,
             fg=fg_gr_sep,
@@ -2032,6 +2137,26 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
             layout_info['no_md_region'] = set(range(fg_gr_sep + 1))
         return layout_info
 
+    def canonicalize_edge_layout_info(self, layout_info):
+        # type: (Dict[str, Any]) -> Dict[str, Any]
+        # edge blocks replace the OD/PO/fill X coordinates of the center block, so only keep
+        # the finger-independent information.
+        ans = LayoutInfo((key, val) for key, val in layout_info.items()
+                         if key in _edge_info_keys)
+        # noinspection PyProtectedMember
+        if 'row_info_list' in ans:
+            ans['row_info_list'] = [rinfo._replace(od_x_list=[])
+                                    for rinfo in ans['row_info_list']]
+        # noinspection PyProtectedMember
+        if 'adj_row_list' in ans:
+            ans['adj_row_list'] = [adj_info._replace(po_types=())
+                                   for adj_info in ans['adj_row_list']]
+        # noinspection PyProtectedMember
+        if 'fill_info_list' in ans:
+            ans['fill_info_list'] = [finfo._replace(x_intv_list=[])
+                                     for finfo in ans['fill_info_list']]
+        return ans
+
     # noinspection PyMethodMayBeStatic
     def draw_mos_rect(self, template, layer, bbox):
         # type: (TemplateBase, Tuple[str, str], BBox) -> None
@@ -2426,6 +2551,66 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
                     for yb, yt in y_intv_list:
                         self.draw_mos_rect(template, lay, BBox(xl, yb, xr, yt, res, unit_mode=True))
 
+    @classmethod
+    def _get_port_warrs(cls, template, warrs, loc_list):
+        # type: (TemplateBase, List[WireArray], List[Union[float, int]]) -> List[WireArray]
+        """Returns the wires a technology helper drew per finger as arrayed WireArrays.
+
+        warrs[idx] must be the wire drawn at location loc_list[idx].  Each run of evenly spaced
+        locations is built as one WireArray directly from the finger pitch, using the track
+        pitch between the first two wires of the run.  A wire that does not line up with the
+        array starts a new run.
+
+        Parameters
+        ----------
+        template : TemplateBase
+            the template the wires are drawn in.
+        warrs : List[WireArray]
+            the wires returned by the technology helper.
+        loc_list : List[Union[float, int]]
+            the location of each wire, as X coordinates or track indices.
+
+        Returns
+        -------
+        port_warrs : List[WireArray]
+            the arrayed wires.
+        """
+        num_warr = len(warrs)
+        if num_warr != len(loc_list):
+            # the technology helper does not draw one wire per location.
+            return group_warrs(warrs)
+
+        res = template.grid.resolution
+        ans = []
+        start = 0
+        while start < num_warr:
+            warr = warrs[start]
+            tid = warr.track_id
+            stop = start + 1
+            if tid.num == 1 and stop < num_warr:
+                layer_id, width, base_idx = warr.layer_id, tid.width, tid.base_index
+                lower, upper = warr.lower_unit, warr.upper_unit
+                loc_pitch = loc_list[stop] - loc_list[start]
+                tr_pitch = warrs[stop].track_id.base_index - base_idx
+                if loc_pitch != 0 and tr_pitch != 0:
+                    while stop < num_warr and loc_list[stop] - loc_list[stop - 1] == loc_pitch:
+                        cur_warr = warrs[stop]
+                        cur_tid = cur_warr.track_id
+                        if (cur_tid.num != 1 or cur_warr.layer_id != layer_id or
+                                cur_tid.width != width or cur_warr.lower_unit != lower or
+                                cur_warr.upper_unit != upper or
+                                cur_tid.base_index != base_idx + (stop - start) * tr_pitch):
+                            break
+                        stop += 1
+                if stop - start > 1:
+                    warr = WireArray(TrackID(layer_id, base_idx, width=width, num=stop - start,
+                                             pitch=tr_pitch), lower, upper, res=res,
+                                     unit_mode=True)
+            ans.append(warr)
+            start = stop
+
+        return ans
+
     def draw_substrate_connection(self,  # type: MOSTechFinfetBase
                                   template,  # type: TemplateBase
                                   layout_info,  # type: Dict[str, Any]
@@ -2511,8 +2696,11 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
                                                                 dum_x_list, conn_x_list, True, 1,
                                                                 ds_code,
                                                                 ud_parity=sub_parity)
-                template.add_pin(port_name, dum_warrs, show=False)
-                template.add_pin(port_name, port_warrs, show=False)
+                # export arrayed pins built from the finger pitch.
+                template.add_pin(port_name, self._get_port_warrs(template, dum_warrs, dum_x_list),
+                                 show=False)
+                template.add_pin(port_name, self._get_port_warrs(template, port_warrs,
+                                                                 conn_x_list), show=False)
 
                 if not is_guardring:
                     self.draw_g_connection(template, lch_unit, fg, sd_pitch, xshift, od_y, md_y,
@@ -2631,9 +2819,9 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
             g_warrs = self.draw_g_connection(template, lch_unit, fg, sd_pitch, 0, od_y, md_y,
                                              g_x_list, is_sub=False)
 
-            template.add_pin('s', WireArray.list_to_warr(s_warrs), show=False)
-            template.add_pin('d', WireArray.list_to_warr(d_warrs), show=False)
-            template.add_pin('g', WireArray.list_to_warr(g_warrs), show=False)
+            template.add_pin('s', self._get_port_warrs(template, s_warrs, s_x_list), show=False)
+            template.add_pin('d', self._get_port_warrs(template, d_warrs, d_x_list), show=False)
+            template.add_pin('g', self._get_port_warrs(template, g_warrs, g_x_list), show=False)
 
     def draw_diode_connection_helper(self, template, lch_unit, num_seg, wire_pitch, od_y, md_y, s_x_list,
                                      d_x_list, ds_code, sdir, source_parity, fg, sd_pitch):
@@ -2647,10 +2835,10 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         g_warrs = self.draw_g_connection(template, lch_unit, fg, sd_pitch, 0, od_y, md_y,
                                          d_x_list, is_sub=False, is_diode=True)
 
-        g_warrs = WireArray.list_to_warr(g_warrs)
-        d_warrs = WireArray.list_to_warr(d_warrs)
-        s_warrs = WireArray.list_to_warr(s_warrs)
-        template.connect_wires([g_warrs, d_warrs])
+        g_warrs = self._get_port_warrs(template, g_warrs, d_x_list)
+        d_warrs = self._get_port_warrs(template, d_warrs, d_x_list)
+        s_warrs = self._get_port_warrs(template, s_warrs, s_x_list)
+        template.connect_wires(g_warrs + d_warrs)
         template.add_pin('g', g_warrs, show=False)
         template.add_pin('d', d_warrs, show=False)
         template.add_pin('s', s_warrs, show=False)
@@ -2694,7 +2882,8 @@ class MOSTechFinfetBase(MOSTech, metaclass=abc.ABCMeta):
         dum_warrs = self.draw_dum_connection_helper(template, lch_unit, fg, sd_pitch, 0,
                                                     od_y, md_y, ds_x_list, gate_tracks,
                                                     left_edge, right_edge, options)
-        template.add_pin('dummy', dum_warrs, show=False)
+        template.add_pin('dummy', self._get_port_warrs(template, dum_warrs, gate_tracks),
+                         show=False)
 
     def draw_decap_connection(self, template, mos_info, sdir, ddir, gate_ext_mode, export_gate,
                               options):
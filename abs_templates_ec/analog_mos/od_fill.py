@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines the dummy OD fill solver used by finfet extension rows."""
+
+from typing import Dict, Tuple, List, Optional, Any
+
+# back pointer of a fill state: (previous state, previous value, element length)
+_BackPtr = Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]], int]
+
+
+def solve_od_fill(num_fin,  # type: int
+                  area_targ,  # type: int
+                  fin_p,  # type: int
+                  od_h_delta,  # type: int
+                  nfin_min,  # type: int
+                  nfin_max,  # type: int
+                  sp_min,  # type: int
+                  sp_max,  # type: int
+                  fill_on_edge,  # type: bool
+                  ):
+    # type: (...) -> Tuple[Tuple[int, int], ...]
+    """Returns the symmetric dummy OD fill with the smallest OD area that meets the area target.
+
+    Dummy ODs are placed on a row of num_fin fins.  Each OD has between nfin_min and nfin_max
+    fins, and the number of empty fins between adjacent ODs is between sp_min and sp_max.  If
+    fill_on_edge is True, the first and last fins must be filled.  Otherwise, the fins outside
+    the row belong to existing ODs, so the number of empty fins on each edge is also between
+    sp_min and sp_max.  The area of an OD with n fins is n * fin_p + od_h_delta.
+
+    The fill is mirror symmetric, so it is built from the left edge to the center with a
+    dynamic program over fin position, recording every reachable (number of fins, number of
+    ODs) pair.  The element in the center is either an OD or a space.
+
+    Parameters
+    ----------
+    num_fin : int
+        number of fins in the fill area.
+    area_targ : int
+        the minimum total OD area.
+    fin_p : int
+        the fin pitch, in resolution units.
+    od_h_delta : int
+        OD height minus the fin pitch times the number of fins, in resolution units.
+    nfin_min : int
+        minimum number of fins per OD.
+    nfin_max : int
+        maximum number of fins per OD.
+    sp_min : int
+        minimum number of empty fins between ODs.
+    sp_max : int
+        maximum number of empty fins between ODs.
+    fill_on_edge : bool
+        True if the first and last fins must be filled.
+
+    Returns
+    -------
+    od_fin_list : Tuple[Tuple[int, int], ...]
+        the OD fin intervals, from bottom to top.  If no fill meets the area target, the fill
+        with the largest OD area is returned.
+    """
+    len_ranges = (range(sp_min, sp_max + 1), range(nfin_min, nfin_max + 1))
+
+    # state is (fin position, type of last element); type is 1 for OD and 0 for space.
+    # fins before the first element behave like an OD if not filling on edge.
+    start = (0, 0 if fill_on_edge else 1)
+    table = {start: {(0, 0): (None, None, 0)}}  # type: Dict[Tuple[int, int], Dict[Any, _BackPtr]]
+    best = None
+    best_info = None
+    for pos in range(0, num_fin // 2 + 1):
+        # process states ending with an OD first, since a space may have zero fins.
+        for last_type in (1, 0):
+            state = (pos, last_type)
+            val_table = table.get(state, None)
+            if val_table is None:
+                continue
+            next_type = 1 - last_type
+            cur_range = len_ranges[next_type]
+            # try to finish with the center element
+            center_len = num_fin - 2 * pos
+            if center_len in cur_range:
+                for nfin, nod in val_table:
+                    tot_fin = 2 * nfin + center_len * next_type
+                    tot_od = 2 * nod + next_type
+                    cur_area = tot_fin * fin_p + tot_od * od_h_delta
+                    # prefer meeting target, then smallest area, then fewest ODs.
+                    if cur_area >= area_targ:
+                        cost = (0, cur_area, tot_od)
+                    else:
+                        cost = (1, -cur_area, tot_od)
+                    if best is None or cost < best:
+                        best = cost
+                        best_info = (state, (nfin, nod), center_len, next_type)
+            # add an element
+            for cur_len in cur_range:
+                next_pos = pos + cur_len
+                if 2 * next_pos > num_fin:
+                    break
+                next_state = (next_pos, next_type)
+                next_table = table.get(next_state, None)
+                if next_table is None:
+                    table[next_state] = next_table = {}
+                for nfin, nod in val_table:
+                    next_val = (nfin + cur_len * next_type, nod + next_type)
+                    if next_val not in next_table:
+                        next_table[next_val] = (state, (nfin, nod), cur_len)
+
+    if best_info is None:
+        raise ValueError('Cannot fill %d fins with dummy ODs.' % num_fin)
+
+    # trace back the left half
+    state, val, center_len, center_type = best_info
+    half_list = []  # type: List[Tuple[int, int]]
+    while state != start or val != (0, 0):
+        prev_state, prev_val, cur_len = table[state][val]
+        half_list.append((state[1], cur_len))
+        state, val = prev_state, prev_val
+    half_list.reverse()
+
+    # convert to OD fin intervals
+    od_fin_list = []
+    pos = 0
+    for elem_type, elem_len in half_list + [(center_type, center_len)] + half_list[::-1]:
+        if elem_type == 1:
+            od_fin_list.append((pos, pos + elem_len))
+        pos += elem_len
+    return tuple(od_fin_list)
@@ -12,7 +12,8 @@ from bag.layout.routing import WireArray, TrackID
 from bag.layout.template import TemplateBase
 from bag.layout.routing.fill import fill_symmetric_min_density_info, fill_symmetric_interval, fill_symmetric_max_density
 
-from .core import MOSTech
+from ..layout_info import LayoutInfo, BoundedCache, record_type, typed_key
+from .core import MOSTech, mos_info_cache
 
 if TYPE_CHECKING:
     from bag.layout.tech import TechInfoConfig
@@ -28,25 +29,38 @@ AdjRowInfo = namedtuple('AdjRowInfo', [
     'od_type',
     'po_y',
 ])
-EdgeInfo = namedtuple('EdgeInfo', [
+EdgeInfo = record_type('EdgeInfo', [
     'od_type',
     'draw_layers',
     'y_intv',
-])
+], dict_fields=('draw_layers', 'y_intv'))
 
 
 class ExtInfo(
-        namedtuple('ExtInfoBase', [
+        record_type('ExtInfoBase', [
             'margins', 'od_h', 'imp_min_h', 'm1_sub_h', 'mtype', 'thres', 'po_types', 'edgel_info',
             'edger_info'
-        ])):
+        ], dict_fields=('margins',), tuple_fields=('po_types',))):
     __slots__ = ()
 
+    # reversed records of recently reversed records.
+    _reverse_cache = BoundedCache()
+
     def reverse(self):
-        return self._replace(
-            po_types=tuple(reversed(self.po_types)),
-            edgel_info=self.edger_info,
-            edger_info=self.edgel_info)
+        try:
+            key = typed_key(self)
+        except TypeError:
+            # not hashable; do not cache.
+            key = None
+        ans = None if key is None else self._reverse_cache.get(key)
+        if ans is None:
+            ans = self._replace(
+                po_types=tuple(reversed(self.po_types)),
+                edgel_info=self.edger_info,
+                edger_info=self.edgel_info)
+            if key is not None:
+                self._reverse_cache.put(key, ans)
+        return ans
 
 
 class MOSTechPlanarGeneric(MOSTech):
@@ -475,6 +489,7 @@ class MOSTechPlanarGeneric(MOSTech):
         drc_info = self.get_conn_drc_info(lch_unit, 'd')
         return max((info['min_len'] for info in drc_info.values()))
 
+    @mos_info_cache
     def get_mos_info(self, lch_unit, w, mos_type, threshold, fg, **kwargs):
         # type: (int, int, str, str, int, Any) -> Dict[str, Any]
         """Get transistor layout information
@@ -533,7 +548,7 @@ class MOSTechPlanarGeneric(MOSTech):
         )
 
         sub_type = 'ptap' if mos_type == 'nch' else 'ntap'
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type='mos',
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
@@ -720,6 +735,7 @@ class MOSTechPlanarGeneric(MOSTech):
         return fill_symmetric_interval(
             *fill_info[0][2], offset=po_area_offset, invert=fill_info[1])[0]
 
+    @mos_info_cache
     def get_ext_info(self, lch_unit, w, fg, top_ext_info, bot_ext_info, **kwargs):
         # type: (int, int, int, ExtInfo, ExtInfo, Any) -> Dict[str, Any]
         """Draw extension block.
@@ -889,7 +905,7 @@ class MOSTechPlanarGeneric(MOSTech):
         # create layout information dictionary
         between_gr = (top_row_type == 'ntap' and bot_row_type == 'ptap') or \
                      (top_row_type == 'ptap' and bot_row_type == 'ntap')
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type='ext',
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
@@ -913,6 +929,7 @@ class MOSTechPlanarGeneric(MOSTech):
             right_edge_info=None,
         )
 
+    @mos_info_cache
     def get_sub_ring_ext_info(self, sub_type, height, fg, end_ext_info, **kwargs):
         # type: (str, int, int, ExtInfo, Any) -> Dict[str, Any]
         lch = self.get_substrate_ring_lch()
@@ -944,7 +961,7 @@ class MOSTechPlanarGeneric(MOSTech):
             row_info_list.append(
                 RowInfo(od_x=(0, 0), od_y=od_y, od_type=('dum', sub_type), po_y=po_y))
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type='ext_subring',
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
@@ -968,6 +985,7 @@ class MOSTechPlanarGeneric(MOSTech):
             right_edge_info=None,
         )
 
+    @mos_info_cache
     def get_substrate_info(self, lch_unit, w, sub_type, threshold, fg, blk_pitch=1, **kwargs):
         # type: (int, float, str, str, int, int, Any) -> Dict[str, Any]
         """Get substrate layout information.
@@ -1037,7 +1055,7 @@ class MOSTechPlanarGeneric(MOSTech):
             edger_info=lr_edge_info,
         )
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type='sub',
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
@@ -1138,7 +1156,7 @@ class MOSTechPlanarGeneric(MOSTech):
             imp_params = None
             ext_info = None
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             blk_type=blk_type,
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
@@ -1166,12 +1184,14 @@ class MOSTechPlanarGeneric(MOSTech):
 
         return ans
 
+    @mos_info_cache
     def get_analog_end_info(self, lch_unit, sub_type, threshold, fg, is_end, blk_pitch, **kwargs):
         # type: (int, str, str, int, bool, int, Any) -> Dict[str, Any]
         """Just draw nothing, but compute height so edge margin is met."""
         return self._get_end_blk_info(lch_unit, sub_type, threshold, fg, is_end, blk_pitch,
                                       **kwargs)
 
+    @mos_info_cache
     def get_sub_ring_end_info(self, sub_type, threshold, fg, end_ext_info, **kwargs):
         # type: (str, str, int, ExtInfo, Any) -> Dict[str, Any]
         """Empty block, just reserve space for margin."""
@@ -1183,6 +1203,7 @@ class MOSTechPlanarGeneric(MOSTech):
         kwargs['end_ext_info'] = end_ext_info
         return self._get_end_blk_info(lch_unit, sub_type, threshold, fg, True, 1, **kwargs)
 
+    @mos_info_cache
     def get_outer_edge_info(self, guard_ring_nf, layout_info, is_end, adj_blk_info, **kwargs):
         # type: (int, Dict[str, Any], bool, Optional[Any], Any) -> Dict[str, Any]
         lch_unit = layout_info['lch_unit']
@@ -1222,6 +1243,7 @@ class MOSTechPlanarGeneric(MOSTech):
             lay_info_list=new_lay_list,
         )
 
+    @mos_info_cache
     def get_gr_sub_info(self, guard_ring_nf, layout_info, **kwargs):
         # type: (int, Dict[str, Any], Any) -> Dict[str, Any]
 
@@ -1315,6 +1337,7 @@ class MOSTechPlanarGeneric(MOSTech):
             sub_fg=(fg_od_margin, fg_od_margin + guard_ring_nf),
         )
 
+    @mos_info_cache
     def get_gr_sep_info(self, layout_info, adj_blk_info, **kwargs):
         # type: (Dict[str, Any], Any, Any) -> Dict[str, Any]
 
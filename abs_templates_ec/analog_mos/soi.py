@@ -8,6 +8,7 @@ from bag.layout.util import BBox
 from bag.layout.routing import WireArray, TrackID
 from bag.layout.template import TemplateBase
 
+from ..layout_info import LayoutInfo
 from .core import MOSTech
 
 if TYPE_CHECKING:
@@ -167,7 +168,7 @@ class MOSTechSOIGenericBC(MOSTech):
         ext_bot_info = ExtInfo(mx_margin=bot_mx_margin, imp_margins=bot_imp_margins, mtype=mos_type,
                                thres=threshold)
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
             fg=fg,
@@ -251,7 +252,7 @@ class MOSTechSOIGenericBC(MOSTech):
                     if imp_yb < imp_yt:
                         imp_info[bot_name] = (imp_yb, imp_yt)
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
             fg=fg,
@@ -297,7 +298,7 @@ class MOSTechSOIGenericBC(MOSTech):
         ext_top_info = ExtInfo(mx_margin=m1_yb, imp_margins={}, mtype=sub_type, thres=threshold)
         ext_bot_info = ExtInfo(mx_margin=m1_yb, imp_margins={}, mtype=sub_type, thres=threshold)
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
             fg=fg,
@@ -327,7 +328,7 @@ class MOSTechSOIGenericBC(MOSTech):
         sd_pitch = mos_constants['sd_pitch']
 
         # analog_end is empty
-        layout_info = dict(
+        layout_info = LayoutInfo(
             lch_unit=lch_unit,
             sd_pitch=sd_pitch,
             fg=fg,
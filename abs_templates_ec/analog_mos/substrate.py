@@ -1,11 +1,19 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, Any, Set
+from typing import TYPE_CHECKING, Dict, Any, Set
+
+import weakref
 
 from bag import float_to_si_string
 from bag.math import lcm
 from bag.layout.template import TemplateBase, TemplateDB
 
+from ..layout_info import compute_layout_info_key
+from ..routing.grid_cache import get_grid_table
+
+if TYPE_CHECKING:
+    from bag.layout.routing import RoutingGrid
+
 
 class AnalogSubstrateCore(TemplateBase):
     """A primitive template of substrate contact
@@ -34,6 +42,9 @@ class AnalogSubstrateCore(TemplateBase):
     def get_layout_basename(self):
         return self.params['layout_name']
 
+    def compute_unique_key(self):
+        return compute_layout_info_key(self, name_params=('layout_name',))
+
     def draw_layout(self):
         layout_info = self.params['layout_info']
         tech_cls_name = self.params['tech_cls_name']
@@ -48,6 +59,9 @@ class AnalogSubstrateCore(TemplateBase):
 
 
 class AnalogSubstrate(TemplateBase):
+    # block pitches of each routing grid.
+    _pitch_table = weakref.WeakKeyDictionary()  # type: Dict[RoutingGrid, Dict[Any, int]]
+
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **kwargs) -> None
         TemplateBase.__init__(self, temp_db, lib_name, params, used_names, **kwargs)
@@ -102,6 +116,12 @@ class AnalogSubstrate(TemplateBase):
     def get_block_pitch(cls, grid, top_layer, **kwargs):
         integ_htr = kwargs.get('integ_htr', False)
 
+        pitch_table = get_grid_table(cls._pitch_table, grid)
+        key = (top_layer, integ_htr)
+        blk_pitch = pitch_table.get(key, None)
+        if blk_pitch is not None:
+            return blk_pitch
+
         if top_layer is not None:
             blk_pitch = grid.get_block_size(top_layer, unit_mode=True)[1]
             if integ_htr:
@@ -112,6 +132,7 @@ class AnalogSubstrate(TemplateBase):
         else:
             blk_pitch = 1
 
+        pitch_table[key] = blk_pitch
         return blk_pitch
 
     def get_layout_basename(self):
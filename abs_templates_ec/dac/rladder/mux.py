@@ -9,6 +9,8 @@ from bag.layout.template import TemplateDB
 from bag.layout.digital import StdCellTemplate, StdCellBase
 from bag.layout.routing import TrackID
 
+from ...routing.bus import export_array_pins, reexport_array
+
 
 class PassgateRow(StdCellBase):
     """A row of passgates.
@@ -609,18 +611,13 @@ class RLadderMuxArray(StdCellBase):
 
         # export inputs
         nbits_tot = col_nbits + row_nbits
-        for idx in range(2 ** nbits_tot):
-            name = 'in<%d>' % idx
-            warrs = self.connect_wires(mux_inst.get_all_port_pins(name), lower=0.0)
-            self.add_pin(name, warrs, show=False)
+        in_names = ['in<%d>' % idx for idx in range(2 ** nbits_tot)]
+        export_array_pins(self, mux_inst, in_names, connect_kwargs=dict(lower=0.0), show=False)
 
         # export outputs/code
-        for idx in range(num_mux):
-            self.reexport(mux_inst.get_port('out', col=idx), net_name='out<%d>' % idx, show=False)
-            for bit_idx in range(nbits_tot):
-                old_name = 'code<%d>' % bit_idx
-                new_name = 'code<%d>' % (bit_idx + nbits_tot * idx)
-                self.reexport(mux_inst.get_port(old_name, col=idx), net_name=new_name, show=False)
+        reexport_array(self, mux_inst, ['out'], 'out<%d>', col_stride=1, show=False)
+        code_names = ['code<%d>' % bit_idx for bit_idx in range(nbits_tot)]
+        reexport_array(self, mux_inst, code_names, 'code<%d>', col_stride=nbits_tot, show=False)
 
         # connect power and do fill
         vdd_list = mux_inst.get_all_port_pins('VDD')
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines GeneratorServer, a resident layout generator process.
+
+Every generator script creates a new BagProject, RoutingGrid and TemplateDB, so each run
+reloads the technology classes and regenerates all primitive masters.  GeneratorServer keeps
+them alive across jobs: routing grids and template databases are cached by their
+specification, so primitive masters generated by one job (transistors, substrates, edges,
+resistor cores) are reused by later jobs.
+
+Generation requests have the same format as the test specification files, with the template
+class given by name::
+
+    temp_cls: abs_templates_ec.serdes.amplifier.DiffAmp
+    impl_lib: AAAFOO_diffamp
+    cell_name: diffamp
+    routing_grid:
+      layers: [4, 5, 6, 7]
+      spaces: [0.084, 0.080, 0.084, 0.080]
+      widths: [0.060, 0.100, 0.060, 0.100]
+      bot_dir: 'x'
+    params:
+      ...
+
+Start the server and submit requests from the command line with::
+
+    python -m abs_templates_ec.gen_server serve [<conn_file>]
+    python -m abs_templates_ec.gen_server submit <spec_yaml> [<conn_file>]
+
+The server listens on a local socket.  Its address and a random authentication key are
+written to the connection file, which is only readable by the current user.
+"""
+
+from typing import TYPE_CHECKING, Dict, Any, Tuple
+
+import gc
+import os
+import sys
+import time
+import importlib
+import traceback
+from multiprocessing.connection import Listener, Client
+
+import yaml
+
+from .layout_info import to_content_key
+
+if TYPE_CHECKING:
+    from bag import BagProject
+    from bag.layout.routing import RoutingGrid
+    from bag.layout.template import TemplateDB
+
+# default connection file name.
+DEFAULT_CONN_FILE = '.bag_gen_server'
+
+
+def _import_class(name):
+    # type: (str) -> type
+    """Returns the class with the given fully qualified name."""
+    module_name, _, cls_name = name.rpartition('.')
+    if not module_name:
+        raise ValueError('Template class name must include module: %s' % name)
+    module = importlib.import_module(module_name)
+    return getattr(module, cls_name)
+
+
+class GeneratorServer(object):
+    """A layout generator that keeps routing grids and template databases across jobs.
+
+    Parameters
+    ----------
+    prj : BagProject
+        the BAG project.
+    lib_defs : str
+        the template library definition file name.
+    use_cybagoa : bool
+        True to use cybagoa to create layouts.
+    """
+
+    def __init__(self, prj, lib_defs='template_libs.def', use_cybagoa=True):
+        # type: (BagProject, str, bool) -> None
+        self._prj = prj
+        self._lib_defs = lib_defs
+        self._use_cybagoa = use_cybagoa
+        self._grid_table = {}  # type: Dict[Any, RoutingGrid]
+        self._tdb_table = {}  # type: Dict[Tuple[Any, str], TemplateDB]
+        self._num_jobs = 0
+
+    @property
+    def stats(self):
+        # type: () -> Dict[str, int]
+        """Server statistics."""
+        return dict(
+            num_jobs=self._num_jobs,
+            num_grids=len(self._grid_table),
+            num_template_db=len(self._tdb_table),
+        )
+
+    def clear(self):
+        # type: () -> None
+        """Drop all cached routing grids, template databases and layout information.
+
+        Caches keyed by routing grid, template database or template master are weak, so they
+        are freed together with them.  Placement checkpoints, record caches and the layout
+        information caches of the technology classes are cleared explicitly.
+        """
+        from .analog_core.base import AnalogBase
+        from .analog_mos.core import MOSTech
+        from .layout_info import BoundedCache
+
+        self._grid_table.clear()
+        self._tdb_table.clear()
+        AnalogBase.clear_checkpoints()
+        for tech_cls in self._prj.tech_info.tech_params['layout'].values():
+            if isinstance(tech_cls, MOSTech):
+                tech_cls.clear_info_cache()
+        BoundedCache.clear_all()
+        # interned records and cached masters may form reference cycles.
+        gc.collect()
+
+    def get_grid(self, grid_specs):
+        # type: (Dict[str, Any]) -> Tuple[Any, RoutingGrid]
+        """Returns the key and the cached routing grid of the given specification."""
+        from bag.layout.routing import RoutingGrid
+
+        key = to_content_key(grid_specs)
+        grid = self._grid_table.get(key, None)
+        if grid is None:
+            grid = RoutingGrid(self._prj.tech_info, grid_specs['layers'], grid_specs['spaces'],
+                               grid_specs['widths'], grid_specs['bot_dir'],
+                               width_override=grid_specs.get('width_override', None))
+            self._grid_table[key] = grid
+        return key, grid
+
+    def get_template_db(self, grid_specs, impl_lib):
+        # type: (Dict[str, Any], str) -> TemplateDB
+        """Returns the cached template database of the given routing grid and library."""
+        from bag.layout.template import TemplateDB
+
+        grid_key, grid = self.get_grid(grid_specs)
+        key = (grid_key, impl_lib)
+        tdb = self._tdb_table.get(key, None)
+        if tdb is None:
+            tdb = TemplateDB(self._lib_defs, grid, impl_lib, use_cybagoa=self._use_cybagoa)
+            self._tdb_table[key] = tdb
+        return tdb
+
+    def generate(self, specs):
+        # type: (Dict[str, Any]) -> Dict[str, Any]
+        """Generate the layout of the given specification.
+
+        Parameters
+        ----------
+        specs : Dict[str, Any]
+            the generation specification.
+
+        Returns
+        -------
+        result : Dict[str, Any]
+            the result dictionary.
+        """
+        t0 = time.time()
+        temp_cls = _import_class(specs['temp_cls'])
+        impl_lib = specs['impl_lib']
+        cell_name = specs['cell_name']
+        params = specs['params']
+
+        tdb = self.get_template_db(specs['routing_grid'], impl_lib)
+        template = tdb.new_template(params=params, temp_cls=temp_cls)
+        t1 = time.time()
+        tdb.batch_layout(self._prj, [template], [cell_name])
+        self._num_jobs += 1
+        return dict(
+            impl_lib=impl_lib,
+            cell_name=cell_name,
+            gen_time=t1 - t0,
+            layout_time=time.time() - t1,
+        )
+
+    def handle_request(self, request):
+        # type: (Dict[str, Any]) -> Tuple[Dict[str, Any], bool]
+        """Handle the given request.
+
+        Parameters
+        ----------
+        request : Dict[str, Any]
+            the request dictionary.  The 'cmd' entry is one of 'generate', 'stats', 'clear',
+            or 'shutdown'.
+
+        Returns
+        -------
+        reply : Dict[str, Any]
+            the reply dictionary.
+        shutdown : bool
+            True if the server should shut down.
+        """
+        cmd = request.get('cmd', 'generate')
+        try:
+            if cmd == 'generate':
+                return dict(status='ok', **self.generate(request['specs'])), False
+            if cmd == 'stats':
+                return dict(status='ok', **self.stats), False
+            if cmd == 'clear':
+                self.clear()
+                return dict(status='ok'), False
+            if cmd == 'shutdown':
+                return dict(status='ok'), True
+            raise ValueError('Unknown command: %s' % cmd)
+        except Exception:
+            return dict(status='error', error=traceback.format_exc()), False
+
+    def serve(self, conn_file=DEFAULT_CONN_FILE, address=('localhost', 0)):
+        # type: (str, Any) -> None
+        """Serve requests until a shutdown request is received.
+
+        Parameters
+        ----------
+        conn_file : str
+            the file to write the server address and authentication key to.
+        address : Any
+            the listener address.  Defaults to a free port on localhost.
+        """
+        authkey = os.urandom(32)
+        with Listener(address, authkey=authkey) as listener:
+            _write_conn_file(conn_file, listener.address, authkey)
+            print('Generator server listening on %s' % (listener.address, ))
+            try:
+                shutdown = False
+                while not shutdown:
+                    try:
+                        conn = listener.accept()
+                    except Exception:
+                        # failed authentication or broken client; keep serving.
+                        continue
+                    with conn:
+                        try:
+                            request = conn.recv()
+                        except EOFError:
+                            continue
+                        reply, shutdown = self.handle_request(request)
+                        conn.send(reply)
+            finally:
+                os.remove(conn_file)
+
+
+def _write_conn_file(conn_file, address, authkey):
+    # type: (str, Any, bytes) -> None
+    content = dict(address=address, authkey=authkey.hex())
+    # remove any existing file, so the new file is always created with owner-only permissions.
+    try:
+        os.remove(conn_file)
+    except FileNotFoundError:
+        pass
+    fd = os.open(conn_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        yaml.dump(content, f)
+
+
+def submit(request, conn_file=DEFAULT_CONN_FILE):
+    # type: (Dict[str, Any], str) -> Dict[str, Any]
+    """Submit a request to a running generator server.
+
+    Parameters
+    ----------
+    request : Dict[str, Any]
+        the request dictionary.  See :meth:`GeneratorServer.handle_request`.
+    conn_file : str
+        the server connection file.
+
+    Returns
+    -------
+    reply : Dict[str, Any]
+        the reply dictionary.
+    """
+    with open(conn_file, 'r') as f:
+        info = yaml.load(f, Loader=yaml.Loader)
+    address = info['address']
+    if isinstance(address, list):
+        address = tuple(address)
+    with Client(address, authkey=bytes.fromhex(info['authkey'])) as conn:
+        conn.send(request)
+        return conn.recv()
+
+
+def run_main(argv):
+    # type: (Any) -> int
+    """Command line entry point."""
+    if len(argv) >= 1 and argv[0] == 'serve' and len(argv) <= 2:
+        from bag import BagProject
+
+        server = GeneratorServer(BagProject())
+        server.serve(*argv[1:])
+        return 0
+    if len(argv) >= 2 and argv[0] == 'submit' and len(argv) <= 3:
+        with open(argv[1], 'r') as f:
+            specs = yaml.load(f, Loader=yaml.Loader)
+        reply = submit(dict(cmd='generate', specs=specs), *argv[2:])
+        if reply['status'] != 'ok':
+            print(reply['error'])
+            return 1
+        print('%s/%s done: generation %.3g s, layout %.3g s' %
+              (reply['impl_lib'], reply['cell_name'], reply['gen_time'], reply['layout_time']))
+        return 0
+    if len(argv) >= 1 and argv[0] in ('stats', 'clear', 'shutdown') and len(argv) <= 2:
+        print(submit(dict(cmd=argv[0]), *argv[1:]))
+        return 0
+
+    print('Usage: python -m abs_templates_ec.gen_server serve [<conn_file>]\n'
+          '       python -m abs_templates_ec.gen_server submit <spec_yaml> [<conn_file>]\n'
+          '       python -m abs_templates_ec.gen_server (stats|clear|shutdown) [<conn_file>]')
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_main(sys.argv[1:]))
@@ -7,6 +7,8 @@ from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, List, Optional, Iterabl
 
 import bisect
 
+import numpy as np
+
 from bag.math import lcm
 from bag.util.interval import IntervalSet
 
@@ -18,6 +20,7 @@ from .tech import LaygoTech
 from .base import LaygoPrimitive, LaygoSubstrate, LaygoEndRow, LaygoSpace
 from ..analog_core.placement import WireGroup, WireTree
 from ..analog_core.base import AnalogBaseEdgeInfo
+from ..routing.grid_cache import RoutingGridCache
 
 if TYPE_CHECKING:
     from bag.layout.template import TemplateDB
@@ -26,25 +29,46 @@ if TYPE_CHECKING:
 
 
 class DigitalExtInfo(object):
-    """The extension information object for DigitalBase."""
+    """The extension information object for DigitalBase.
+
+    This object is immutable.  The reversed view is computed once and cached.
+    """
+
+    __slots__ = ('_ext_list', '_reverse')
 
     def __init__(self, ext_list):
-        self._ext_list = ext_list
+        self._ext_list = tuple(ext_list)
+        self._reverse = None
+
+    def __reduce__(self):
+        return DigitalExtInfo, (self._ext_list,)
 
     def reverse(self):
-        return DigitalExtInfo([ext.reverse() for ext in reversed(self._ext_list)])
+        if self._reverse is None:
+            self._reverse = DigitalExtInfo([ext.reverse() for ext in reversed(self._ext_list)])
+            self._reverse._reverse = self
+        return self._reverse
 
     def ext_iter(self):
         return self._ext_list
 
 
 class DigitalEdgeInfo(object):
-    """The edge information object for DigitalBase."""
+    """The edge information object for DigitalBase.
+
+    This object is immutable.  The reversed view is computed once and cached.
+    """
+
+    __slots__ = ('_row_y_list', '_lay_edge_list', '_ext_end_list', '_reverse')
 
     def __init__(self, row_y_list, lay_edge_list, ext_end_list):
-        self._row_y_list = row_y_list
-        self._lay_edge_list = lay_edge_list
-        self._ext_end_list = ext_end_list
+        self._row_y_list = tuple(row_y_list)
+        self._lay_edge_list = tuple(lay_edge_list)
+        self._ext_end_list = tuple(ext_end_list)
+        self._reverse = None
+
+    def __reduce__(self):
+        return DigitalEdgeInfo, (self._row_y_list, self._lay_edge_list, self._ext_end_list)
 
     def master_infos_iter(self, row_edge_infos):
         for val in self._ext_end_list:
@@ -64,8 +88,11 @@ class DigitalEdgeInfo(object):
         return test[1]
 
     def reverse(self):
-        return DigitalEdgeInfo(self._row_y_list, self._lay_edge_list[::-1],
-                               self._ext_end_list[::-1])
+        if self._reverse is None:
+            self._reverse = DigitalEdgeInfo(self._row_y_list, self._lay_edge_list[::-1],
+                                            self._ext_end_list[::-1])
+            self._reverse._reverse = self
+        return self._reverse
 
 
 class LaygoIntvSet(object):
@@ -269,6 +296,7 @@ class LaygoBaseInfo(object):
         self.end_mode = end_mode
         self._col_width = self._tech_cls.get_sd_pitch(self._lch_unit)
         self.draw_boundaries = draw_boundaries
+        self._tr_info_cache = {}  # type: Dict[int, Tuple[int, int]]
 
         # set number of columns
         self._num_col = None
@@ -360,6 +388,10 @@ class LaygoBaseInfo(object):
     def core_col(self):
         return self._core_col
 
+    @property
+    def space_tile_size(self):
+        return self._config.get('space_tile_size', 0)
+
     def get_placement_info(self, num_col):
         left_end = (self.end_mode & 4) != 0
         right_end = (self.end_mode & 8) != 0
@@ -391,6 +423,103 @@ class LaygoBaseInfo(object):
     def __getitem__(self, item):
         return self._config[item]
 
+    def _get_track_info(self, layer_id):
+        # type: (int) -> Tuple[int, int]
+        """Returns the coordinate of track 0 and the track pitch of the given vertical layer.
+
+        Both values are in resolution units, and are cached.
+        """
+        ans = self._tr_info_cache.get(layer_id, None)
+        if ans is None:
+            if self.grid.get_direction(layer_id) == 'x':
+                raise ValueError('Layer %d is not a vertical routing layer.' % layer_id)
+            ans = (self.grid.track_to_coord(layer_id, 0, unit_mode=True),
+                   self.grid.get_track_pitch(layer_id, unit_mode=True))
+            self._tr_info_cache[layer_id] = ans
+        return ans
+
+    def _get_col_offset(self):
+        # type: () -> int
+        if self._edge_margins is None:
+            raise ValueError('Edge margins is not defined.  Did you set number of columns?')
+        return self._edge_margins[0] + self._edge_widths[0]
+
+    @classmethod
+    def _round_to_int(cls, val, step, mode):
+        # type: (np.ndarray, int, int) -> np.ndarray
+        """Divide val by step and round to integers, with coord_to_nearest_col() modes."""
+        if mode == 0:
+            return np.rint(val / step).astype(int)
+        elif mode > 0:
+            if mode == 2:
+                val = val + (val % step == 0)
+            return -(-val // step)
+        else:
+            if mode == -2:
+                val = val - (val % step == 0)
+            return val // step
+
+    def col_to_coord_array(self, col_idx, unit_mode=False):
+        # type: (Any, bool) -> np.ndarray
+        """Vectorized version of col_to_coord()."""
+        ans = self._get_col_offset() + np.asarray(col_idx) * self._col_width
+        if unit_mode:
+            return ans
+        return ans * self.grid.resolution
+
+    def col_to_track_array(self, layer_id, col_idx):
+        # type: (int, Any) -> np.ndarray
+        """Vectorized version of col_to_track()."""
+        tr0, pitch = self._get_track_info(layer_id)
+        dx2 = 2 * (self.col_to_coord_array(col_idx, unit_mode=True) - tr0)
+        if np.any(dx2 % pitch != 0):
+            raise ValueError('Some columns are not on the half-track grid.')
+        return (dx2 // pitch) / 2
+
+    def col_to_nearest_rel_track_array(self, layer_id, col_idx, half_track=False, mode=0):
+        # type: (int, Any, bool, int) -> np.ndarray
+        """Vectorized version of col_to_nearest_rel_track().
+
+        If half_track is True, the returned track indices are always floating point numbers.
+        """
+        pitch = self._get_track_info(layer_id)[1]
+        offset = pitch // 2
+        if half_track:
+            pitch //= 2
+
+        q, r = np.divmod(np.asarray(col_idx) * self._col_width - offset, pitch)
+        on_track = r == 0
+        if mode == -2:
+            # move to lower track
+            q = q - on_track
+        elif mode == 2:
+            # move to upper track
+            q = q + on_track
+        if mode > 0:
+            q = q + ~on_track
+        elif mode == 0:
+            q = q + (~on_track & (r >= pitch / 2))
+
+        if half_track:
+            return q / 2
+        return q
+
+    def coord_to_nearest_col_array(self, coord, mode=0, unit_mode=False):
+        # type: (Any, int, bool) -> np.ndarray
+        """Vectorized version of coord_to_nearest_col()."""
+        coord = np.asarray(coord)
+        if not unit_mode:
+            coord = np.rint(coord / self.grid.resolution).astype(int)
+
+        return self._round_to_int(coord - self._get_col_offset(), self._col_width, mode)
+
+    def rel_track_to_nearest_col_array(self, layer_id, rel_tid, mode=0):
+        # type: (int, Any, int) -> np.ndarray
+        """Vectorized version of rel_track_to_nearest_col()."""
+        pitch = self._get_track_info(layer_id)[1]
+        x_rel = pitch // 2 + np.rint(np.asarray(rel_tid) * pitch).astype(int)
+        return self._round_to_int(x_rel, self._col_width, mode)
+
     def col_to_coord(self, col_idx, unit_mode=False):
         if self._edge_margins is None:
             raise ValueError('Edge margins is not defined.  Did you set number of columns?')
@@ -535,6 +664,15 @@ class LaygoBase(TemplateBase, metaclass=abc.ABCMeta):
         self._top_sub_extw = 0
         self._laygo_edgel = None
         self._laygo_edger = None
+        self._grid_cache = None  # type: Optional[RoutingGridCache]
+
+    @property
+    def grid_cache(self):
+        # type: () -> RoutingGridCache
+        """A memoizing view of the routing grid.  Rebuilt whenever the grid is replaced."""
+        if self._grid_cache is None or self._grid_cache.grid is not self.grid:
+            self._grid_cache = RoutingGridCache(self.grid)
+        return self._grid_cache
 
     @property
     def num_rows(self):
@@ -960,7 +1098,8 @@ class LaygoBase(TemplateBase, metaclass=abc.ABCMeta):
                     bot_ntr = 0
 
             if bot_ntr >= 1:
-                y_ttr = self.grid.track_to_coord(hm_layer, tr_next + bot_ntr - 1, unit_mode=True)
+                y_ttr = self.grid_cache.track_to_coord(hm_layer, tr_next + bot_ntr - 1,
+                                                       unit_mode=True)
                 ycur = max(ycur, y_ttr - yt + conn_delta)
 
         if not tr_last_info:
@@ -1025,7 +1164,7 @@ class LaygoBase(TemplateBase, metaclass=abc.ABCMeta):
                     wire_tree, min_htot):
         lch_unit = self._laygo_info.lch_unit
 
-        grid = self.grid
+        grid = self.grid_cache
         tech_cls = self._tech_cls
         mos_pitch = tech_cls.get_mos_pitch(unit_mode=True)
         vm_layer = tech_cls.get_dig_conn_layer()
@@ -1594,18 +1733,52 @@ class LaygoBase(TemplateBase, metaclass=abc.ABCMeta):
         return self.add_instance(master, inst_name=inst_name, loc=(x0, y0), orient=orient,
                                  nx=nx, spx=spx * col_width, unit_mode=True)
 
-    def fill_space(self):
+    def fill_space(self, tile_size=None):
+        """Fill all empty columns with space blocks and draw extension rows and boundaries.
+
+        Parameters
+        ----------
+        tile_size : Optional[int]
+            if positive, empty intervals that are wide enough are filled with an array of
+            space blocks with this many columns, plus two end blocks adapted to the neighboring
+            blocks.  This limits the number of unique space masters in sparse rows.  0 to use a
+            single space block per empty interval.  Defaults to the 'space_tile_size' entry of
+            the laygo configuration dictionary, or 0 if not present.
+
+        Returns
+        -------
+        vdd_warrs : List[WireArray]
+            guard ring supply wires in boundary cells.
+        vss_warrs : List[WireArray]
+            guard ring ground wires in boundary cells.
+        """
         if self._laygo_size is None:
             raise ValueError('laygo_size must be set before filling spaces.')
 
+        if tile_size is None:
+            tile_size = self._laygo_info.space_tile_size
+
         num_cols = self._laygo_size[0]
         # add space blocks
         total_intv = (0, num_cols)
         endl_iter = self._laygo_edgel.row_end_iter()
         endr_iter = self._laygo_edger.row_end_iter()
         for row_idx, (intv, endl, endr) in enumerate(zip(self._used_list, endl_iter, endr_iter)):
+            space_end = None
             for (start, end), end_info in zip(*intv.get_complement(total_intv, endl, endr)):
-                self._add_laygo_space(end_info, num_blk=end - start, loc=(start, row_idx))
+                tile_info = self._get_space_tiles(end - start, tile_size)
+                if tile_info is None:
+                    self._add_laygo_space(end_info, num_blk=end - start, loc=(start, row_idx))
+                else:
+                    if space_end is None:
+                        space_end = self._get_space_end_info(row_idx, end_info)
+                    numl, num_tile, numr = tile_info
+                    self._add_laygo_space((end_info[0], space_end), num_blk=numl,
+                                          loc=(start, row_idx))
+                    self._add_laygo_space((space_end, space_end), num_blk=tile_size,
+                                          loc=(start + numl, row_idx), nx=num_tile)
+                    self._add_laygo_space((space_end, end_info[1]), num_blk=numr,
+                                          loc=(end - numr, row_idx))
 
         # draw extensions
         ext_endl_infos, ext_endr_infos = [], []
@@ -1640,7 +1813,51 @@ class LaygoBase(TemplateBase, metaclass=abc.ABCMeta):
         intv = self._used_list[row_idx]
         return [ext_info[ext_idx] for ext_info in intv.values()]
 
-    def _add_laygo_space(self, adj_end_info, num_blk=1, loc=(0, 0), **kwargs):
+    @classmethod
+    def _get_space_tiles(cls, num_blk, tile_size):
+        # type: (int, int) -> Optional[Tuple[int, int, int]]
+        """Decompose an empty interval into left end, arrayed tiles, and right end.
+
+        Parameters
+        ----------
+        num_blk : int
+            number of columns in the empty interval.
+        tile_size : int
+            number of columns in a space tile.
+
+        Returns
+        -------
+        tile_info : Optional[Tuple[int, int, int]]
+            a (num_left, num_tile, num_right) tuple, where num_left/num_right are the number of
+            columns in the left/right end blocks, and num_tile is the number of tiles.  None if
+            the interval is too narrow to be tiled.
+        """
+        if tile_size <= 0:
+            return None
+
+        # end blocks are at least half a tile wide, so the end block widths
+        # can only take tile_size different values.
+        end_min = max(1, tile_size // 2)
+        num_tile = (num_blk - 2 * end_min) // tile_size
+        if num_tile < 1:
+            return None
+
+        num_rem = num_blk - num_tile * tile_size
+        numl = num_rem // 2
+        return numl, num_tile, num_rem - numl
+
+    def _get_space_end_info(self, row_idx, adj_end_info):
+        """Returns the edge layout information tuple of a space block on the given row.
+
+        Space block edge information only depends on the row, so this is used as the
+        left/right block information of space blocks abutting other space blocks.
+        """
+        row_info = self._row_info_list[row_idx]
+        blk_info = self._tech_cls.get_laygo_space_info(row_info, 1, adj_end_info[0][0],
+                                                       adj_end_info[1][0])
+        return blk_info['right_edge_info'], None
+
+    def _add_laygo_space(self, adj_end_info, num_blk=1, loc=(0, 0), nx=1, **kwargs):
         col_idx, row_idx = loc
         row_info = self._row_info_list[row_idx]
         rprop = self._row_prop_list[row_idx]
@@ -1669,15 +1886,17 @@ class LaygoBase(TemplateBase, metaclass=abc.ABCMeta):
         ext_info = endb, endt
         endl_info = (endl, lay_info)
         endr_info = (endr, lay_info)
-        inst_intv = (col_idx, col_idx + num_blk)
-        if not intv.add(inst_intv, ext_info, endl_info, endr_info):
-            raise ValueError('Cannot add space on row %d, '
-                             'column [%d, %d)' % (row_idx, inst_intv[0], inst_intv[1]))
+        for inst_num in range(nx):
+            intv_offset = col_idx + num_blk * inst_num
+            inst_intv = (intv_offset, intv_offset + num_blk)
+            if not intv.add(inst_intv, ext_info, endl_info, endr_info):
+                raise ValueError('Cannot add space on row %d, '
+                                 'column [%d, %d)' % (row_idx, inst_intv[0], inst_intv[1]))
 
         x0 = self._laygo_info.col_to_coord(col_idx, unit_mode=True)
         y0 = row_y[1] if row_orient == 'R0' else row_y[2]
         self.add_instance(master, inst_name=inst_name, loc=(x0, y0), orient=row_orient,
-                          unit_mode=True)
+                          nx=nx, spx=num_blk * self._laygo_info.col_width, unit_mode=True)
 
     def _draw_boundary_cells(self):
         if self._laygo_info.draw_boundaries:
@@ -8,8 +8,9 @@ from collections import namedtuple
 from bag import float_to_si_string
 # from bag.layout.routing.fill import fill_symmetric_max_density
 
-from .tech import LaygoTech
+from .tech import LaygoTech, laygo_info_cache
 from ..analog_mos.planar import ExtInfo, RowInfo, EdgeInfo, MOSTechPlanarGeneric
+from ..layout_info import LayoutInfo
 
 if TYPE_CHECKING:
     from bag.layout.tech import TechInfoConfig
@@ -189,6 +190,7 @@ class LaygoTechPlanarBase(MOSTechPlanarGeneric, LaygoTech, metaclass=abc.ABCMeta
         # type: () -> Any
         return EdgeInfo(od_type=None, draw_layers={}, y_intv={}), []
 
+    @laygo_info_cache
     def get_laygo_mos_row_info(self,  # type: LaygoTechPlanarBase
                                lch_unit,  # type: int
                                w_max,  # type: int
@@ -279,10 +281,12 @@ class LaygoTechPlanarBase(MOSTechPlanarGeneric, LaygoTech, metaclass=abc.ABCMeta
             row_name_id=row_name_id,
         )
 
+    @laygo_info_cache
     def get_laygo_sub_row_info(self, lch_unit, w, mos_type, threshold, **kwargs):
         # type: (int, int, str, str, **Any) -> Dict[str, Any]
         return self.get_laygo_mos_row_info(lch_unit, w, w, mos_type, threshold, '', '', **kwargs)
 
+    @laygo_info_cache
     def get_laygo_blk_info(self, blk_type, w, row_info, **kwargs):
         # type: (str, int, Dict[str, Any], **Any) -> Dict[str, Any]
 
@@ -376,7 +380,7 @@ class LaygoTechPlanarBase(MOSTechPlanarGeneric, LaygoTech, metaclass=abc.ABCMeta
         ext_bot_info = row_ext_bot._replace(mtype=mtype, po_types=po_types,
                                             edgel_info=edgel_info, edger_info=edger_info)
 
-        layout_info = dict(
+        layout_info = LayoutInfo(
             is_sub_row=is_sub,
             blk_type='sub' if is_sub else 'mos',
             lch_unit=lch_unit,
@@ -412,6 +416,7 @@ class LaygoTechPlanarBase(MOSTechPlanarGeneric, LaygoTech, metaclass=abc.ABCMeta
         return self.get_analog_end_info(lch_unit, mos_type, threshold, fg, is_end,
                                         blk_pitch, **kwargs)
 
+    @laygo_info_cache
     def get_laygo_space_info(self, row_info, num_blk, left_blk_info, right_blk_info):
         # type: (Dict[str, Any], int, Any, Any) -> Dict[str, Any]
 
@@ -507,7 +512,7 @@ class LaygoTechPlanarBase(MOSTechPlanarGeneric, LaygoTech, metaclass=abc.ABCMeta
                                             edger_info=cur_edge_info)
 
         lr_edge_info = (cur_edge_info, [])
-        layout_info = dict(
+        layout_info = LayoutInfo(
             is_sub_row=is_sub,
             blk_type='sub' if is_sub else 'mos',
             lch_unit=lch_unit,
@@ -533,6 +538,7 @@ class LaygoTechPlanarBase(MOSTechPlanarGeneric, LaygoTech, metaclass=abc.ABCMeta
             right_edge_info=lr_edge_info,
         )
 
+    @laygo_info_cache
     def get_row_extension_info(self,  # type: LaygoTechPlanarBase
                                bot_ext_list,  # type: List[Union[int, ExtInfo]]
                                top_ext_list,  # type: List[Union[int, ExtInfo]]
@@ -11,7 +11,7 @@ from bag.layout.routing import WireArray
 
 import abc
 
-from ..analog_mos.core import MOSTech
+from ..analog_mos.core import MOSTech, mos_info_cache
 from ..analog_mos.mos import AnalogMOSExt
 from ..analog_mos.edge import AnalogEdge
 
@@ -21,6 +21,10 @@ if TYPE_CHECKING:
     from .core import LaygoBaseInfo
 
 
+# kept for backward compatibility; the layout information cache is implemented by MOSTech.
+laygo_info_cache = mos_info_cache
+
+
 class LaygoTech(MOSTech, metaclass=abc.ABCMeta):
     """An abstract class for drawing transistor related layout for custom digital circuits.
 
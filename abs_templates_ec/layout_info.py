@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines LayoutInfo, a layout information dictionary with a cached content key.
+
+Primitive templates such as edges, substrate blocks and resistor cores take whole layout
+information dictionaries as parameters.  Computing the unique key of these templates by
+walking the dictionaries on every new_template() call is expensive, so the technology classes
+return LayoutInfo objects instead, and the templates compute their unique keys with
+:func:`compute_layout_info_key`.
+
+This module also defines :func:`record_type`, which creates compact, immutable and interned
+record types used for edge and extension information objects.
+"""
+
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence, Mapping, Optional, Dict
+
+import sys
+import weakref
+import hashlib
+from collections import namedtuple, OrderedDict
+from collections.abc import Mapping as MappingABC
+
+from bag.util.cache import DesignMaster
+
+if TYPE_CHECKING:
+    from bag.layout.template import TemplateBase
+
+
+def _to_canonical(val):
+    # type: (Any) -> Any
+    """Convert the given value to a canonical immutable value with a stable repr."""
+    if val is None or isinstance(val, (bool, int, float, str)):
+        return val
+    if isinstance(val, LayoutInfo):
+        return 'layout_info', val.content_key
+    if isinstance(val, (dict, ImmutableDict)):
+        return tuple((key, _to_canonical(val[key])) for key in sorted(val.keys()))
+    if isinstance(val, (list, tuple)):
+        items = tuple(_to_canonical(item) for item in val)
+        if hasattr(val, '_fields'):
+            # namedtuple; include type name so different records do not collide
+            return type(val).__name__, items
+        return items
+    if isinstance(val, (set, frozenset)):
+        return 'set', tuple(sorted((_to_canonical(item) for item in val), key=repr))
+    if hasattr(val, 'get_immutable_key'):
+        return _to_canonical(val.get_immutable_key())
+    return DesignMaster.to_immutable_id(val)
+
+
+def to_content_key(val):
+    # type: (Any) -> Any
+    """Convert the given layout information to a hashable key made of built-in types.
+
+    Unlike :meth:`DesignMaster.to_immutable_id`, LayoutInfo objects are represented by
+    their cached content hashes, and sets are converted to sorted tuples.
+
+    Parameters
+    ----------
+    val : Any
+        the layout information object.
+
+    Returns
+    -------
+    key : Any
+        the hashable key.
+    """
+    return _to_canonical(val)
+
+
+class ImmutableDict(MappingABC):
+    """A read-only, hashable dictionary with cached hash value.
+
+    Parameters
+    ----------
+    table : Mapping[Any, Any]
+        the dictionary content.  Values must be hashable.
+    """
+
+    __slots__ = ('_table', '_hash')
+
+    def __init__(self, table=None):
+        # type: (Mapping[Any, Any]) -> None
+        self._table = {} if table is None else dict(table)
+        self._hash = None
+
+    @classmethod
+    def freeze(cls, table):
+        # type: (Any) -> Any
+        """Returns an ImmutableDict with the given content, or table itself if it is not a dict."""
+        if isinstance(table, dict):
+            return cls(table)
+        return table
+
+    def __getitem__(self, key):
+        return self._table[key]
+
+    def __iter__(self):
+        # type: () -> Iterator[Any]
+        return iter(self._table)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._table)
+
+    def __contains__(self, key):
+        return key in self._table
+
+    def __eq__(self, other):
+        if isinstance(other, ImmutableDict):
+            return self._table == other._table
+        return self._table == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self._table.items()))
+        return self._hash
+
+    def __repr__(self):
+        return 'ImmutableDict(%r)' % self._table
+
+    def __reduce__(self):
+        return ImmutableDict, (self._table,)
+
+    def get_immutable_key(self):
+        return tuple((key, self._table[key]) for key in sorted(self._table.keys()))
+
+
+def typed_key(val):
+    # type: (Any) -> Any
+    """Returns a hashable key of the given record value that also encodes value types.
+
+    Equal values of different types, such as 1, 1.0 and True, have different typed keys.
+    Raises TypeError if the value is not hashable.
+    """
+    if isinstance(val, tuple):
+        return type(val), tuple(typed_key(v) for v in val)
+    if isinstance(val, ImmutableDict):
+        return ImmutableDict, frozenset((k, typed_key(v)) for k, v in val.items())
+    hash(val)
+    return type(val), val
+
+
+class BoundedCache(object):
+    """A least-recently-used cache with a maximum number of entries.
+
+    Used for caches of record values, as records are tuples and cannot be weakly referenced.
+
+    Parameters
+    ----------
+    max_size : int
+        the maximum number of entries.
+    """
+
+    # all caches, so they can be cleared together.
+    _all_caches = weakref.WeakSet()
+
+    def __init__(self, max_size=4096):
+        # type: (int) -> None
+        self._max_size = max_size
+        self._table = OrderedDict()  # type: OrderedDict
+        BoundedCache._all_caches.add(self)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._table)
+
+    def get(self, key):
+        # type: (Any) -> Any
+        """Returns the value of the given key, or None if not found."""
+        val = self._table.get(key, None)
+        if val is not None:
+            self._table.move_to_end(key)
+        return val
+
+    def put(self, key, val):
+        # type: (Any, Any) -> None
+        """Adds the given entry, evicting the least recently used entry if necessary."""
+        self._table[key] = val
+        self._table.move_to_end(key)
+        if len(self._table) > self._max_size:
+            self._table.popitem(last=False)
+
+    def clear(self):
+        # type: () -> None
+        """Removes all entries."""
+        self._table.clear()
+
+    @classmethod
+    def clear_all(cls):
+        # type: () -> None
+        """Removes all entries of all caches."""
+        for cache in cls._all_caches:
+            cache.clear()
+
+
+def record_type(typename, field_names, dict_fields=(), tuple_fields=(), module=None):
+    # type: (str, Sequence[str], Sequence[str], Sequence[str], Optional[str]) -> type
+    """Create a compact, immutable and interned record type.
+
+    The returned class is a namedtuple subclass with no instance dictionary.  Dictionary
+    fields are converted to ImmutableDict and list fields to tuples on construction
+    (including _replace()), so records are hashable and can be used as cache keys.  Recently
+    created records are interned in a bounded table keyed by their typed values, so repeated
+    records share memory, and records that differ only in value types are kept distinct.
+
+    Parameters
+    ----------
+    typename : str
+        the record type name.
+    field_names : Sequence[str]
+        the record field names.
+    dict_fields : Sequence[str]
+        fields that should be converted to ImmutableDict.
+    tuple_fields : Sequence[str]
+        fields that should be converted to tuples.
+    module : Optional[str]
+        the module name of the record class.  Defaults to the caller's module, so the
+        records can be pickled.
+
+    Returns
+    -------
+    record_cls : type
+        the record class.
+    """
+    base_cls = namedtuple(typename, field_names)
+    dict_idx = [base_cls._fields.index(name) for name in dict_fields]
+    tuple_idx = [base_cls._fields.index(name) for name in tuple_fields]
+
+    def __new__(cls, *args, **kwargs):
+        values = list(base_cls.__new__(cls, *args, **kwargs))
+        for idx in dict_idx:
+            values[idx] = ImmutableDict.freeze(values[idx])
+        for idx in tuple_idx:
+            if isinstance(values[idx], list):
+                values[idx] = tuple(values[idx])
+        try:
+            key = typed_key(tuple(values))
+        except TypeError:
+            # some field is not hashable; do not intern.
+            return tuple.__new__(cls, values)
+        ans = cls._intern_table.get(key)
+        if ans is None:
+            ans = tuple.__new__(cls, values)
+            cls._intern_table.put(key, ans)
+        return ans
+
+    @classmethod
+    def _make(cls, iterable):
+        return cls(*iterable)
+
+    def __reduce__(self):
+        # intern records on unpickling.
+        return type(self), tuple(self)
+
+    if module is None:
+        module = sys._getframe(1).f_globals.get('__name__', '__main__')
+    base_cls.__module__ = module
+
+    return type(typename, (base_cls,), dict(
+        __module__=module,
+        __slots__=(),
+        __new__=__new__,
+        _make=_make,
+        __reduce__=__reduce__,
+        _intern_table=BoundedCache(),
+    ))
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError('Frozen layout information cannot be modified.')
+
+
+class FrozenList(list):
+    """A read-only list, used for list values of frozen layout information."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return FrozenList, (list(self), )
+
+
+class FrozenDict(dict):
+    """A read-only dictionary, used for dictionary values of frozen layout information."""
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self), )
+
+
+def freeze_value(val):
+    # type: (Any) -> Any
+    """Returns a read-only copy of the given layout information value.
+
+    LayoutInfo objects are frozen, dictionaries and lists are converted to FrozenDict and
+    FrozenList, sets to frozensets, and tuples are frozen element by element.  Other values
+    are returned as is.
+    """
+    if isinstance(val, LayoutInfo):
+        return val.freeze()
+    if isinstance(val, (FrozenDict, FrozenList, ImmutableDict, frozenset)):
+        return val
+    if isinstance(val, dict):
+        return FrozenDict(((key, freeze_value(item)) for key, item in val.items()))
+    if isinstance(val, list):
+        return FrozenList((freeze_value(item) for item in val))
+    if isinstance(val, set):
+        return frozenset((freeze_value(item) for item in val))
+    if isinstance(val, tuple):
+        items = [freeze_value(item) for item in val]
+        if hasattr(val, '_fields'):
+            return type(val)._make(items)
+        return tuple(items)
+    return val
+
+
+def freeze_layout_infos(val):
+    # type: (Any) -> Any
+    """Freeze the given value if it is a LayoutInfo, or the LayoutInfo values it contains.
+
+    Used on the results of cached technology methods, which are dictionaries or lists of
+    layout information.  Returns the given value.
+    """
+    if isinstance(val, LayoutInfo):
+        return val.freeze()
+    if isinstance(val, dict):
+        items = val.values()
+    elif isinstance(val, (list, tuple)):
+        items = val
+    else:
+        return val
+    for item in items:
+        if isinstance(item, LayoutInfo):
+            item.freeze()
+    return val
+
+
+class LayoutInfo(dict):
+    """A layout information dictionary that caches a hash of its content.
+
+    Technology methods cache their results, and freeze the LayoutInfo objects they return
+    with :meth:`freeze`.  Freezing makes all nested values read-only and computes the content
+    key, so the key is computed once per cached object and can never become stale.  Frozen
+    LayoutInfo objects cannot be modified; :meth:`copy` returns a modifiable copy that keeps the
+    content key until the copy is modified.
+
+    The content key of a LayoutInfo that is not frozen is computed the first time it is
+    requested, and is invalidated whenever this dictionary is modified.
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._content_key = None
+        self._frozen = False
+
+    @property
+    def content_key(self):
+        # type: () -> str
+        """A stable hash string of the content of this dictionary."""
+        if self._content_key is None:
+            content = repr(_to_canonical(dict(self)))
+            self._content_key = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        return self._content_key
+
+    @property
+    def is_frozen(self):
+        # type: () -> bool
+        """True if this LayoutInfo is frozen."""
+        return self._frozen
+
+    def freeze(self):
+        # type: () -> LayoutInfo
+        """Make this LayoutInfo and all nested values read-only, and compute the content key.
+
+        Returns
+        -------
+        layout_info : LayoutInfo
+            this object.
+        """
+        if not self._frozen:
+            for key, val in self.items():
+                dict.__setitem__(self, key, freeze_value(val))
+            self._content_key = None
+            self._frozen = True
+            # compute the content key once, now that it cannot change.
+            _ = self.content_key
+        return self
+
+    def get_immutable_key(self):
+        # type: () -> str
+        return self.content_key
+
+    def copy(self):
+        # type: () -> LayoutInfo
+        ans = LayoutInfo(self)
+        ans._content_key = self._content_key
+        return ans
+
+    def __reduce__(self):
+        return _rebuild_layout_info, (dict(self), self._frozen, self._content_key)
+
+    def _check_modify(self):
+        if self._frozen:
+            raise TypeError('Frozen LayoutInfo cannot be modified; modify a copy instead.')
+        self._content_key = None
+
+    def __setitem__(self, key, value):
+        self._check_modify()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._check_modify()
+        dict.__delitem__(self, key)
+
+    def clear(self):
+        self._check_modify()
+        dict.clear(self)
+
+    def pop(self, *args):
+        self._check_modify()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._check_modify()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self._check_modify()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self._check_modify()
+        dict.update(self, *args, **kwargs)
+
+
+def _rebuild_layout_info(table, frozen, content_key):
+    # type: (Dict[Any, Any], bool, Optional[str]) -> LayoutInfo
+    ans = LayoutInfo(table)
+    ans._content_key = content_key
+    ans._frozen = frozen
+    return ans
+
+
+def compute_layout_info_key(template, info_names=('layout_info',), name_params=()):
+    # type: (TemplateBase, Iterable[str], Iterable[str]) -> Any
+    """Compute the unique key of a template that has layout information dictionary parameters.
+
+    This returns the same key as the default TemplateBase implementation, except that
+    the given layout information parameters are replaced by their content keys.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the template.
+    info_names : Iterable[str]
+        names of the layout information parameters.
+    name_params : Iterable[str]
+        names of parameters that only determine the cell name.  These parameters are
+        excluded from the key, so templates with the same layout share the same master.
+
+    Returns
+    -------
+    key : Any
+        the template unique key.
+    """
+    params = template.params.copy()
+    for name in info_names:
+        val = params.get(name, None)
+        if val is not None:
+            params[name] = get_layout_info_key(val)
+    if name_params:
+        for name in name_params:
+            params.pop(name, None)
+        basename = template.__class__.__name__
+    else:
+        basename = template.get_layout_basename()
+    return template.to_immutable_id((basename, params, template.grid.get_flip_parity()))
+
+
+def get_layout_info_key(layout_info):
+    # type: (Any) -> Any
+    """Returns a hashable key representing the content of the given layout information.
+
+    Parameters
+    ----------
+    layout_info : Any
+        the layout information dictionary.
+
+    Returns
+    -------
+    key : Any
+        the content key.  Cached if layout_info is a LayoutInfo object.
+    """
+    if isinstance(layout_info, LayoutInfo):
+        return 'layout_info', layout_info.content_key
+    return 'layout_info', hashlib.sha1(repr(_to_canonical(layout_info)).encode('utf-8')).hexdigest()
@@ -13,6 +13,8 @@ from bag.util.search import BinaryIterator
 from bag.layout.template import TemplateBase, TemplateDB
 from bag.layout.routing import RoutingGrid
 
+from ..layout_info import LayoutInfo, get_layout_info_key
+
 if TYPE_CHECKING:
     from bag.layout.tech import TechInfoConfig
 
@@ -670,7 +672,7 @@ class ResTech(object, metaclass=abc.ABCMeta):
             else:
                 num_corner_tracks.append(dim_corner / pitch)
 
-        res_info = dict(
+        res_info = LayoutInfo(
             l=l,
             w=w,
             res_type=res_type,
@@ -796,7 +798,8 @@ class AnalogResCore(TemplateBase):
 
     def compute_unique_key(self):
         flip_parity = self.grid.get_flip_parity()
-        return self.to_immutable_id((self.get_layout_basename(), self._layout_info, flip_parity))
+        info_key = get_layout_info_key(self._layout_info)
+        return self.to_immutable_id((self.get_layout_basename(), info_key, flip_parity))
 
     def draw_layout(self):
         self._tech_cls.draw_res_core(self, self._layout_info)
@@ -874,7 +877,7 @@ class AnalogResBoundary(TemplateBase):
 
     def compute_unique_key(self):
         basename = self.get_layout_basename()
-        return self.to_immutable_id((basename, self.params['layout_info']))
+        return self.to_immutable_id((basename, get_layout_info_key(self.params['layout_info'])))
 
     def draw_layout(self):
         self._tech_cls.draw_res_boundary(self, self.params['boundary_type'],
@@ -14,6 +14,7 @@ from bag.layout.routing.fill import fill_symmetric_max_density, \
     fill_symmetric_min_density_info, fill_symmetric_interval
 from bag.layout.template import TemplateBase
 
+from ..layout_info import LayoutInfo
 from .base import ResTech
 
 if TYPE_CHECKING:
@@ -227,7 +228,7 @@ class ResTechFinfetBase(ResTech, metaclass=abc.ABCMeta):
         core_bot_po_bnd = (-bnd_spy + po_res_spy, bnd_spy - po_res_spy)
 
         # fill layout info with dummy information
-        layout_info = dict(
+        layout_info = LayoutInfo(
             width=width,
             height=height,
             lr_dum_w=core_lr_dum_w,
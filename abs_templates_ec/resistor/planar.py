@@ -12,6 +12,7 @@ from bag.layout.routing import TrackID, WireArray
 from bag.layout.routing.fill import fill_symmetric_const_space, fill_symmetric_max_density
 from bag.layout.template import TemplateBase
 
+from ..layout_info import LayoutInfo
 from .base import ResTech
 
 
@@ -185,7 +186,7 @@ class ResTechPlanarGeneric(ResTech):
         top_od_yloc = [(a + height, b + height) for a, b in tb_od_yloc[:num_dummy_half]]
 
         # fill layout info with dummy information
-        layout_info = dict(
+        layout_info = LayoutInfo(
             width=width,
             height=height,
             lr_od_xloc=lr_od_xloc,
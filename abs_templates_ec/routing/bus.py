@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines methods to connect and export pins of arrayed instances in bulk."""
+
+from typing import TYPE_CHECKING, Iterable, Optional, Dict, Any, Sequence, List, Tuple
+
+import re
+
+from bag.util.interval import IntervalSet
+from bag.layout.routing import WireArray, TrackID
+
+if TYPE_CHECKING:
+    from bag.layout.objects import Instance, Port
+    from bag.layout.routing import RoutingGrid
+    from bag.layout.template import TemplateBase
+
+_bus_name_re = re.compile(r'^(.*)<(\d+)>$')
+
+
+class BusPinIndex(object):
+    """An index from bus name prefix to ports of a template master, ordered by bit index.
+
+    Use :meth:`get_index` to get the index of a master.  The index is computed once and stored
+    on the master, so it is freed together with the master.
+
+    Parameters
+    ----------
+    master : TemplateBase
+        the template master.  All ports must have been added.
+    """
+
+    def __init__(self, master):
+        # type: (TemplateBase) -> None
+        bit_tables = {}
+        for name in master.port_names_iter():
+            mobj = _bus_name_re.match(name)
+            if mobj is not None:
+                bit_tables.setdefault(mobj.group(1), {})[int(mobj.group(2))] = name
+
+        self._table = {}  # type: Dict[str, List[Optional[str]]]
+        self._port_table = {}  # type: Dict[str, List[Optional[Port]]]
+        for prefix, bit_table in bit_tables.items():
+            names = [bit_table.get(idx, None) for idx in range(max(bit_table) + 1)]
+            self._table[prefix] = names
+            self._port_table[prefix] = [None if name is None else master.get_port(name)
+                                        for name in names]
+
+    @classmethod
+    def get_index(cls, master):
+        # type: (TemplateBase) -> BusPinIndex
+        """Returns the bus pin index of the given template master.
+
+        Parameters
+        ----------
+        master : TemplateBase
+            the template master.  All ports must have been added.
+
+        Returns
+        -------
+        index : BusPinIndex
+            the bus pin index.
+        """
+        index = getattr(master, '_bus_pin_index', None)
+        if index is None:
+            index = cls(master)
+            master._bus_pin_index = index
+        return index
+
+    def _check_bits(self, prefix, num_bits):
+        # type: (str, Optional[int]) -> int
+        if prefix not in self._table:
+            raise ValueError('Bus %s not found.' % prefix)
+        names = self._table[prefix]
+        if num_bits is None:
+            num_bits = len(names)
+        elif num_bits > len(names):
+            raise ValueError('Bus %s only has %d bits.' % (prefix, len(names)))
+        if None in names[:num_bits]:
+            raise ValueError('Bus %s has missing bits.' % prefix)
+        return num_bits
+
+    def get_names(self, prefix, num_bits=None):
+        # type: (str, Optional[int]) -> List[str]
+        """Returns the port names of the given bus, ordered by bit index.
+
+        Parameters
+        ----------
+        prefix : str
+            the bus name prefix.
+        num_bits : Optional[int]
+            number of bits to return.  Defaults to all bits.
+
+        Returns
+        -------
+        names : List[str]
+            the port names.
+        """
+        num_bits = self._check_bits(prefix, num_bits)
+        return self._table[prefix][:num_bits]
+
+    def get_pins(self, grid, inst, prefix, num_bits=None):
+        # type: (RoutingGrid, Instance, str, Optional[int]) -> List[List[WireArray]]
+        """Returns pins of the given bus on all elements of an instance, indexed by bit.
+
+        The master ports are transformed to each array element directly, and the pins of each
+        bit on all elements are merged into multi-wire WireArrays.
+
+        Parameters
+        ----------
+        grid : RoutingGrid
+            the routing grid of the template containing the instance.
+        inst : Instance
+            an instance of the indexed master.
+        prefix : str
+            the bus name prefix.
+        num_bits : Optional[int]
+            number of bits to return.  Defaults to all bits.
+
+        Returns
+        -------
+        pins : List[List[WireArray]]
+            pins[idx] is the list of WireArrays of bit idx on all array elements.
+        """
+        num_bits = self._check_bits(prefix, num_bits)
+        x0, y0 = inst.location_unit
+        orient = inst.orientation
+        loc_list = [(x0 + col * inst.spx_unit, y0 + row * inst.spy_unit)
+                    for row in range(inst.ny) for col in range(inst.nx)]
+        ans = []
+        for port in self._port_table[prefix][:num_bits]:
+            warrs = []
+            for loc in loc_list:
+                warrs.extend(port.transform(grid, loc=loc, orient=orient,
+                                            unit_mode=True).get_pins())
+            ans.append(group_warrs(warrs))
+        return ans
+
+
+class WireCollector(object):
+    """Collects WireArrays to be connected together with connect_wires()."""
+
+    def __init__(self):
+        # type: () -> None
+        self._warrs = []  # type: List[WireArray]
+
+    def extend(self, warr_list):
+        # type: (Iterable[WireArray]) -> None
+        """Add the given wires."""
+        self._warrs.extend(warr_list)
+
+    def connect(self, template, **kwargs):
+        # type: (TemplateBase, **Any) -> List[WireArray]
+        """Connect all collected wires, and returns the connected wires.
+
+        Parameters
+        ----------
+        template : TemplateBase
+            the template to draw wires in.
+        **kwargs :
+            keyword arguments for connect_wires().
+
+        Returns
+        -------
+        warr_list : List[WireArray]
+            the connected wires.
+        """
+        return template.connect_wires(self._warrs, **kwargs)
+
+
+class WireAccumulator(WireCollector):
+    """Merges collinear wires on the same track as they are added.
+
+    Only the merged wire intervals on each track are kept instead of every wire added.  This
+    is used to connect wires of many abutting blocks, where wires on the same track overlap or
+    abut and merge into a few intervals.  Wires are only drawn when connect() is called.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        WireCollector.__init__(self)
+        self._intvs = {}  # type: Dict[Tuple[int, Any, int], IntervalSet]
+
+    def extend(self, warr_list):
+        # type: (Iterable[WireArray]) -> None
+        """Merge the given wires into the accumulated wire intervals."""
+        for warr in warr_list:
+            tid = warr.track_id
+            intv = (warr.lower_unit, warr.upper_unit)
+            for idx in range(tid.num):
+                key = (warr.layer_id, tid.base_index + idx * tid.pitch, tid.width)
+                intv_set = self._intvs.get(key, None)
+                if intv_set is None:
+                    self._intvs[key] = intv_set = IntervalSet()
+                intv_set.add(intv, merge=True, abut=True)
+
+    def connect(self, template, **kwargs):
+        # type: (TemplateBase, **Any) -> List[WireArray]
+        """Draw all accumulated wire intervals, and returns the drawn wires.
+
+        Parameters
+        ----------
+        template : TemplateBase
+            the template to draw wires in.
+        **kwargs :
+            connect_wires() arguments, for compatibility with WireCollector.  Only unit_mode
+            is supported, since the wire intervals are already in resolution units; other
+            arguments must be None.
+
+        Returns
+        -------
+        warr_list : List[WireArray]
+            the drawn wires.
+        """
+        for key, val in kwargs.items():
+            if key != 'unit_mode' and val is not None:
+                raise ValueError('WireAccumulator does not support %s=%s' % (key, val))
+
+        warr_list = []
+        for (layer_id, tr_idx, width), intv_set in self._intvs.items():
+            for lower, upper in intv_set:
+                warr_list.append(template.add_wires(layer_id, tr_idx, lower, upper,
+                                                    width=width, unit_mode=True))
+        return warr_list
+
+
+def group_warrs(warr_list):
+    # type: (Iterable[WireArray]) -> List[WireArray]
+    """Group single-wire WireArrays into as few multi-wire WireArrays as possible.
+
+    Wires on the same layer with the same width and extent are sorted by track index, and
+    each maximal run of evenly spaced wires is converted to a single WireArray.  Multi-wire
+    WireArrays are returned as is.
+
+    Parameters
+    ----------
+    warr_list : Iterable[WireArray]
+        the wires to group.
+
+    Returns
+    -------
+    warr_list : List[WireArray]
+        the grouped wires.
+    """
+    ans = []
+    groups = {}  # type: Dict[Tuple[int, int, int, int], List[WireArray]]
+    for warr in warr_list:
+        tid = warr.track_id
+        if tid.num > 1:
+            ans.append(warr)
+        else:
+            key = (warr.layer_id, tid.width, warr.lower_unit, warr.upper_unit)
+            groups.setdefault(key, []).append(warr)
+
+    for group in groups.values():
+        group.sort(key=lambda w: w.track_id.base_index)
+        run = [group[0]]
+        pitch = None
+        for warr in group[1:]:
+            delta = warr.track_id.base_index - run[-1].track_id.base_index
+            if delta == 0:
+                # duplicate wire
+                continue
+            if pitch is None or delta == pitch:
+                pitch = delta
+                run.append(warr)
+            else:
+                ans.append(WireArray.list_to_warr(run))
+                run = [warr]
+                pitch = None
+        ans.append(WireArray.list_to_warr(run))
+
+    return ans
+
+
+def export_array_pins(template,  # type: TemplateBase
+                      inst,  # type: Instance
+                      name_list,  # type: Iterable[str]
+                      connect_kwargs=None,  # type: Optional[Dict[str, Any]]
+                      show=False,  # type: bool
+                      ):
+    # type: (...) -> None
+    """Connect same-named pins across all elements of an arrayed instance, then export them.
+
+    The pins of each port on all array elements are first merged into multi-wire WireArrays
+    with :func:`group_warrs`, so each port is connected and exported with a single call on
+    a few arrayed wires instead of one wire per element.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the parent template.
+    inst : Instance
+        the arrayed instance.
+    name_list : Iterable[str]
+        list of port names to connect and export.  The exported pins have the same names.
+    connect_kwargs : Optional[Dict[str, Any]]
+        if not None, pins are connected with connect_wires() using these keyword arguments.
+        Otherwise, pins are exported as is.
+    show : bool
+        True to show pins.
+    """
+    for name in name_list:
+        warrs = group_warrs(inst.get_all_port_pins(name))
+        if connect_kwargs is not None:
+            warrs = template.connect_wires(warrs, **connect_kwargs)
+        template.add_pin(name, warrs, show=show)
+
+
+def _connect_nets(template,  # type: TemplateBase
+                  net_list,  # type: List[Tuple[str, List[WireArray]]]
+                  connect_kwargs,  # type: Dict[str, Any]
+                  ):
+    # type: (...) -> List[Tuple[str, List[WireArray]]]
+    """Connect the pins of each net with connect_wires(), and returns the connected nets.
+
+    connect_wires() joins all wires on the same track, so if no two nets share a track, the
+    pins of all nets on the same layer are connected with a single call, and the drawn wires
+    are assigned back to nets by track.  Otherwise, each net is connected with its own call.
+    """
+    track_table = {}  # type: Dict[Tuple[int, Any], int]
+    layer_table = {}  # type: Dict[int, List[WireArray]]
+    for net_idx, (_, warrs) in enumerate(net_list):
+        for warr in warrs:
+            layer_id = warr.layer_id
+            tid = warr.track_id
+            for idx in range(tid.num):
+                key = (layer_id, tid.base_index + idx * tid.pitch)
+                if track_table.setdefault(key, net_idx) != net_idx:
+                    # two nets share a track; connect nets one at a time.
+                    return [(net_name, template.connect_wires(warrs, **connect_kwargs))
+                            for net_name, warrs in net_list]
+            layer_table.setdefault(layer_id, []).append(warr)
+
+    res = template.grid.resolution
+    results = [[] for _ in range(len(net_list))]  # type: List[List[WireArray]]
+    for layer_id, warrs in layer_table.items():
+        for warr in template.connect_wires(warrs, **connect_kwargs):
+            tid = warr.track_id
+            if tid.num == 1:
+                results[track_table[(layer_id, tid.base_index)]].append(warr)
+            else:
+                # split arrays that span several nets.
+                for idx in range(tid.num):
+                    tr_idx = tid.base_index + idx * tid.pitch
+                    results[track_table[(layer_id, tr_idx)]].append(
+                        WireArray(TrackID(layer_id, tr_idx, width=tid.width), warr.lower_unit,
+                                  warr.upper_unit, res=res, unit_mode=True))
+
+    return [(net_name, warrs) for (net_name, _), warrs in zip(net_list, results)]
+
+
+def reexport_array(template,  # type: TemplateBase
+                   inst,  # type: Instance
+                   name_list,  # type: Sequence[str]
+                   new_fmt,  # type: str
+                   col_stride=0,  # type: int
+                   row_stride=0,  # type: int
+                   offset=0,  # type: int
+                   connect_kwargs=None,  # type: Optional[Dict[str, Any]]
+                   pin_idx=None,  # type: Optional[int]
+                   show=False,  # type: bool
+                   ):
+    # type: (...) -> None
+    """Re-export ports of every element of an arrayed instance as bus bits.
+
+    The port name_list[idx] of the element on the given column and row is exported as::
+
+        new_fmt % (offset + idx + col * col_stride + row * row_stride)
+
+    The pins of all ports are collected first.  If connect_kwargs is given, the pins of all
+    nets are connected in batch (see :func:`_connect_nets`), so each layer usually needs a
+    single connect_wires() call instead of one call per net.  Each net is then added as one
+    pin.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the parent template.
+    inst : Instance
+        the arrayed instance.
+    name_list : Sequence[str]
+        list of port names of the instance master.
+    new_fmt : str
+        the exported net name format string.
+    col_stride : int
+        bus index increment per instance column.
+    row_stride : int
+        bus index increment per instance row.
+    offset : int
+        the bus index of the first port of the first element.
+    connect_kwargs : Optional[Dict[str, Any]]
+        if not None, the pins of each port are connected with connect_wires() using these
+        keyword arguments before exporting.
+    pin_idx : Optional[int]
+        if not None, only export the pin with this index of each port.  Otherwise, all pins
+        of each port are exported.
+    show : bool
+        True to show pins.
+    """
+    net_list = []  # type: List[Tuple[str, List[WireArray]]]
+    for col in range(inst.nx):
+        for row in range(inst.ny):
+            base_idx = offset + col * col_stride + row * row_stride
+            for idx, name in enumerate(name_list):
+                pins = inst.get_port(name, row=row, col=col).get_pins()
+                if pin_idx is not None:
+                    pins = [pins[pin_idx]]
+                net_list.append((new_fmt % (base_idx + idx), pins))
+
+    if connect_kwargs is not None:
+        net_list = _connect_nets(template, net_list, connect_kwargs)
+    for net_name, warrs in net_list:
+        template.add_pin(net_name, warrs, show=show)
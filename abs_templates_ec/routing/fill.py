@@ -2,7 +2,7 @@
 
 """This module defines dummy/power fill related templates."""
 
-from typing import TYPE_CHECKING, Dict, Set, Any, Tuple, List
+from typing import TYPE_CHECKING, Dict, Set, Any, Tuple, List, Optional, Iterable, Iterator
 
 import numpy as np
 
@@ -11,6 +11,7 @@ from bag.layout.util import BBox
 from bag.layout.template import TemplateBase
 
 from ..analog_core.base import AnalogBase, AnalogBaseInfo
+from ..analog_mos.mos import DummyFillActive
 
 if TYPE_CHECKING:
     from bag.layout.objects import Instance
@@ -240,6 +241,106 @@ class PowerFill(TemplateBase):
             yield x0, y0, nx, ny
 
 
+def _split_blocks(num_blk, max_blk):
+    # type: (int, int) -> Iterator[Tuple[int, int, int]]
+    """Split a row of blocks into an array of equal tiles and a remainder tile.
+
+    Yields (offset, tile size, number of tiles) tuples, in number of blocks.
+    """
+    tile = min(num_blk, max_blk)
+    num_tile, rem = divmod(num_blk, tile)
+    yield 0, tile, num_tile
+    if rem > 0:
+        yield num_tile * tile, rem, 1
+
+
+def add_active_fill(template,  # type: TemplateBase
+                    bound_box,  # type: BBox
+                    mos_type,  # type: str
+                    threshold,  # type: str
+                    blockages=None,  # type: Optional[Iterable[BBox]]
+                    blk_size=None,  # type: Optional[Tuple[int, int]]
+                    max_blk=(8, 8),  # type: Tuple[int, int]
+                    ):
+    # type: (...) -> List[Instance]
+    """Fill a large region with arrayed DummyFillActive blocks.
+
+    The region is divided into a grid of fill blocks, and blocks that overlap any blockage are
+    removed.  The remaining blocks are decomposed into rectangles, and each rectangle is tiled
+    with arrayed DummyFillActive instances of at most max_blk blocks, so only a few different
+    fill masters are created.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the template to draw fill in.
+    bound_box : BBox
+        the fill region.
+    mos_type : str
+        the fill transistor type.
+    threshold : str
+        the fill transistor threshold.
+    blockages : Optional[Iterable[BBox]]
+        areas that should not be filled.
+    blk_size : Optional[Tuple[int, int]]
+        the fill block width/height, in resolution units.  Defaults to the minimum fill
+        dimension.
+    max_blk : Tuple[int, int]
+        maximum number of blocks in a fill master in each direction.
+
+    Returns
+    -------
+    inst_list : List[Instance]
+        the fill instances.
+    """
+    grid = template.grid
+    if blk_size is None:
+        blk_w, blk_h = DummyFillActive.get_min_fill_dim(grid.tech_info, mos_type, threshold)
+    else:
+        blk_w, blk_h = blk_size
+    if blk_w <= 0 or blk_h <= 0:
+        # this technology does not support active fill.
+        return []
+
+    xl = bound_box.left_unit
+    yb = bound_box.bottom_unit
+    nx = (bound_box.right_unit - xl) // blk_w
+    ny = (bound_box.top_unit - yb) // blk_h
+    if nx <= 0 or ny <= 0:
+        return []
+
+    # rasterize blockages
+    uf_mat = np.ones((nx, ny), dtype=bool)
+    if blockages is not None:
+        for box in blockages:
+            x0 = max(box.left_unit - xl, 0) // blk_w
+            x1 = min(-(-(box.right_unit - xl) // blk_w), nx)
+            y0 = max(box.bottom_unit - yb, 0) // blk_h
+            y1 = min(-(-(box.top_unit - yb) // blk_h), ny)
+            if x1 > x0 and y1 > y0:
+                uf_mat[x0:x1, y0:y1] = False
+
+    master_table = {}
+    params = dict(mos_type=mos_type, threshold=threshold)
+    inst_list = []
+    for x0, y0, num_x, num_y in PowerFill._get_fill_mosaics(uf_mat):
+        for dx, tile_nx, arr_nx in _split_blocks(int(num_x), max_blk[0]):
+            for dy, tile_ny, arr_ny in _split_blocks(int(num_y), max_blk[1]):
+                tile_w = tile_nx * blk_w
+                tile_h = tile_ny * blk_h
+                master = master_table.get((tile_w, tile_h), None)
+                if master is None:
+                    params['width'] = tile_w
+                    params['height'] = tile_h
+                    master = template.new_template(params=params, temp_cls=DummyFillActive)
+                    master_table[(tile_w, tile_h)] = master
+                loc = xl + (int(x0) + dx) * blk_w, yb + (int(y0) + dy) * blk_h
+                inst_list.append(template.add_instance(master, loc=loc, nx=arr_nx, ny=arr_ny,
+                                                       spx=tile_w, spy=tile_h, unit_mode=True))
+
+    return inst_list
+
+
 class DecapFillCore(AnalogBase):
     """A decap cell used for power fill
 
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines RoutingGridCache, a memoizing view of a RoutingGrid, and helper
+functions for caches keyed by routing grid."""
+
+from typing import TYPE_CHECKING, Any, Dict, Tuple, MutableMapping
+
+if TYPE_CHECKING:
+    from bag.layout.routing import RoutingGrid
+
+
+class RoutingGridCache(object):
+    """A memoizing view of a RoutingGrid.
+
+    Placement routines query the routing grid with a small set of repeated arguments.  This
+    class caches the results of the most common queries; all other attributes are forwarded to
+    the underlying grid.  The cache assumes the grid is not modified; if it is, call
+    :meth:`clear`.  Templates should create a new RoutingGridCache whenever their grid is
+    replaced.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the routing grid.
+    """
+
+    def __init__(self, grid):
+        # type: (RoutingGrid) -> None
+        self._grid = grid
+        self._cache = {}  # type: Dict[Tuple[Any, ...], Any]
+        self._stats = [0, 0]
+
+    def __getattr__(self, name):
+        return getattr(self._grid, name)
+
+    @property
+    def grid(self):
+        # type: () -> RoutingGrid
+        """The underlying routing grid."""
+        return self._grid
+
+    @property
+    def stats(self):
+        # type: () -> Tuple[int, int]
+        """The number of cache hits and misses."""
+        return self._stats[0], self._stats[1]
+
+    def clear(self):
+        # type: () -> None
+        """Clear all cached results."""
+        self._cache.clear()
+
+    def _query(self, name, args, kwargs):
+        # type: (str, Tuple[Any, ...], Dict[str, Any]) -> Any
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            ans = self._cache[key]
+        except KeyError:
+            self._stats[1] += 1
+            ans = self._cache[key] = getattr(self._grid, name)(*args, **kwargs)
+        except TypeError:
+            # unhashable arguments; do not cache.
+            self._stats[1] += 1
+            return getattr(self._grid, name)(*args, **kwargs)
+        else:
+            self._stats[0] += 1
+        return ans
+
+    def get_via_extensions(self, *args, **kwargs):
+        return self._query('get_via_extensions', args, kwargs)
+
+    def get_wire_bounds(self, *args, **kwargs):
+        return self._query('get_wire_bounds', args, kwargs)
+
+    def find_next_track(self, *args, **kwargs):
+        return self._query('find_next_track', args, kwargs)
+
+    def get_line_end_space(self, *args, **kwargs):
+        return self._query('get_line_end_space', args, kwargs)
+
+    def track_to_coord(self, *args, **kwargs):
+        return self._query('track_to_coord', args, kwargs)
+
+    def get_track_pitch(self, *args, **kwargs):
+        return self._query('get_track_pitch', args, kwargs)
+
+
+def get_grid_table(table, grid):
+    # type: (MutableMapping[RoutingGrid, Dict[Any, Any]], RoutingGrid) -> Dict[Any, Any]
+    """Returns the cache table of the given routing grid, creating it if necessary.
+
+    Parameters
+    ----------
+    table : MutableMapping[RoutingGrid, Dict[Any, Any]]
+        the class-level cache.  Should be a WeakKeyDictionary, so cache tables are freed
+        together with their routing grids.
+    grid : RoutingGrid
+        the routing grid.  A RoutingGridCache shares the cache table of its underlying grid.
+
+    Returns
+    -------
+    grid_table : Dict[Any, Any]
+        the cache table of the given routing grid.
+    """
+    if isinstance(grid, RoutingGridCache):
+        grid = grid.grid
+    grid_table = table.get(grid, None)
+    if grid_table is None:
+        table[grid] = grid_table = {}
+    return grid_table
@@ -157,6 +157,7 @@ class DiffAmp(SerdesRXBase):
             pds_tracks=[2 * hm_cur_width + diff_space],
             min_fg_sep=min_fg_sep,
             guard_ring_nf=guard_ring_nf,
+            checkpoint=True,
         )
         ng_tracks = []
         nds_tracks = []
@@ -332,6 +333,7 @@ class IntegSummer(SerdesRXBase):
             pds_tracks=[2 * hm_cur_width + diff_space],
             min_fg_sep=min_fg_sep,
             guard_ring_nf=guard_ring_nf,
+            checkpoint=True,
         )
         ng_tracks = []
         nds_tracks = []
@@ -525,6 +527,7 @@ class Tap1Summer(SerdesRXBase):
             pds_tracks=[2 * hm_cur_width + diff_space],
             min_fg_sep=min_fg_sep,
             guard_ring_nf=guard_ring_nf,
+            checkpoint=True,
         )
         ng_tracks = []
         nds_tracks = []
@@ -1073,11 +1073,18 @@ class RXHalf(TemplateBase):
         a set of already used cell names.
     **kwargs
         dictionary of optional parameters.  See documentation of
-        :class:`bag.layout.template.TemplateBase` for details.
+        :class:`bag.layout.template.TemplateBase` for details.  In addition, RXHalf supports:
+
+        dry_run : bool
+            True to floorplan this data path with dry run RXHalfTop/RXHalfBottom masters.  See
+            :class:`~abs_templates_ec.analog_core.AnalogBase`.  The resulting master must not
+            be instantiated in the final layout.  Defaults to False.
     """
 
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
+        # set before calling TemplateBase constructor, as it is used to compute the unique key.
+        self._dry_run = kwargs.pop('dry_run', False)
         super(RXHalf, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
         self._fg_tot = 0
         self._col_idx_dict = None
@@ -1165,6 +1172,19 @@ class RXHalf(TemplateBase):
         # type: () -> int
         return self._fg_tot
 
+    @property
+    def dry_run(self):
+        # type: () -> bool
+        """Returns True if this template only computes placement information."""
+        return self._dry_run
+
+    def compute_unique_key(self):
+        key = super(RXHalf, self).compute_unique_key()
+        if self._dry_run:
+            # dry run masters must never be shared with fully drawn masters.
+            return 'dry_run', key
+        return key
+
     def get_column_index_table(self):
         return self._col_idx_dict
 
@@ -1466,7 +1486,8 @@ class RXHalf(TemplateBase):
         bot_params['dlat_params_list'] = new_dlat_params_list
         bot_params['tap1_col_intv'] = tap1_col_intv
         bot_params['show_pins'] = False
-        bot_master = self.new_template(params=bot_params, temp_cls=RXHalfBottom)
+        bot_master = self.new_template(params=bot_params, temp_cls=RXHalfBottom,
+                                       dry_run=self._dry_run)
         bot_inst = self.add_instance(bot_master)
         self.in_xm_track = bot_inst.master.in_xm_track
 
@@ -1499,7 +1520,8 @@ class RXHalf(TemplateBase):
         )
         top_params['show_pins'] = False
         # print('top summer col: %d' % top_params['summer_params']['col_idx'])
-        top_master = self.new_template(params=top_params, temp_cls=RXHalfTop)
+        top_master = self.new_template(params=top_params, temp_cls=RXHalfTop,
+                                       dry_run=self._dry_run)
         top_inst = self.add_instance(top_master, orient='MX')
         top_inst.move_by(dy=bot_inst.array_box.top - top_inst.array_box.bottom)
         self.array_box = bot_inst.array_box.merge(top_inst.array_box)
@@ -362,7 +362,8 @@ class CMLCorePMOS(AnalogBase):
                        p_orientations=['MX', 'R0', 'R0', 'R0'],
                        guard_ring_nf=guard_ring_nf,
                        pgr_w=ntap_w, ngr_w=ntap_w,
-                       top_layer=top_layer, end_mode=end_mode)
+                       top_layer=top_layer, end_mode=end_mode,
+                       checkpoint=True)
 
         # compute track ids
         outp_tid = self.make_track_id('pch', 3, 'ds', (hm_width - 1) / 2 + input_space, width=hm_width)
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+"""This module defines precompiled technology parameter bundles.
+
+Parsing the technology YAML file is a large part of the startup time of short generator jobs.
+:func:`compile_tech_bundle` parses a technology YAML file once, resolves all channel-length
+dependent parameters, and saves the result in a binary bundle of plain Python data.
+:func:`load_tech_config` loads the bundle if it is up to date with the YAML file, and falls back
+to parsing the YAML file otherwise.
+
+A bundle can be compiled from the command line with::
+
+    python -m abs_templates_ec.tech_bundle <tech_yaml> [<bundle_file>]
+"""
+
+from typing import Dict, Any, Tuple, List, Optional
+
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+from bisect import bisect_left
+
+import yaml
+
+# increment when the bundle format or the parameter resolution changes.
+BUNDLE_VERSION = 2
+# the bundle file header format.
+_HEADER_FMT = 'BAGTECH %d %s\n'
+
+
+def _is_lch_param(val):
+    # type: (Any) -> bool
+    return isinstance(val, dict) and 'lch' in val and 'val' in val
+
+
+def resolve_lch_params(config, lch_unit):
+    # type: (Dict[str, Any], float) -> Dict[str, Any]
+    """Returns a copy of the given configuration with channel-length dependent entries resolved.
+
+    An entry is channel-length dependent if it is a dictionary with 'lch' and 'val' entries.  It
+    is replaced by the value corresponding to the first 'lch' value that is greater than or
+    equal to lch_unit.
+
+    Parameters
+    ----------
+    config : Dict[str, Any]
+        the configuration dictionary.
+    lch_unit : float
+        the channel length, in resolution units.
+
+    Returns
+    -------
+    ans : Dict[str, Any]
+        the resolved configuration dictionary.
+    """
+    ans = config.copy()
+    for key, data in config.items():
+        if _is_lch_param(data):
+            for lch, val in zip(data['lch'], data['val']):
+                if lch_unit <= lch:
+                    ans[key] = val
+                    break
+    return ans
+
+
+class LchConfigDict(dict):
+    """A configuration dictionary loaded from a bundle, with its precomputed LchParamTable."""
+
+    def __init__(self, config, lch_table):
+        # type: (Dict[str, Any], LchParamTable) -> None
+        dict.__init__(self, config)
+        self.lch_table = lch_table
+
+    def __reduce__(self):
+        # pickle as a plain dictionary.
+        return dict, (dict(self), )
+
+
+class LchParamTable(object):
+    """A table of resolved configurations of all channel length ranges.
+
+    Parameters
+    ----------
+    lch_list : List[float]
+        the sorted channel length range boundaries.
+    config_list : List[Dict[str, Any]]
+        the resolved configurations.  A channel length in the range
+        (lch_list[idx - 1], lch_list[idx]] resolves to config_list[idx], and a channel length
+        larger than all boundaries resolves to config_list[-1].
+    """
+
+    def __init__(self, lch_list, config_list):
+        # type: (List[float], List[Dict[str, Any]]) -> None
+        self._lch_list = lch_list
+        self._config_list = config_list
+
+    @classmethod
+    def from_config(cls, config):
+        # type: (Dict[str, Any]) -> LchParamTable
+        """Returns the channel length parameter table of the given configuration dictionary."""
+        lch_set = set()
+        for data in config.values():
+            if _is_lch_param(data):
+                lch_set.update(data['lch'])
+
+        lch_list = sorted(lch_set)
+        config_list = [resolve_lch_params(config, lch) for lch in lch_list]
+        config_list.append(resolve_lch_params(config, float('inf')))
+        return cls(lch_list, config_list)
+
+    @classmethod
+    def resolve(cls, config, lch_unit):
+        # type: (Dict[str, Any], float) -> Dict[str, Any]
+        """Returns the resolved configuration dictionary of the given channel length.
+
+        Uses the precomputed table if the configuration was loaded from a bundle.  The returned
+        dictionary may be shared and must not be modified.
+
+        Parameters
+        ----------
+        config : Dict[str, Any]
+            the configuration dictionary.
+        lch_unit : float
+            the channel length, in resolution units.
+
+        Returns
+        -------
+        params : Dict[str, Any]
+            the resolved configuration dictionary.
+        """
+        if isinstance(config, LchConfigDict):
+            return config.lch_table.get_params(lch_unit)
+        return resolve_lch_params(config, lch_unit)
+
+    def to_data(self):
+        # type: () -> Tuple[List[float], List[Dict[str, Any]]]
+        """Returns the content of this table as plain data, to be saved in a bundle."""
+        return self._lch_list, self._config_list
+
+    def get_params(self, lch_unit):
+        # type: (float) -> Dict[str, Any]
+        """Returns the resolved configuration dictionary of the given channel length.
+
+        The returned dictionary is shared and must not be modified.
+
+        Parameters
+        ----------
+        lch_unit : float
+            the channel length, in resolution units.
+
+        Returns
+        -------
+        params : Dict[str, Any]
+            the resolved configuration dictionary.
+        """
+        return self._config_list[bisect_left(self._lch_list, lch_unit)]
+
+
+def _get_yaml_hash(yaml_fname):
+    # type: (str) -> str
+    with open(yaml_fname, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _get_header(yaml_hash):
+    # type: (str) -> bytes
+    return (_HEADER_FMT % (BUNDLE_VERSION, yaml_hash)).encode('ascii')
+
+
+def _read_yaml(yaml_fname):
+    # type: (str) -> Dict[str, Any]
+    with open(yaml_fname, 'r') as f:
+        return yaml.load(f, Loader=yaml.Loader)
+
+
+def _get_lch_tables(config):
+    # type: (Dict[str, Any]) -> Dict[str, Tuple[List[float], List[Dict[str, Any]]]]
+    # save tables as plain data, so bundles do not depend on how this module is imported.
+    ans = {}
+    for key, val in config.items():
+        if isinstance(val, dict) and any((_is_lch_param(data) for data in val.values())):
+            ans[key] = LchParamTable.from_config(val).to_data()
+    return ans
+
+
+def get_bundle_fname(yaml_fname):
+    # type: (str) -> str
+    """Returns the default bundle file name of the given technology YAML file."""
+    return os.path.splitext(yaml_fname)[0] + '.techbundle'
+
+
+def compile_tech_bundle(yaml_fname, bundle_fname=None):
+    # type: (str, Optional[str]) -> str
+    """Compile the given technology YAML file into a binary bundle.
+
+    Parameters
+    ----------
+    yaml_fname : str
+        the technology YAML file name.
+    bundle_fname : Optional[str]
+        the bundle file name.  Defaults to the YAML file name with a .techbundle extension.
+
+    Returns
+    -------
+    bundle_fname : str
+        the bundle file name.
+    """
+    if bundle_fname is None:
+        bundle_fname = get_bundle_fname(yaml_fname)
+
+    yaml_hash = _get_yaml_hash(yaml_fname)
+    config = _read_yaml(yaml_fname)
+    content = dict(config=config, lch_tables=_get_lch_tables(config))
+
+    # write to a temporary file first, so concurrent jobs never see a partial bundle.
+    dir_name = os.path.dirname(os.path.abspath(bundle_fname))
+    fd, tmp_fname = tempfile.mkstemp(dir=dir_name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_get_header(yaml_hash))
+            pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_fname, bundle_fname)
+    except Exception:
+        os.remove(tmp_fname)
+        raise
+
+    return bundle_fname
+
+
+def _load_bundle(bundle_fname, header):
+    # type: (str, bytes) -> Optional[Dict[str, Any]]
+    """Returns the bundle content, or None if the bundle does not match the given header."""
+    with open(bundle_fname, 'rb') as f:
+        if f.read(len(header)) != header:
+            return None
+        return pickle.load(f)
+
+
+def load_tech_config(yaml_fname, bundle_fname=None, update=False):
+    # type: (str, Optional[str], bool) -> Dict[str, Any]
+    """Returns the technology configuration dictionary of the given YAML file.
+
+    If the bundle file exists and was compiled from the same YAML file content, the
+    configuration is loaded from the bundle, and dictionaries with channel length dependent
+    parameters are returned as LchConfigDict, which carry their precomputed parameter tables.
+    Otherwise, the YAML file is parsed.
+
+    Parameters
+    ----------
+    yaml_fname : str
+        the technology YAML file name.
+    bundle_fname : Optional[str]
+        the bundle file name.  Defaults to the YAML file name with a .techbundle extension.
+    update : bool
+        True to recompile the bundle if it is missing or out of date.
+
+    Returns
+    -------
+    config : Dict[str, Any]
+        the technology configuration dictionary.
+    """
+    if bundle_fname is None:
+        bundle_fname = get_bundle_fname(yaml_fname)
+
+    content = None
+    if os.path.isfile(bundle_fname):
+        try:
+            content = _load_bundle(bundle_fname, _get_header(_get_yaml_hash(yaml_fname)))
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError):
+            # corrupted or incompatible bundle; fall back to YAML file.
+            content = None
+
+    if content is None:
+        if not update:
+            return _read_yaml(yaml_fname)
+        compile_tech_bundle(yaml_fname, bundle_fname=bundle_fname)
+        content = _load_bundle(bundle_fname, _get_header(_get_yaml_hash(yaml_fname)))
+
+    config = content['config']
+    for key, (lch_list, config_list) in content['lch_tables'].items():
+        config[key] = LchConfigDict(config[key], LchParamTable(lch_list, config_list))
+    return config
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or len(sys.argv) > 3:
+        print('Usage: python -m abs_templates_ec.tech_bundle <tech_yaml> [<bundle_file>]')
+        sys.exit(1)
+    # use the package module, not __main__, so nothing in the bundle refers to __main__.
+    from abs_templates_ec.tech_bundle import compile_tech_bundle as _compile_tech_bundle
+
+    print('Bundle written to %s' % _compile_tech_bundle(*sys.argv[1:]))
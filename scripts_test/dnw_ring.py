@@ -133,6 +133,14 @@ def generate(prj, specs):
     name_list.append('SUBRING_TEST1')
     temp_list.append(temp_db.new_template(params=params3, temp_cls=DNWRingTest))
 
+    # the same ring built from arrayed substrate units, to check it against the ring above in
+    # DRC and LVS.
+    arr_sub_params = sub_params.copy()
+    arr_sub_params['sub_unit_fg'] = specs.get('sub_unit_fg', 8)
+    params_arr = dict(amp_params=amp_params1, sub_params=arr_sub_params)
+    name_list.append('SUBRING_ARR_TEST1')
+    temp_list.append(temp_db.new_template(params=params_arr, temp_cls=DNWRingTest))
+
     print('creating layouts')
     temp_db.batch_layout(prj, temp_list, name_list)
     print('layout done.')
@@ -144,6 +144,16 @@ def generate(prj, specs):
     name_list.append('SUBRING_TEST2')
     temp_list.append(temp_db.new_template(params=params4, temp_cls=SubRingTest))
 
+    # the same rings built from arrayed substrate units, to check them against the rings above
+    # in DRC and LVS.
+    sub_unit_fg = specs.get('sub_unit_fg', 8)
+    for idx, cur_amp_params in enumerate((amp_params1, amp_params2)):
+        arr_sub_params = sub_params.copy()
+        arr_sub_params['sub_unit_fg'] = sub_unit_fg
+        params_arr = dict(amp_params=cur_amp_params, sub_params=arr_sub_params)
+        name_list.append('SUBRING_ARR_TEST%d' % (idx + 1))
+        temp_list.append(temp_db.new_template(params=params_arr, temp_cls=SubRingTest))
+
     print('creating layouts')
     temp_db.batch_layout(prj, temp_list, name_list)
     print('layout done.')
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+"""Tests the dummy OD fill solver used by finfet extension rows."""
+
+import os
+import math
+
+import pytest
+import yaml
+
+from abs_templates_ec.analog_mos.od_fill import solve_od_fill
+
+_TECH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                          'tech_params_sample', 'finfet.yaml')
+
+
+def _get_sample_fill_params():
+    """Returns fill parameters of the finfet sample technology, computed like MOSTechFinfetBase."""
+    with open(_TECH_FILE, 'r') as f:
+        mos_constants = yaml.load(f, Loader=yaml.Loader)['mos']
+
+    fin_h = mos_constants['fin_h']
+    fin_p = mos_constants['mos_pitch']
+    offset, h_scale, p_scale = mos_constants.get('od_fin_exty_constants', (0, 0, 0))
+    od_fin_exty = offset + int(round(h_scale * fin_h)) + int(round(p_scale * fin_p))
+    od_spy = mos_constants['od_spy']
+    if not mos_constants['has_cpo']:
+        od_spy = max(od_spy, 2 * mos_constants['po_od_exty']['val'][0] + mos_constants['po_spy'])
+
+    sp_min = -(-(od_spy + fin_h + 2 * od_fin_exty - fin_p) // fin_p)
+    sp_max = (mos_constants['od_spy_max'] + fin_h + 2 * od_fin_exty - fin_p) // fin_p
+    nfin_min, nfin_max = mos_constants['od_fill_h']
+    return dict(
+        fin_p=fin_p,
+        od_h_delta=fin_h + 2 * od_fin_exty - fin_p,
+        fin_h=fin_h,
+        od_fin_exty=od_fin_exty,
+        nfin_min=nfin_min,
+        nfin_max=nfin_max,
+        sp_min=sp_min,
+        sp_max=sp_max,
+        density=mos_constants['od_min_density'],
+    )
+
+
+def _get_area(od_fin_list, fin_p, od_h_delta):
+    return sum((fin_p * (stop - start) + od_h_delta for start, stop in od_fin_list))
+
+
+def _check_fill(od_fin_list, num_fin, nfin_min, nfin_max, sp_min, sp_max, fill_on_edge):
+    """Checks that the given fill is symmetric and meets all spacing and size rules."""
+    assert list(od_fin_list) == sorted(od_fin_list)
+    assert {(num_fin - stop, num_fin - start) for start, stop in od_fin_list} == set(od_fin_list)
+    for start, stop in od_fin_list:
+        assert nfin_min <= stop - start <= nfin_max
+    for (_, stop), (start, _) in zip(od_fin_list[:-1], od_fin_list[1:]):
+        assert sp_min <= start - stop <= sp_max
+    if fill_on_edge:
+        assert od_fin_list[0][0] == 0 and od_fin_list[-1][1] == num_fin
+    elif od_fin_list:
+        assert sp_min <= od_fin_list[0][0] <= sp_max
+        assert sp_min <= num_fin - od_fin_list[-1][1] <= sp_max
+    else:
+        assert sp_min <= num_fin <= sp_max
+
+
+def _enumerate_fills(num_fin, nfin_min, nfin_max, sp_min, sp_max, fill_on_edge):
+    """Enumerates all symmetric fills by brute force."""
+    results = []
+
+    def _helper(pos, last_fill, od_list):
+        if pos == num_fin and last_fill == fill_on_edge:
+            results.append(tuple(od_list))
+        elif last_fill:
+            for sp in range(sp_min, min(sp_max, num_fin - pos) + 1):
+                _helper(pos + sp, False, od_list)
+        else:
+            for nfin in range(nfin_min, min(nfin_max, num_fin - pos) + 1):
+                _helper(pos + nfin, True, od_list + [(pos, pos + nfin)])
+
+    _helper(0, not fill_on_edge, [])
+    return [od_list for od_list in results
+            if {(num_fin - b, num_fin - a) for a, b in od_list} == set(od_list)]
+
+
+@pytest.mark.parametrize('fill_on_edge', [True, False])
+@pytest.mark.parametrize(('nfin_min', 'nfin_max', 'sp_min', 'sp_max'),
+                         [(1, 3, 1, 2), (2, 4, 0, 3), (2, 3, 1, 4)])
+def test_solver_matches_brute_force(fill_on_edge, nfin_min, nfin_max, sp_min, sp_max):
+    fin_p, od_h_delta = 48, -34
+    for num_fin in range(1, 17):
+        fill_list = _enumerate_fills(num_fin, nfin_min, nfin_max, sp_min, sp_max, fill_on_edge)
+        area_list = sorted({_get_area(od_list, fin_p, od_h_delta) for od_list in fill_list})
+        for area_targ in range(0, num_fin * fin_p + 1, fin_p // 2):
+            if not fill_list:
+                with pytest.raises(ValueError):
+                    solve_od_fill(num_fin, area_targ, fin_p, od_h_delta, nfin_min, nfin_max,
+                                  sp_min, sp_max, fill_on_edge)
+                continue
+
+            ans = solve_od_fill(num_fin, area_targ, fin_p, od_h_delta, nfin_min, nfin_max,
+                                sp_min, sp_max, fill_on_edge)
+            _check_fill(ans, num_fin, nfin_min, nfin_max, sp_min, sp_max, fill_on_edge)
+            valid_areas = [area for area in area_list if area >= area_targ]
+            expected = valid_areas[0] if valid_areas else area_list[-1]
+            assert _get_area(ans, fin_p, od_h_delta) == expected
+
+
+@pytest.mark.parametrize('fill_on_edge', [True, False])
+def test_solver_sample_tech_sweep(fill_on_edge):
+    params = _get_sample_fill_params()
+    fin_p = params['fin_p']
+    od_h_delta = params['od_h_delta']
+    nfin_min, nfin_max = params['nfin_min'], params['nfin_max']
+    sp_min, sp_max = params['sp_min'], params['sp_max']
+    for num_fin in range(nfin_min, 121):
+        area_targ = int(math.ceil(num_fin * fin_p * params['density']))
+        ans = solve_od_fill(num_fin, area_targ, fin_p, od_h_delta, nfin_min, nfin_max,
+                            sp_min, sp_max, fill_on_edge)
+        _check_fill(ans, num_fin, nfin_min, nfin_max, sp_min, sp_max, fill_on_edge)
+        assert _get_area(ans, fin_p, od_h_delta) >= area_targ
+
+
+def _old_od_fill_search(num_fin, area_targ, fin_p, od_h_delta, fin_h, od_fin_exty, nfin_min,
+                        nfin_max, sp_min, sp_max, fill_on_edge):
+    """The binary search previously used by MOSTechFinfetBase._get_dummy_od_fill()."""
+    from bag.util.search import BinaryIterator
+    from bag.layout.routing.fill import fill_symmetric_min_density_info
+    from bag.layout.routing.fill import fill_symmetric_interval
+
+    fin_area_min = -(-(area_targ - 2 * od_fin_exty - fin_h) // fin_p) + 1
+    fin_area_iter = BinaryIterator(fin_area_min, num_fin + 1)
+    while fin_area_iter.has_next():
+        fin_area_targ_cur = fin_area_iter.get_next()
+        fill_info = fill_symmetric_min_density_info(num_fin, fin_area_targ_cur, nfin_min,
+                                                    nfin_max, sp_min, sp_max=sp_max,
+                                                    fill_on_edge=fill_on_edge, cyclic=False)
+        nfin_tot_cur = fill_info[0][0]
+        od_intv_list = fill_symmetric_interval(*fill_info[0][2], offset=0,
+                                               invert=fill_info[1])[0]
+        area_cur = (fin_p * sum((stop - start for start, stop in od_intv_list)) +
+                    od_h_delta * len(od_intv_list))
+        if area_cur >= area_targ:
+            fin_area_iter.save_info(od_intv_list)
+            fin_area_iter.down()
+        else:
+            if nfin_tot_cur < fin_area_targ_cur or fin_area_targ_cur == num_fin:
+                fin_area_iter.save_info(od_intv_list)
+                break
+            else:
+                fin_area_iter.up()
+
+    return [tuple(intv) for intv in fin_area_iter.get_last_save_info()]
+
+
+@pytest.mark.parametrize('fill_on_edge', [True, False])
+def test_solver_against_old_search(fill_on_edge):
+    pytest.importorskip('bag.layout.routing.fill')
+
+    params = _get_sample_fill_params()
+    fin_p = params['fin_p']
+    od_h_delta = params['od_h_delta']
+    nfin_min, nfin_max = params['nfin_min'], params['nfin_max']
+    sp_min, sp_max = params['sp_min'], params['sp_max']
+    for num_fin in range(nfin_min, 121):
+        area_targ = int(math.ceil(num_fin * fin_p * params['density']))
+        old_ans = _old_od_fill_search(num_fin, area_targ, fin_p, od_h_delta, params['fin_h'],
+                                      params['od_fin_exty'], nfin_min, nfin_max, sp_min, sp_max,
+                                      fill_on_edge)
+        new_ans = solve_od_fill(num_fin, area_targ, fin_p, od_h_delta, nfin_min, nfin_max,
+                                sp_min, sp_max, fill_on_edge)
+        old_area = _get_area(old_ans, fin_p, od_h_delta)
+        new_area = _get_area(new_ans, fin_p, od_h_delta)
+        if old_area >= area_targ:
+            assert area_targ <= new_area <= old_area
+        else:
+            assert new_area >= old_area